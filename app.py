@@ -7,31 +7,46 @@ ASCII = """
 """
 print(ASCII)
 
+import sys
+from core import startup_profiler
+# Must be enabled before the imports below so their cost is recorded
+if '--profile-startup' in sys.argv:startup_profiler.enable()
+
 import time
 import sounddevice as sd
 import numpy as np
-import scipy.io.wavfile as wav
 import threading
-import tempfile
 import os
 import platform
+import importlib
+import argparse
 import yaml
-from pydub import AudioSegment
-import datetime,json
+import datetime
 
 from core.keyboard_utils import type_text, FnKeyListener, KeyboardEventHandler
 from core.tray.tray_animator import TrayAnimator
 from core.transcription import create_transcriber
-from core import transcription_queue
+from core.transcription.base import WARMUP_SECONDS
+from core import transcription_queue, model_registry
 from core.audio_utils import AudioEnhancer, SileroVAD, AudioDeviceSelector
-from core.command_mode import command_mode
+from core.audio_capture import CaptureEngine
 from core.i18n import _, set_language
 from core.llm_rewriter import rewrite_text
 from core.meeting_utils import MeetingRecorder
-from core.wakeword import detect_from_audio
+from core.phrase_pipeline import PhrasePipeline, join_phrases
+from core.dictation_journal import DictationJournal
+from core.audio_archiver import AudioArchiver
 
 # Audio configuration constants
 SAMPLE_RATE,SPEECH_PADDING_MS,VAD_THRESHOLD=16000,300,0.6
+# Heavy subsystems imported on first use; preloaded in the background once hotkeys are live
+DEFERRED_IMPORTS=('pydub','pyloudnorm','scipy.signal','scipy.ndimage','openai','core.command_mode')
+timed=startup_profiler.timed
+
+def preload_deferred():
+    for name in DEFERRED_IMPORTS:
+        try:importlib.import_module(name)
+        except Exception:pass  # Surfaces with a proper message on first real use
 
 class VoiceTranscriber:
     def __init__(self,model=None,language=None):
@@ -49,6 +64,14 @@ class VoiceTranscriber:
         if ui_language != 'auto':
             set_language(ui_language)
         
+        # Concurrent ASR model replicas for the transcription queue
+        self.replicas=max(1,int(self.config['asr'].get('replicas',1)))
+        self.warmup_s=tuple(self.config['asr'].get('warmup',WARMUP_SECONDS))
+        
+        # Verify local models first; when all are present startup makes no network requests
+        with timed("model registry"):
+            model_registry.prepare(self.model)
+        
         print(_("→ Starting loading VAD and ASR models..."))
         vad_error,asr_error=None,None
         
@@ -56,8 +79,16 @@ class VoiceTranscriber:
             nonlocal vad_error
             try:
                 print(_("  → Loading VAD model..."))
-                self.vad=SileroVAD(threshold=VAD_THRESHOLD)
+                with timed("VAD"):
+                    self.vad=SileroVAD(threshold=VAD_THRESHOLD)
                 print(_("  ✅ VAD model loaded successfully"))
+                try:
+                    with timed("wake word"):
+                        from core.wakeword import get_detector
+                        self.wakeword=get_detector()
+                except Exception as e:
+                    self.wakeword=None
+                    print(_("  ⚠️ Wake word detector unavailable: {}").format(e))
             except Exception as e:
                 vad_error=e
                 print(_("  ❌ Failed to load VAD model: {}").format(e))
@@ -66,14 +97,17 @@ class VoiceTranscriber:
             nonlocal asr_error
             try:
                 print(_("  → Loading ASR model..."))
-                self.transcriber=create_transcriber(self.model)
+                with timed("ASR import"):
+                    self.transcriber=create_transcriber(self.model,num_workers=self.replicas)
                 # Check language support - ['*'] means all languages supported
                 supported_langs = self.transcriber.get_supported_languages()
                 if self.language and supported_langs != ['*'] and self.language not in supported_langs:
                     supported=supported_langs[:10]
                     raise ValueError(_("Language '{}' is not supported. Supported languages: {}...").format(self.language, ', '.join(supported)))
-                self.transcriber.initialize()
+                with timed("ASR initialize"):
+                    self.transcriber.initialize()
                 print(_("  ✅ ASR model loaded successfully"))
+                self.warmup_asr()
             except Exception as e:
                 asr_error=e
                 print(_("  ❌ Failed to load ASR model: {}").format(e))
@@ -89,31 +123,92 @@ class VoiceTranscriber:
         
         # Initialize recording state
         self.sr,self.rec,self.aud,self.th=SAMPLE_RATE,False,[],None
+        # Streaming VAD state fed by the recording thread; one probability per 512-sample block
+        self.rec_vad,self.rec_probs=self.vad.new_stream(),[]
+        self.kws_active,self.kws_from=False,None
         self.mode=None
         self.rec_lock = threading.Lock()  # Lock for thread safety
         self.active_stream = None  # Track active audio stream
+        # Optional always-open input stream; a key press only marks a position in its ring
+        rec_config=self.config.get('recording',{})
+        self.always_on=rec_config.get('always_on',False)
+        self.preroll=int(rec_config.get('preroll_ms',500)*self.sr/1000)//512*512
+        self.capture,self.rec_start=None,None
+        AudioDeviceSelector.configure(rec_config.get('input_device'),rec_config.get('device_refresh_s',30))
         self.keyboard_handler=KeyboardEventHandler(self)
         self.fn_listener = None  # Will be initialized for macOS
         self.tray=TrayAnimator()
         self.audio_enhancer=AudioEnhancer(sample_rate=self.sr)
-        self.json_lock = threading.Lock()
+        self.rec_noise=self.audio_enhancer.new_stream()  # Dictation mic noise profile, learned between words
+        self.journal = DictationJournal()
+        self.archiver = AudioArchiver(rec_config.get('archive_format','mp3'))
         
         # Initialize transcription queue
-        transcription_queue.init(transcriber=self.transcriber, max_workers=5)
+        with timed("transcription queue"):
+            transcription_queue.init(transcriber=self.transcriber, max_workers=5, replicas=self.replicas,
+                                     warmup=self.warmup_s, language=self.language, beam_size=5)
+        
+        # Transcribe finished phrases of long dictations while the key is still held
+        pipeline_config=self.config.get('dictation_pipeline',{})
+        self.pipeline=PhrasePipeline(
+            self,
+            min_phrase_seconds=pipeline_config.get('min_phrase_seconds',8),
+            silence_ms=pipeline_config.get('silence_ms',500),
+            padding_ms=SPEECH_PADDING_MS
+        ) if pipeline_config.get('enabled',False) and self.vad.model else None
         
         # Initialize meeting VAD instances once at startup
-        self.meeting_microphone_vad = SileroVAD()
-        self.meeting_system_vad = SileroVAD()
-        print(_("✅ Meeting VAD instances initialized"))
+        with timed("meeting recorder"):
+            self.meeting_microphone_vad = SileroVAD()
+            self.meeting_system_vad = SileroVAD()
+            print(_("✅ Meeting VAD instances initialized"))
+            
+            # Initialize meeting recorder
+            self.meeting_recorder = MeetingRecorder(self)
         
-        # Initialize meeting recorder
-        self.meeting_recorder = MeetingRecorder(self)
+        if self.always_on:
+            with timed("always-on capture"):
+                self.open_capture()
         
         # Setup tray with meeting recording callback
         self.tray.setup_tray_with_meeting(self.meeting_recorder.toggle_meeting_recording, self.quit_app)
         
         print(_("→ Fn for dictation, Fn+Ctrl for command mode, right-click tray to exit") if platform.system()=="Darwin" else _("→ Ctrl+Win for dictation, Win+Alt for command mode, right-click tray to exit"))
 
+    def warmup_asr(self):
+        """Run the ASR model on asr.warmup seconds of synthetic audio so the first dictation is not cold"""
+        durations=self.warmup_s
+        if not durations:return
+        try:
+            print(_("  → Warming up ASR model ({}s)...").format("/".join(str(d) for d in durations)))
+            with timed("ASR warm-up"):
+                w=self.transcriber.warmup(durations,SAMPLE_RATE,language=self.language,beam_size=5)
+            print(_("  ✅ ASR first-call latency: {:.0f}ms cold, {:.0f}ms after warm-up").format(w['cold_ms'],w['warm_ms']))
+        except Exception as e:
+            print(_("  ⚠️ ASR warm-up failed: {}").format(e))
+
+    def open_capture(self):
+        """Open the always-on input stream; returns False (per-press streams are used) on failure"""
+        if self.capture and self.capture.active:return True
+        self.close_capture()
+        try:
+            self.capture=CaptureEngine(self.sr,device=AudioDeviceSelector.get_best_input_device()).start()
+            print(_("✅ Microphone kept open with {}ms pre-roll").format(self.preroll*1000//self.sr))
+            return True
+        except Exception as e:
+            print(_("⚠️ Could not keep microphone open: {}").format(e))
+            self.capture=None
+            return False
+
+    def close_capture(self):
+        if self.capture:
+            try:
+                self.capture.stop()
+                self.capture.close()
+            except Exception:
+                pass
+            self.capture=None
+
     def cleanup_stream(self):
         """Force cleanup audio stream"""
         if self.active_stream:
@@ -127,11 +222,13 @@ class VoiceTranscriber:
     def quit_app(self):
         print(_("→ Exiting program"))
         self.cleanup_stream()
+        self.close_capture()
         # Cleanup meeting recorder resources
         if hasattr(self, 'meeting_recorder'):
             self.meeting_recorder.cleanup_resources()
         # Shutdown transcription service to prevent resource leaks
         transcription_queue.shutdown()
+        self.archiver.shutdown()
         self.tray.stop_animation()
         if platform.system()!="Darwin":
             self.tray.icon and self.tray.icon.stop()
@@ -160,56 +257,60 @@ class VoiceTranscriber:
                     self.th = None
                     return
             print(_("🎤 Recording... (Mode: {})").format(self.mode))
-            self.rec,self.aud=True,[]
+            # Mark the key press in the always-on ring, reaching back over the pre-roll
+            shared=self.always_on and self.open_capture()
+            self.rec_start=max(self.capture.position-self.preroll,self.capture.ring.oldest) if shared else None
+            self.rec,self.aud,self.rec_probs=True,[],[]
+            self.rec_vad.reset()
+            # Score the wake word while the key is held; starts at the first speech block
+            self.kws_active,self.kws_from=self.mode=='dictation' and self.wakeword is not None,None
+            if self.kws_active:
+                self.wakeword.begin()
+            if self.pipeline:
+                self.pipeline.reset()
             self.tray.set_status("recording")
             
         def rec():
-            stream = None
+            engine = reader = None
+            device_lost = False
             try:
-                # Wait a moment after meeting mode to ensure clean state
-                time.sleep(0.1)
-                
-                # Get best input device using smart selector (without reinitializing)
-                best_device_id = AudioDeviceSelector.get_best_input_device()
-                
-                if best_device_id is None:
-                    # Fallback to system default if no suitable device found
-                    default_device = sd.query_devices(kind='input')
-                    print(_("🎙️ Using system default device: {}").format(default_device['name']))
-                
-                # Use non-blocking mode with smaller chunk size for better responsiveness
-                stream = sd.InputStream(
-                    samplerate=self.sr,
-                    channels=1,
-                    dtype=np.float32,
-                    blocksize=512,  # Smaller chunk size
-                    latency='low',  # Low latency mode
-                    device=best_device_id  # Selected device or None (system default)
-                )
-                self.active_stream = stream
-                stream.start()
+                if shared:
+                    engine = self.capture
+                    reader = engine.reader(self.rec_start)
+                else:
+                    # Wait a moment after meeting mode to ensure clean state
+                    time.sleep(0.1)
+                    
+                    # Get best input device using smart selector (without reinitializing)
+                    best_device_id = AudioDeviceSelector.get_best_input_device()
+                    
+                    if best_device_id is None:
+                        # Fallback to system default if no suitable device found
+                        default_device = AudioDeviceSelector.query_devices(kind='input')
+                        print(_("🎙️ Using system default device: {}").format(default_device['name']))
+                    
+                    # Callback-mode stream into a ring buffer; this thread consumes blocks as they arrive
+                    engine = CaptureEngine(self.sr, device=best_device_id)
+                    self.active_stream = engine
+                    engine.start()
+                    reader = engine.reader()
+                overflows = engine.overflows
                 
-                while True:
-                    with self.rec_lock:
-                        if not self.rec:
-                            break
-                    try:
-                        # Non-blocking read
-                        d,overflowed = stream.read(512)
-                        if overflowed:
-                            print(_("⚠️ Audio input overflow"))
-                        if d is not None and len(d) > 0:
-                            with self.rec_lock:
-                                if self.rec:  # Double check state
-                                    self.aud.append(np.asarray(d,dtype=np.float32).reshape(-1))
-                    except sd.CallbackStop:
-                        break
-                    except Exception as e:
-                        if self.rec:  # Only show errors during active recording
-                            print(_("Error reading audio data: {}").format(e))
+                while self.rec:
+                    self.capture_blocks(reader.read_blocks(timeout=0.1))
+                    if not engine.active:
+                        # Stream died under us (device unplugged); the always-on stream reopens on the next press
+                        print(_("⚠️ Audio device disconnected or switched, please restart recording"))
+                        device_lost = True
                         break
+                    if engine.overflows != overflows:
+                        overflows = engine.overflows
+                        print(_("⚠️ Audio input overflow"))
+                # Blocks captured before the key was released
+                self.capture_blocks(reader.read_blocks())
                         
             except sd.PortAudioError as e:
+                device_lost = True
                 error_code = str(e)
                 if '-9986' in error_code or 'Internal PortAudio error' in error_code:
                     print(_("⚠️ Audio device disconnected or switched, please restart recording"))
@@ -230,13 +331,19 @@ class VoiceTranscriber:
                     self.rec = False
                     self.aud = []
             finally:
-                if stream:
+                if shared:
+                    reader and reader.close()
+                elif engine:
                     try:
-                        stream.stop()
-                        stream.close()
+                        engine.stop()
+                        engine.close()
                     except Exception as e:
                         print(_("Error closing audio stream: {}").format(e))
                 self.active_stream = None
+                if device_lost:
+                    # Pick the device again next time, with PortAudio restarted to see hot-plugged devices
+                    self.close_capture()
+                    AudioDeviceSelector.invalidate(reinit=True)
         
         self.th=threading.Thread(target=rec,daemon=True)
         self.th.start()
@@ -258,6 +365,8 @@ class VoiceTranscriber:
                 # Reset all states
                 self.th = None
                 self.aud = []
+                if self.pipeline:
+                    self.pipeline.cancel()
                 self.tray.set_status("idle")
                 # Reset keyboard states
                 self.keyboard_handler.reset_key_states(_("Recording thread timeout"))
@@ -265,78 +374,135 @@ class VoiceTranscriber:
                 
         # Ensure thread reference is cleaned up
         self.th = None
+        if self.kws_active:
+            self.wakeword.finish()
         if not self.aud:
             self.tray.set_status("idle")
             return print(_("No data"))
         try:
-            aud=self.audio_enhancer._to_mono_1d(np.concatenate(self.aud,axis=0)if len(self.aud)>1 else self.aud[0])
-            if aud.size/self.sr<0.5:
+            # In pipelined mode earlier phrases are already being transcribed; only the tail is left
+            phrases=self.pipeline is not None and self.pipeline.pending
+            tail=self.aud[self.pipeline.tail_start:] if phrases else self.aud
+            aud=self.audio_enhancer._to_mono_1d(np.concatenate(tail,axis=0)if len(tail)>1 else tail[0]) if tail else np.zeros(0,dtype=np.float32)
+            if not phrases and aud.size/self.sr<0.5:
                 self.tray.set_status("idle")
                 return print(_("Too short"))
-            aud=self.audio_enhancer.enhance_audio(aud)
-            aud=self.vad.extract_speech_segments(aud,self.sr,SPEECH_PADDING_MS)
+            if aud.size/self.sr>=0.3:
+                aud=self.audio_enhancer.enhance_audio(aud,self.rec_noise)
+                aud=self.trim_speech(aud,len(self.aud)-len(tail))
             
-            # Check for wakeword in dictation mode
-            if self.mode == 'dictation':
-                kws_start = time.time()
-                detected, confidence = detect_from_audio(aud.copy(), self.sr)
-                kws_time = (time.time() - kws_start) * 1000  # Convert to milliseconds
-                self.mode = 'command' if detected else 'dictation'
-                if detected:
-                    print(f"🎯 Hey Aura detected! Confidence: {confidence:.2f} | Time: {kws_time:.1f}ms | Switching to command mode")
-                else:
-                    print(f"🔍 Wake word check: {confidence:.2f} confidence | Time: {kws_time:.1f}ms")
+            # Check for wakeword in dictation mode (pipelined mode checks the first phrase instead)
+            if self.mode == 'dictation' and not phrases:
+                self.check_wakeword(aud)
             
-            if aud.size/self.sr<0.3:
+            if not phrases and aud.size/self.sr<0.3:
                 self.tray.set_status("idle")
                 return print(_("Audio too short after VAD processing"))
-            tf=tempfile.NamedTemporaryFile(suffix=".wav",delete=False)
-            wav.write(tf.name,self.sr,(np.clip(aud,-1.0,1.0)*32767).astype(np.int16))
-            tf.close()
-            
-            # Use transcription queue
+            # Use transcription queue, passing the float32 buffer directly
+            # The tail runs while earlier phrases finish; both share one 30s deadline
+            deadline=time.time()+30
+            tail_future=None
             try:
-                txt = transcription_queue.transcribe(
-                    audio_path=tf.name,
+                if phrases:
+                    # The first phrase's wake word decides the mode (and priority) of the tail
+                    self.pipeline.wait_mode(timeout=max(0,deadline-time.time()))
+                tail_future = transcription_queue.submit(
+                    aud,
+                    sr=self.sr,
                     language=self.language,
                     beam_size=5,
                     vad_filter=False,
-                    timeout=30
-                )
+                    timeout=30,
+                    priority=transcription_queue.COMMAND if self.mode=='command' else transcription_queue.DICTATION
+                ) if aud.size/self.sr>=0.3 else None
+                if phrases:
+                    texts,audios=self.pipeline.collect(timeout=max(0,deadline-time.time()))
+                txt=transcription_queue.wait(tail_future,max(0,deadline-time.time())) if tail_future else ""
+                if phrases:
+                    print(_("→ Joined {} phrases transcribed while recording").format(len(texts)))
+                    txt=join_phrases(texts+[txt])
+                    aud=np.concatenate(audios+[aud])
                 
                 if txt.strip():
                     txt=txt.strip()
-                    # Save MP3 and record
+                    # Encode and journal in the background; typing does not wait for it
                     try:
-                        log_dir = "./recordings/push-to-talk"
-                        os.makedirs(log_dir,exist_ok=True)
                         timestamp=datetime.datetime.now()
-                        mp3_path=f"{log_dir}/{timestamp.strftime('%Y%m%d_%H%M%S')}.mp3"
-                        AudioSegment.from_wav(tf.name).export(mp3_path,format="mp3",parameters=["-q:a","2"])
-                        # Record to dictation.json
-                        record={"file":mp3_path,"transcription":txt,"time":timestamp.isoformat(),"duration":round(aud.size/self.sr,2)}
-                        # Use lock to protect JSON file read/write operations
-                        with self.json_lock:
-                            try: records = json.load(open(f"{log_dir}/transcription.json","r",encoding="utf-8"))
-                            except: records = []
-                            records.append(record)
-                            with open(f"{log_dir}/transcription.json","w",encoding="utf-8") as f:
-                                json.dump(records, f, ensure_ascii=False, indent=2)
+                        record={"file":None,"transcription":txt,"time":timestamp.isoformat(),"duration":round(aud.size/self.sr,2)}
+                        def journal(path,record=record):
+                            record["file"]=path
+                            self.journal.append(record)
+                        self.archiver.submit(aud,self.sr,f"{self.journal.log_dir}/{timestamp.strftime('%Y%m%d_%H%M%S')}",journal)
                     except:pass
                     (self.process_dictation if self.mode=='dictation'else self.process_command if self.mode=='command'else self.process_dictation)(txt)
                 else:print(_("No text"))
                     
             except TimeoutError:
                 print(_("❌ Transcription timeout"))
+                self.pipeline and self.pipeline.cancel()
+                tail_future and tail_future.cancel()
             except Exception as e:
                 print(_("❌ Transcription error: {}").format(e))
+                self.pipeline and self.pipeline.cancel()
+                tail_future and tail_future.cancel()
         except Exception as e:print(_("Error: {}").format(e))
         finally:
-            try:os.unlink(tf.name)
-            except:pass
             self.tray.set_status("idle")
             self.keyboard_handler.reset_key_states(_("Recording ended"))
 
+    def capture_blocks(self,blocks):
+        """Consume captured blocks: run VAD, keep the audio and feed wake word and phrase pipeline"""
+        for view in blocks:
+            block=view.copy()  # The ring slot is reused once the buffer wraps
+            # Run VAD as blocks arrive so stop_rec can trim without a second pass
+            prob=self.vad.predict(block,self.rec_vad) if self.vad.model else None
+            self.aud.append(block)
+            self.rec_probs.append(prob)
+            if prob is not None and prob<self.vad.threshold:
+                self.rec_noise.observe(block)
+            if self.kws_active:
+                self.feed_wakeword(prob)
+            if self.pipeline:
+                self.pipeline.feed(prob)
+
+    def trim_speech(self,aud,first_block=0):
+        """Trim to the speech range using probabilities computed while recording"""
+        n_blocks=-(-aud.size//512)
+        probs=self.rec_probs[first_block:first_block+n_blocks]
+        if not self.vad.model or len(probs)!=n_blocks or None in probs:
+            return self.vad.extract_speech_segments(aud,self.sr,SPEECH_PADDING_MS)
+        timestamps=self.vad.timestamps_from_probs(np.asarray(probs,dtype=np.float32),aud.size)
+        return self.vad.trim_to_timestamps(aud,timestamps,self.sr,SPEECH_PADDING_MS)
+
+    def feed_wakeword(self,prob):
+        """Forward captured blocks to the wake word detector, starting just before the first speech"""
+        idx=len(self.aud)-1
+        if self.kws_from is None:
+            if prob is not None and prob<=self.vad.threshold:
+                return
+            self.kws_from=max(0,idx-SPEECH_PADDING_MS*self.sr//1000//512)
+            for block in self.aud[self.kws_from:idx]:
+                self.wakeword.feed(block)
+        self.wakeword.feed(self.aud[idx])
+
+    def check_wakeword(self,aud):
+        """Switch to command mode if the utterance starts with the wake word"""
+        if self.wakeword is None:
+            return  # Detector failed to load at startup: plain dictation
+        kws_start = time.time()
+        # The stream has seen every block once finish() is queued; only its last frames are left to score
+        decision = self.wakeword.result(timeout=0.2) if self.kws_active else None
+        if decision is None:
+            # No streaming decision: score `aud` with the same, already loaded detector
+            decision = self.wakeword.detect(aud, timeout=1.0)
+        detected, confidence = decision or (False, 0.0)
+        kws_time = (time.time() - kws_start) * 1000  # Convert to milliseconds
+        self.mode = 'command' if detected else 'dictation'
+        if detected:
+            print(f"🎯 Hey Aura detected! Confidence: {confidence:.2f} | Time: {kws_time:.1f}ms | Switching to command mode")
+        else:
+            print(f"🔍 Wake word check: {confidence:.2f} confidence | Time: {kws_time:.1f}ms")
+
     def process_dictation(self,text):
         print(_("📝 Dictation output: {}").format(text))
         # Apply LLM rewriting if enabled (only for dictation mode)
@@ -352,6 +518,7 @@ class VoiceTranscriber:
         try:
             self.tray.set_status("processing")
             # LLM rewriting is not applied to command mode (only dictation)
+            from core.command_mode import command_mode
             command_mode(text)
             print(_("\n✅ Command completed"))
         except Exception as e:print(_("❌ Command processing error: {}").format(e))
@@ -359,7 +526,17 @@ class VoiceTranscriber:
             self.tray.set_status("idle")
             self.keyboard_handler.reset_key_states(_("Command ended"))
 
-    def run(self):
+    def on_ready(self,exit_when_ready=False,profile_output=None):
+        """Hotkeys are live: report startup time and warm up deferred imports"""
+        ready=startup_profiler.mark_ready()
+        print(_("→ Ready in {:.1f}s").format(ready))
+        if startup_profiler.enabled() or profile_output:
+            startup_profiler.print_report(profile_output)
+        if exit_when_ready:
+            self.quit_app()
+        threading.Thread(target=preload_deferred,daemon=True).start()
+
+    def run(self,exit_when_ready=False,profile_output=None):
         self.tray.start_animation()
         if platform.system()=="Darwin":
             # Initialize FnKeyListener immediately
@@ -369,12 +546,19 @@ class VoiceTranscriber:
             threading.Thread(target=run_fn_listener,daemon=True).start()
             # Give listener thread time to initialize
             time.sleep(0.1)
+            self.on_ready(exit_when_ready,profile_output)
             self.tray.run_tray()
         else:
             threading.Thread(target=self.tray.run_tray,daemon=True).start()
+            self.on_ready(exit_when_ready,profile_output)
             self.keyboard_handler.start_keyboard_listener()
 
 if __name__=="__main__":
+    parser=argparse.ArgumentParser(description="Hey Aura")
+    parser.add_argument('--profile-startup',action='store_true',help="report per-module import time and per-model load time")
+    parser.add_argument('--profile-output',help="also write the startup profile to this JSON file")
+    parser.add_argument('--exit-when-ready',action='store_true',help="exit as soon as hotkeys are ready (startup benchmarks)")
+    args=parser.parse_args()
     try:
         if platform.system()=="Darwin":
             from AppKit import NSApplication
@@ -386,7 +570,7 @@ if __name__=="__main__":
         model=asr_config['model']
         language=asr_config['language']
         transcriber=VoiceTranscriber(model=model,language=language)
-        transcriber.run()
+        transcriber.run(exit_when_ready=args.exit_when_ready,profile_output=args.profile_output)
     except Exception as e:
         print(_("Startup error: {}").format(e))
         input(_("Press Enter to exit..."))
@@ -0,0 +1,50 @@
+"""Meeting segment throughput: one transcribe_array per segment vs. transcribe_batch.
+
+Simulates both meeting streams talking at once (segments of 3-10 s) and reports audio
+seconds per wall-clock second for batch sizes 1, 2, 4 and 8 on the configured backend.
+
+Usage:
+    python archive/test_batch_throughput.py [--segments 16]
+"""
+import os
+import sys
+import time
+import argparse
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.transcription import create_transcriber
+from core.transcription.base import warmup_audio
+
+SR = 16000
+LENGTHS = [3, 6, 10, 4, 8, 5]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--segments', type=int, default=16)
+    args = parser.parse_args()
+
+    cfg = yaml.safe_load(open('config.yaml', encoding='utf-8'))['asr']
+    language = cfg.get('language')
+    tc = create_transcriber(cfg['model'])
+    tc.initialize()
+    tc.warmup((1, 5), SR, language=language)
+    segments = [warmup_audio(LENGTHS[i % len(LENGTHS)], SR) for i in range(args.segments)]
+    audio_s = sum(s.size for s in segments) / SR
+
+    print("=" * 60)
+    print(f"{args.segments} segments, {audio_s:.0f}s audio ({cfg['model']}, max batch {tc.max_batch_size})")
+    print("=" * 60)
+    for size in (1, 2, 4, 8):
+        if size > 1 and size > tc.max_batch_size:
+            break
+        t0 = time.perf_counter()
+        for i in range(0, len(segments), size):
+            chunk = segments[i:i + size]
+            if size == 1:
+                tc.transcribe_array(chunk[0], SR, language=language)
+            else:
+                tc.transcribe_batch(chunk, SR, language=language)
+        wall = time.perf_counter() - t0
+        print(f"batch {size}: {wall:6.1f}s -> {audio_s / wall:6.2f} audio s/s")
@@ -0,0 +1,103 @@
+"""Capture overhead: blocking read + lock + list append vs. callback into a ring buffer.
+
+Part 1 simulates the per-block work of both capture paths without a device and reports
+the cost per 512-sample block. Part 2 opens the default microphone at 5 ms latency with
+a consumer that stalls like a slow VAD call, and counts input overflows for the blocking
+read loop and the callback-mode CaptureEngine (skipped when no input device is found).
+
+Usage:
+    python archive/test_capture_overhead.py [--blocks 20000] [--seconds 10]
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.audio_capture import RingBuffer, CaptureEngine, BLOCK_SIZE
+
+SR = 16000
+STALL_S = 0.05  # Consumer hiccup every 50 blocks (~1.6 s)
+
+
+def simulate_blocking(n, block):
+    lock, aud = threading.Lock(), []
+    t0 = time.perf_counter()
+    for _i in range(n):
+        with lock:
+            d = block.reshape(-1, 1).copy()  # sd.InputStream.read() returns a fresh array
+            aud.append(d.reshape(-1))
+    np.concatenate(aud)
+    return (time.perf_counter() - t0) / n
+
+
+def simulate_ring(n, block):
+    ring = RingBuffer(int(30 * SR) // BLOCK_SIZE * BLOCK_SIZE)
+    indata, pos = block.reshape(-1, 1), 0
+    t0 = time.perf_counter()
+    for _i in range(n):
+        ring.write(indata[:, 0])
+        ring.view(pos, pos + BLOCK_SIZE)
+        pos += BLOCK_SIZE
+    ring.read(max(0, pos - 30 * SR), pos)
+    return (time.perf_counter() - t0) / n
+
+
+def overflow_blocking(seconds):
+    import sounddevice as sd
+    overflows = blocks = 0
+    with sd.InputStream(samplerate=SR, channels=1, dtype=np.float32, blocksize=BLOCK_SIZE, latency=0.005) as stream:
+        end = time.time() + seconds
+        while time.time() < end:
+            _d, overflowed = stream.read(BLOCK_SIZE)
+            overflows += bool(overflowed)
+            blocks += 1
+            if blocks % 50 == 0:
+                time.sleep(STALL_S)
+    return overflows, blocks
+
+
+def overflow_callback(seconds):
+    engine = CaptureEngine(SR, latency=0.005).start()
+    reader = engine.reader()
+    blocks = 0
+    end = time.time() + seconds
+    while time.time() < end:
+        for _b in reader.read_blocks(timeout=0.1):
+            blocks += 1
+            if blocks % 50 == 0:
+                time.sleep(STALL_S)
+    engine.stop()
+    engine.close()
+    return engine.overflows, engine.callbacks, engine.callback_time / max(1, engine.callbacks)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--blocks', type=int, default=20000)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    block = np.random.default_rng(0).standard_normal(BLOCK_SIZE).astype(np.float32) * 0.1
+    print("=" * 60)
+    print(f"Per-block overhead ({args.blocks} blocks of {BLOCK_SIZE})")
+    print("=" * 60)
+    print(f"blocking read + lock + list: {simulate_blocking(args.blocks, block) * 1e6:7.2f} us")
+    print(f"callback ring write + view:  {simulate_ring(args.blocks, block) * 1e6:7.2f} us")
+
+    try:
+        import sounddevice as sd
+        sd.query_devices(kind='input')
+    except Exception as e:
+        print(f"\nNo input device, skipping overflow test ({e})")
+        sys.exit(0)
+
+    print("=" * 60)
+    print(f"Input overflows at 5 ms latency, {args.seconds:.0f}s with a {STALL_S * 1000:.0f} ms stall every 50 blocks")
+    print("=" * 60)
+    n, blocks = overflow_blocking(args.seconds)
+    print(f"blocking read: {n} overflows / {blocks} blocks ({n / max(1, blocks):.2%})")
+    n, blocks, cb = overflow_callback(args.seconds)
+    print(f"callback ring: {n} overflows / {blocks} blocks ({n / max(1, blocks):.2%}), callback {cb * 1e6:.1f} us")
@@ -0,0 +1,122 @@
+"""AudioDeviceSelector cache: selection runs once per device table, not once per recording.
+
+Replaces sounddevice inside core.audio_utils with a fake device list, so no audio
+hardware is needed. Run directly or with pytest:
+
+    python archive/test_device_cache.py
+    pytest archive/test_device_cache.py
+"""
+import os
+import sys
+import time
+import types
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import audio_utils
+from core.audio_utils import AudioDeviceSelector
+
+BUILTIN = {'name': 'MacBook Pro Microphone', 'max_input_channels': 1}
+AIRPODS = {'name': 'AirPods Pro', 'max_input_channels': 1}
+SPEAKERS = {'name': 'MacBook Pro Speakers', 'max_input_channels': 0}
+YETI = {'name': 'Yeti USB Microphone', 'max_input_channels': 2}
+SCARLETT = {'name': 'Scarlett 2i2 USB', 'max_input_channels': 2}
+
+
+class FakeDevices:
+    def __init__(self, devices, default):
+        self.devices = devices
+        self.listed = list(devices)  # Like PortAudio: the list as of the last (re)initialisation
+        self.default = types.SimpleNamespace(device=[default, 1])
+        self.queries = 0
+        self.restarts = 0
+        self.restarting = False
+        self.overlaps = 0  # Queries made while PortAudio was torn down
+
+    def query_devices(self, device=None, kind=None):
+        self.queries += 1
+        self.overlaps += self.restarting
+        return list(self.listed) if device is None and kind is None else self.listed[self.default.device[0] if kind else device]
+
+    def _terminate(self):
+        self.restarts += 1
+        self.restarting = True
+        time.sleep(0.05)
+
+    def _initialize(self):
+        self.listed = list(self.devices)
+        self.restarting = False
+
+
+def use(fake, override=None):
+    audio_utils.sd = fake
+    AudioDeviceSelector.configure(override)
+    return fake
+
+
+def test_cached_until_invalidated():
+    fake = use(FakeDevices([BUILTIN, SPEAKERS], default=0))
+    assert [AudioDeviceSelector.get_best_input_device() for _i in range(5)] == [0] * 5
+    assert fake.queries == 1
+
+    # Headphones become the default; nothing changes until the cache is invalidated
+    fake.devices, fake.default.device = [BUILTIN, SPEAKERS, AIRPODS], [2, 1]
+    assert AudioDeviceSelector.get_best_input_device() == 0
+    AudioDeviceSelector.invalidate()
+    assert AudioDeviceSelector.get_best_input_device() == 0  # Headphone default skipped, built-in wins
+    assert fake.queries == 2
+
+
+def test_hot_plug_prefers_external():
+    fake = use(FakeDevices([BUILTIN, AIRPODS], default=1))
+    assert AudioDeviceSelector.get_best_input_device() == 0
+    fake.devices = [BUILTIN, AIRPODS, YETI]
+    AudioDeviceSelector.invalidate(reinit=True)
+    assert fake.restarts == 1
+    assert AudioDeviceSelector.get_best_input_device() == 2
+
+
+def test_watcher_only_queries():
+    fake = use(FakeDevices([BUILTIN, AIRPODS], default=0))
+    AudioDeviceSelector.get_best_input_device()
+    # One round of what the watcher does every refresh_s seconds
+    assert not AudioDeviceSelector._check()
+    fake.default.device = [1, 1]
+    assert AudioDeviceSelector._check()  # New default input
+    fake.default.device = [0, 1]
+    fake.devices = [BUILTIN, AIRPODS, YETI]
+    assert not AudioDeviceSelector._check()  # Hot-plugged: PortAudio lists it only after a restart
+    assert fake.restarts == 0
+    AudioDeviceSelector.invalidate(reinit=True)
+    assert AudioDeviceSelector.query_devices()[-1] == YETI
+
+
+def test_queries_wait_for_restart():
+    fake = use(FakeDevices([BUILTIN], default=0))
+    restart = threading.Thread(target=AudioDeviceSelector.invalidate, kwargs={'reinit': True})
+    restart.start()
+    while not fake.restarting:
+        time.sleep(0.001)
+    assert AudioDeviceSelector.query_devices(0) == BUILTIN
+    assert AudioDeviceSelector.query_devices(kind='input') == BUILTIN
+    restart.join()
+    assert fake.overlaps == 0
+
+
+def test_override():
+    fake = use(FakeDevices([BUILTIN, SPEAKERS, YETI], default=0), override='yeti')
+    assert AudioDeviceSelector.get_best_input_device() == 2
+    use(fake, override=1)  # Output-only device: ignored, falls back to automatic selection
+    assert AudioDeviceSelector.get_best_input_device() == 0
+    use(fake, override='missing')
+    assert AudioDeviceSelector.get_best_input_device() == 0
+    # An index only matches that index, not names containing the digit
+    use(FakeDevices([SCARLETT, SPEAKERS, YETI], default=0), override=2)
+    assert AudioDeviceSelector.get_best_input_device() == 2
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
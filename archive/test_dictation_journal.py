@@ -0,0 +1,63 @@
+"""Dictation journal: legacy migration, constant-cost appends, time queries and export.
+
+    python archive/test_dictation_journal.py [--records 20000]
+    pytest archive/test_dictation_journal.py
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.dictation_journal import DictationJournal
+
+T0 = datetime.datetime(2025, 1, 1)
+
+
+def record(i):
+    t = T0 + datetime.timedelta(minutes=i)
+    return {"file": f"{t:%Y%m%d_%H%M%S}.mp3", "transcription": f"entry {i} 你好", "time": t.isoformat(), "duration": 1.5}
+
+
+def test_migrate_query_export():
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = [record(i) for i in range(1000)]
+        with open(os.path.join(tmp, "transcription.json"), "w", encoding="utf-8") as f:
+            json.dump(legacy[::-1], f, ensure_ascii=False, indent=2)
+        journal = DictationJournal(tmp)
+        assert os.path.exists(os.path.join(tmp, "transcription.json.bak"))
+        assert journal.query() == legacy
+
+        journal.append(record(1000))
+        window = journal.query(T0 + datetime.timedelta(minutes=500), T0 + datetime.timedelta(minutes=510))
+        assert [r["transcription"] for r in window] == [f"entry {i} 你好" for i in range(500, 510)]
+        assert journal.query(T0 + datetime.timedelta(minutes=1000))[0] == record(1000)
+
+        with open(journal.export_json(), encoding="utf-8") as f:
+            assert json.load(f) == legacy + [record(1000)]
+        # Reopening does not migrate the exported file again
+        assert len(DictationJournal(tmp).query()) == 1001
+
+
+def append_cost(n):
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = DictationJournal(tmp)
+        for i in range(n):
+            journal.append(record(i))
+        t0 = time.perf_counter()
+        for i in range(n, n + 100):
+            journal.append(record(i))
+        return (time.perf_counter() - t0) * 10
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--records', type=int, default=20000)
+    args = parser.parse_args()
+    test_migrate_query_export()
+    print("✅ migrate / query / export")
+    for n in (100, args.records):
+        print(f"append with {n:>6} existing records: {append_cost(n):.3f} ms")
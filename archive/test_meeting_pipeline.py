@@ -0,0 +1,100 @@
+"""Meeting capture pipeline: does capture keep up when the VAD stage stalls?
+
+Simulates a device delivering one 512-sample block every `--period-ms` (accelerated
+real time) and a processing stage whose VAD costs `--vad-ms` per block, with a
+`--stall-ms` hiccup every 100 blocks, like an ONNX call on a loaded CPU.
+
+- inline: the old loop, where VAD runs between reads. A block the device cannot hand
+  over in time is an overflow.
+- staged: CaptureEngine's callback only writes into the ring; the stage reads from
+  it with a RingReader and records PipelineStats.
+
+No audio device is needed (the callback is driven directly). Usage:
+
+    python archive/test_meeting_pipeline.py [--blocks 2000] [--period-ms 4] [--vad-ms 1] [--stall-ms 60]
+"""
+import os
+import sys
+import time
+import types
+import argparse
+import threading
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.audio_capture import CaptureEngine, PipelineStats, BLOCK_SIZE
+
+SR = 16000
+STATUS_OK = types.SimpleNamespace(input_overflow=False)
+
+
+def vad_cost(i, vad_ms, stall_ms):
+    # onnxruntime releases the GIL while it runs, so the model is a sleep rather than a busy loop
+    time.sleep((vad_ms + (stall_ms if i % 100 == 99 else 0)) / 1000)
+
+
+def inline(blocks, period_ms, vad_ms, stall_ms):
+    """Device buffer of 2 blocks; a read that comes too late loses the oldest block"""
+    overflows, start = 0, time.perf_counter()
+    for i in range(blocks):
+        due = start + (i + 1) * period_ms / 1000
+        now = time.perf_counter()
+        if now < due:
+            time.sleep(due - now)
+        elif now - due > 2 * period_ms / 1000:
+            overflows += 1
+        vad_cost(i, vad_ms, stall_ms)
+    return overflows
+
+
+def staged(blocks, period_ms, vad_ms, stall_ms):
+    engine = CaptureEngine(SR, BLOCK_SIZE, seconds=10)
+    reader = engine.reader()
+    stats = PipelineStats()
+    indata = np.zeros((BLOCK_SIZE, 1), dtype=np.float32)
+
+    def device():
+        start = time.perf_counter()
+        for i in range(blocks):
+            due = start + (i + 1) * period_ms / 1000
+            now = time.perf_counter()
+            if now < due:
+                time.sleep(due - now)
+            elif now - due > 2 * period_ms / 1000:
+                stats.overflows += 1
+            t = time.perf_counter()
+            engine._callback(indata, BLOCK_SIZE, types.SimpleNamespace(currentTime=t, inputBufferAdcTime=t), STATUS_OK)
+        reader.event.set()
+
+    producer = threading.Thread(target=device)
+    producer.start()
+    done = 0
+    while done < blocks:
+        chunk = reader.read_blocks(timeout=0.1)
+        stats.backlog(len(chunk))
+        for _block in chunk:
+            t0 = time.perf_counter()
+            vad_cost(done, vad_ms, stall_ms)
+            stats.add('vad', time.perf_counter() - t0)
+            done += 1
+        if not chunk and not producer.is_alive():
+            break
+    producer.join()
+    stats.dropped = reader.dropped
+    stats.add('capture', engine.callback_time, engine.callbacks)
+    return stats
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--blocks", type=int, default=2000)
+    ap.add_argument("--period-ms", type=float, default=4.0, help="Block period (32 ms in real time)")
+    ap.add_argument("--vad-ms", type=float, default=1.0)
+    ap.add_argument("--stall-ms", type=float, default=60.0)
+    args = ap.parse_args()
+
+    print(f"{args.blocks} blocks every {args.period_ms} ms, VAD {args.vad_ms} ms/block + {args.stall_ms} ms stall every 100 blocks\n")
+    print(f"inline: {inline(args.blocks, args.period_ms, args.vad_ms, args.stall_ms)} overflows")
+    st = staged(args.blocks, args.period_ms, args.vad_ms, args.stall_ms)
+    print(f"staged: {st.overflows} overflows, {st.dropped} samples dropped, max backlog {st.max_backlog} blocks")
+    print(f"        per block: {st.summary()}")
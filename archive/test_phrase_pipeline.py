@@ -0,0 +1,83 @@
+"""Dictation pipeline ordering: the tail waits for the first phrase's wake word.
+
+The first phrase is checked for the wake word in a background thread; stop_rec
+must not pick the tail's mode (and queue priority) before that check switched
+`vt.mode`. A fake transcriber and a slow fake wake-word check stand in for the
+models. Run directly or with pytest:
+
+    python archive/test_phrase_pipeline.py
+    pytest archive/test_phrase_pipeline.py
+"""
+import os
+import sys
+import time
+import types
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import transcription_queue
+from core.phrase_pipeline import PhrasePipeline, BLOCK_SIZE
+
+SR = 16000
+
+
+class FakeTranscriber:
+    def transcribe_array(self, audio, sr, language=None, **kwargs):
+        return " phrase"
+
+
+class FakeVT:
+    def __init__(self, wakeword_delay):
+        self.sr, self.language, self.rec_noise = SR, None, None
+        self.mode = 'dictation'
+        self.vad = types.SimpleNamespace(threshold=0.5)
+        self.audio_enhancer = types.SimpleNamespace(enhance_audio=lambda audio, noise: audio)
+        self.aud = []
+        self.delay = wakeword_delay
+
+    def check_wakeword(self, audio):
+        time.sleep(self.delay)
+        self.mode = 'command'
+
+
+def record(pipeline, vt, seconds, prob):
+    for _i in range(int(seconds * SR / BLOCK_SIZE)):
+        vt.aud.append(np.zeros(BLOCK_SIZE, dtype=np.float32))
+        pipeline.feed(prob)
+
+
+def test_tail_waits_for_wakeword():
+    transcription_queue._transcriber = FakeTranscriber()
+    vt = FakeVT(wakeword_delay=0.3)
+    pipeline = PhrasePipeline(vt, min_phrase_seconds=2)
+    record(pipeline, vt, 2.5, 0.9)
+    record(pipeline, vt, 0.6, 0.1)   # Pause: the first phrase is cut and checked
+    record(pipeline, vt, 0.5, 0.9)   # Key released right after, while the check still runs
+    assert pipeline.pending and vt.mode == 'dictation'
+
+    pipeline.wait_mode(timeout=5)
+    assert vt.mode == 'command'
+    texts, audios = pipeline.collect(timeout=5)
+    assert texts == ["phrase"] and len(audios) == 1
+
+
+def test_wait_mode_timeout_cancels():
+    transcription_queue._transcriber = FakeTranscriber()
+    vt = FakeVT(wakeword_delay=0.5)
+    pipeline = PhrasePipeline(vt, min_phrase_seconds=2)
+    record(pipeline, vt, 2.5, 0.9)
+    record(pipeline, vt, 0.6, 0.1)
+    try:
+        pipeline.wait_mode(timeout=0.05)
+        assert False, "wait_mode should time out"
+    except TimeoutError:
+        pass
+    assert pipeline.jobs[0]['cancelled']
+    pipeline.jobs[0]['done'].wait(5)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,75 @@
+"""Dictation queue-wait with and without a meeting backlog.
+
+Loads the configured ASR model, then submits dictations alone and again while both
+meeting streams keep the queue full. With priority scheduling the dictation wait
+should stay roughly flat; meeting waits grow instead.
+
+Usage:
+    python archive/test_queue_priority.py [--meeting-segments 16] [--dictations 5]
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import transcription_queue as tq
+from core.transcription import create_transcriber
+from core.transcription.base import warmup_audio
+
+SR = 16000
+
+
+def dictations(n, language):
+    """Submit dictations one after another, like a user would"""
+    for _ in range(n):
+        tq.transcribe_array(warmup_audio(3, SR), SR, language=language, timeout=300, priority=tq.DICTATION)
+        time.sleep(0.5)
+
+
+def meeting_load(n, language):
+    threads = [threading.Thread(target=tq.transcribe_array, args=(warmup_audio(8, SR), SR),
+                                kwargs={'language': language, 'timeout': 600,
+                                        'priority': tq.MEETING_MIC if i % 2 else tq.MEETING_SYSTEM})
+               for i in range(n)]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def report(title):
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+    for name, st in tq.queue_stats().items():
+        if st['count']:
+            print(f"{name:<15} n={st['count']:<3} p50 {st['p50_ms']:8.0f} ms  p95 {st['p95_ms']:8.0f} ms  max {st['max_ms']:8.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--meeting-segments', type=int, default=16)
+    parser.add_argument('--dictations', type=int, default=5)
+    args = parser.parse_args()
+
+    cfg = yaml.safe_load(open('config.yaml', encoding='utf-8'))['asr']
+    language = cfg.get('language')
+    tc = create_transcriber(cfg['model'])
+    tc.initialize()
+    tc.warmup((1, 5), SR, language=language)
+
+    tq.init(tc, max_workers=args.meeting_segments + 2, replicas=cfg.get('replicas', 1))
+    dictations(args.dictations, language)
+    report("Idle queue")
+    tq.shutdown()
+
+    tq.init(tc, max_workers=args.meeting_segments + 2, replicas=cfg.get('replicas', 1))
+    threads = meeting_load(args.meeting_segments, language)
+    time.sleep(0.2)
+    dictations(args.dictations, language)
+    for t in threads:
+        t.join()
+    report(f"Under meeting load ({args.meeting_segments} queued segments)")
+    tq.shutdown()
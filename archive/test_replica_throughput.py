@@ -0,0 +1,65 @@
+"""Transcription queue throughput with N = 1..4 ASR replicas.
+
+Submits a meeting-like burst of utterances from several threads at once and reports
+audio seconds transcribed per wall-clock second. Run it on a CPU-only machine to size
+`asr.replicas` in config.yaml (on Windows, faster-whisper serves N sessions from one
+model instead of loading N copies).
+
+Usage:
+    python archive/test_replica_throughput.py [--max-replicas 4] [--utterances 12]
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core import transcription_queue
+from core.transcription import create_transcriber
+from core.transcription.base import warmup_audio
+
+SR = 16000
+DURATIONS = [2, 5, 8]  # Mix of meeting segment lengths
+
+
+def burst(n_utterances, language):
+    """Submit every utterance concurrently; return (audio seconds, wall seconds)"""
+    clips = [warmup_audio(DURATIONS[i % len(DURATIONS)], SR) for i in range(n_utterances)]
+    threads = [threading.Thread(target=transcription_queue.transcribe_array, args=(c,),
+                                kwargs={'sr': SR, 'language': language, 'timeout': 600}) for c in clips]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(c.size for c in clips) / SR, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--max-replicas', type=int, default=4)
+    parser.add_argument('--utterances', type=int, default=12)
+    args = parser.parse_args()
+
+    cfg = yaml.safe_load(open('config.yaml', encoding='utf-8'))['asr']
+    language = cfg.get('language')
+    results = []
+    for n in range(1, args.max_replicas + 1):
+        tc = create_transcriber(cfg['model'], num_workers=n)
+        tc.initialize()
+        tc.warmup((1,), SR, language=language)
+        transcription_queue.init(tc, max_workers=args.utterances, replicas=n)
+        audio_s, wall_s = burst(args.utterances, language)
+        transcription_queue.shutdown()
+        results.append((n, audio_s, wall_s))
+        del tc
+
+    print("=" * 60)
+    print(f"Throughput for {args.utterances} concurrent utterances ({cfg['model']}, {os.cpu_count()} CPUs)")
+    print("=" * 60)
+    base = results[0][1] / results[0][2]
+    for n, audio_s, wall_s in results:
+        rate = audio_s / wall_s
+        print(f"N={n}: {audio_s:6.0f}s audio in {wall_s:6.1f}s -> {rate:6.2f} audio s/s ({rate / base:4.2f}x)")
@@ -0,0 +1,164 @@
+"""Meeting segmentation: fixed 1.5 s-pause segmenter vs. AdaptiveSegmenter.
+
+Feeds a synthetic 30-minute meeting (monologues with only short breathing pauses,
+back-and-forth discussion, silences) through both segmenters as per-block VAD
+probabilities, then models a single ASR worker (fixed cost per call plus a real-time
+factor) and reports, for every block of speech, the time from when it was spoken to
+when its transcript is available. The checks at the bottom also run under pytest:
+
+    python archive/test_segmenter.py [--minutes 30] [--call-s 0.35] [--rtf 0.05]
+    pytest archive/test_segmenter.py
+"""
+import os
+import sys
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.audio_capture import BLOCK_SIZE
+from core.meeting.segmenter import AdaptiveSegmenter, drop_repeated_prefix, window_probs
+
+SR = 16000
+THRESHOLD = 0.6
+
+
+def synthetic_meeting(minutes, seed=0):
+    """Per-block speech probabilities"""
+    rng = np.random.default_rng(seed)
+    blocks_per_s = SR / BLOCK_SIZE
+    probs = []
+
+    def span(seconds, low, high):
+        probs.extend(rng.uniform(low, high, max(1, int(seconds * blocks_per_s))))
+
+    while len(probs) < minutes * 60 * blocks_per_s:
+        kind = rng.choice(["monologue", "discussion", "silence"], p=[0.3, 0.5, 0.2])
+        if kind == "monologue":
+            for _i in range(rng.integers(20, 60)):
+                span(rng.uniform(1.5, 5), 0.7, 1.0)
+                span(rng.uniform(0.2, 0.9), 0.1, 0.5)  # Breathing pause, too short to cut
+        elif kind == "discussion":
+            for _i in range(rng.integers(5, 20)):
+                span(rng.uniform(0.5, 4), 0.7, 1.0)
+                span(rng.uniform(1.6, 3), 0.0, 0.3)
+        else:
+            span(rng.uniform(2, 10), 0.0, 0.2)
+    return np.array(probs, dtype=np.float32)
+
+
+def fixed_segments(probs, silence_s=1.5, max_s=60, pre_speech_s=1.0):
+    """The previous rule: cut after silence_s of silence (or at max_s), trailing silence included"""
+    out, start, active, silence = [], 0, False, 0
+    for i, p in enumerate(probs):
+        end = (i + 1) * BLOCK_SIZE
+        if p > THRESHOLD:
+            active, silence = True, 0
+        elif active:
+            silence += BLOCK_SIZE
+        else:
+            start = max(start, end - int(pre_speech_s * SR))
+        too_long = active and end - start >= max_s * SR
+        if active and (silence >= silence_s * SR or too_long):
+            out.append((end, [(start, end)]))
+            start, active, silence = end, too_long and silence < silence_s * SR, 0
+    return out
+
+
+def adaptive_segments(probs, **kwargs):
+    seg = AdaptiveSegmenter(SR, THRESHOLD, **kwargs)
+    out = []
+    for i, p in enumerate(probs):
+        end = (i + 1) * BLOCK_SIZE
+        out.extend((end, ranges) for ranges, _overlap in seg.feed(p, end))
+    out.extend((len(probs) * BLOCK_SIZE, ranges) for ranges, _overlap in seg.flush(len(probs) * BLOCK_SIZE))
+    return out
+
+
+def latencies(probs, segments, call_s, rtf):
+    """Spoken-to-transcribed time of every speech block, with one ASR worker"""
+    free_at, result = 0.0, []
+    speech = probs > THRESHOLD
+    for emitted, ranges in segments:
+        duration = sum(e - s for s, e in ranges) / SR
+        done = max(free_at, emitted / SR) + call_s + rtf * duration
+        free_at = done
+        for s, e in ranges:
+            ends = (np.flatnonzero(speech[s // BLOCK_SIZE:e // BLOCK_SIZE]) + s // BLOCK_SIZE + 1) * BLOCK_SIZE / SR
+            result.extend(done - ends)
+    return np.array(result)
+
+
+def report(name, probs, segments, call_s, rtf):
+    lengths = np.array([sum(e - s for s, e in ranges) / SR for _t, ranges in segments])
+    lat = latencies(probs, segments, call_s, rtf)
+    print(f"{name:<9} {len(segments):>6} {np.median(lengths):>7.1f} {lengths.max():>7.1f} {lengths.sum() / 60:>8.1f}"
+          f" {np.percentile(lat, 50):>7.1f} {np.percentile(lat, 95):>7.1f} {lat.max():>7.1f}")
+    return lengths, lat
+
+
+def test_monologue_split_at_quietest_block():
+    # 80 s of speech with one dip at 20 s and another at 25 s, deeper
+    probs = np.full(int(80 * SR / BLOCK_SIZE), 0.9, dtype=np.float32)
+    probs[int(20 * SR / BLOCK_SIZE)] = 0.5
+    probs[int(25 * SR / BLOCK_SIZE)] = 0.3
+    cuts = adaptive_segments(probs, max_s=30)
+    first = cuts[0][1][0]
+    assert (first[1] - first[0]) / SR < 30.1
+    assert abs(first[1] / SR - 25.5) < 0.1  # Cut at the deeper dip, plus the overlap
+    assert all(e - s <= 30 * SR + BLOCK_SIZE for _t, ranges in cuts for s, e in ranges)
+
+
+def test_short_utterances_merged():
+    probs = np.concatenate([np.r_[np.full(50, 0.9), np.full(60, 0.1)] for _i in range(6)]).astype(np.float32)
+    cuts = adaptive_segments(probs)
+    assert len(cuts) < 6
+    assert fixed_segments(probs) and len(fixed_segments(probs)) == 6
+
+
+def test_overlap_reported():
+    seg = AdaptiveSegmenter(SR, THRESHOLD, max_s=10, overlap_s=0.5)
+    out = []
+    for i in range(int(25 * SR / BLOCK_SIZE)):
+        out.extend(seg.feed(0.9, (i + 1) * BLOCK_SIZE))
+    assert out[0][1] == 0 and out[1][1] == int(0.5 * SR)
+
+
+def test_probs_follow_merged_audio():
+    # Two utterances merged into one segment: the probabilities must line up with the joined audio
+    seg = AdaptiveSegmenter(SR, THRESHOLD, target_s=6)
+    probs = np.r_[np.zeros(40), np.full(60, 0.9), np.zeros(70), np.full(100, 0.8), np.zeros(120)].astype(np.float32)
+    cuts = []
+    for i, p in enumerate(probs):
+        cuts.extend(seg.feed(p, (i + 1) * BLOCK_SIZE))
+    (ranges, _overlap), = cuts
+    assert len(ranges) == 2
+    windows = seg.probs_for(ranges)
+    first = -(-(ranges[0][1] - ranges[0][0]) // BLOCK_SIZE)
+    assert windows.size == -(-sum(e - s for s, e in ranges) // BLOCK_SIZE)
+    assert windows[first - 12] == np.float32(0.9) and windows[first + 40] == np.float32(0.8)
+    assert window_probs([0.1, 0.9, 0.2], [171, 171, 171]).tolist() == [np.float32(0.9)]
+
+
+def test_drop_repeated_prefix():
+    assert drop_repeated_prefix("we should ship it next week.", "Next week, after the review.") == "after the review."
+    assert drop_repeated_prefix("我们下周发布。", "下周发布之前再测一次") == "之前再测一次"
+    assert drop_repeated_prefix("that is fine", "so that works") == "so that works"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--minutes", type=float, default=30)
+    ap.add_argument("--call-s", type=float, default=0.35, help="Fixed ASR cost per call")
+    ap.add_argument("--rtf", type=float, default=0.05, help="ASR seconds per second of audio")
+    args = ap.parse_args()
+
+    probs = synthetic_meeting(args.minutes)
+    print(f"{args.minutes:.0f} min synthetic meeting, ASR {args.call_s:.2f}s/call + {args.rtf:.2f}x real time\n")
+    print(f"{'':<9} {'calls':>6} {'len p50':>7} {'len max':>7} {'audio min':>8} {'lat p50':>7} {'lat p95':>7} {'lat max':>7}")
+    report("fixed", probs, fixed_segments(probs), args.call_s, args.rtf)
+    report("adaptive", probs, adaptive_segments(probs), args.call_s, args.rtf)
+    print()
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
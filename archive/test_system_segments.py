@@ -0,0 +1,102 @@
+"""System audio segments: speech still going on when the meeting stops is kept.
+
+The system recorders cut their stream with PauseSegmenter and flush it on their
+stopping pass; stop_audio_recording then spools and queues what the recorder
+flushed. The recorder here does the same with synthetic VAD probabilities, so no
+audio device (or BlackHole/loopback backend) is needed. Run directly or with pytest:
+
+    python archive/test_system_segments.py
+    pytest archive/test_system_segments.py
+"""
+import os
+import sys
+import queue
+import time
+import types
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.audio_capture import BLOCK_SIZE
+from core.audio_utils import VAD_WINDOW
+from core.meeting.audio_processor import MeetingAudioProcessor
+from core.meeting.audio_spool import AudioSpool
+from core.meeting.segmenter import PauseSegmenter
+
+SR = 16000
+THRESHOLD = 0.6
+
+
+def feed(cutter, seconds, prob, clock, out):
+    """Feed `seconds` of blocks with probability `prob`; `clock` is the capture time so far"""
+    for _i in range(int(seconds * SR / BLOCK_SIZE)):
+        clock[0] += BLOCK_SIZE / SR
+        segment = cutter.feed(np.full(BLOCK_SIZE, prob / 10, dtype=np.float32), prob, clock[0])
+        if segment is not None:
+            out.append(segment)
+
+
+class StoppingRecorder:
+    """Recorder whose stop() flushes its PauseSegmenter, like the real stopping pass"""
+
+    def __init__(self, start):
+        self.audio_queue = queue.Queue(maxsize=100)
+        self.cutter = PauseSegmenter(SR, THRESHOLD)
+        self.clock = [start]
+        segments = []
+        feed(self.cutter, 0.5, 0.1, self.clock, segments)
+        feed(self.cutter, 3.0, 0.9, self.clock, segments)  # Still talking when the meeting stops
+        assert not segments
+
+    def stop(self):
+        segment = self.cutter.flush()
+        if segment is not None:
+            self.audio_queue.put(segment)
+
+    def get_speech_segments(self):
+        segments = []
+        while not self.audio_queue.empty():
+            segments.append(self.audio_queue.get_nowait())
+        return segments
+
+
+def test_pause_cut_and_flush():
+    cutter, clock, out = PauseSegmenter(SR, THRESHOLD), [100.0], []
+    feed(cutter, 3.0, 0.1, clock, out)   # Silence: only PRE_SPEECH_S of it is kept
+    feed(cutter, 2.0, 0.9, clock, out)
+    feed(cutter, 1.2, 0.1, clock, out)   # Pause closes the first segment
+    assert len(out) == 1
+    first = out[0]
+    assert abs(first.audio.size / SR - 4.0) < 0.1  # 1 s before speech, 2 s of speech, the 1 s pause
+    # Starts PRE_SPEECH_S (31 blocks) before the speech, which began after 93 silent blocks
+    assert abs(first.captured_at - (100.0 + (93 - 31) * BLOCK_SIZE / SR)) < 1e-6
+
+    feed(cutter, 1.5, 0.9, clock, out)   # Recording stops mid-sentence
+    last = cutter.flush()
+    assert len(out) == 1 and last is not None
+    assert last.probs.size == -(-last.audio.size // VAD_WINDOW)
+    assert last.probs[-1] == np.float32(0.9)
+    assert cutter.flush() is None        # Nothing left after flushing
+
+
+def test_stop_stores_last_segment():
+    ref = types.SimpleNamespace(sr=SR, meeting_microphone_vad=None, meeting_system_vad=None,
+                                audio_enhancer=types.SimpleNamespace(new_stream=lambda: None))
+    processor = MeetingAudioProcessor(ref)
+    with tempfile.TemporaryDirectory() as spool_dir:
+        processor.timeline_start = time.perf_counter()
+        processor.system_spool = AudioSpool(spool_dir, "system", SR)
+        processor.system_recorder = StoppingRecorder(processor.timeline_start)
+        processor.stop_audio_recording()
+
+        segment = processor.system_audio_queue.get_nowait()
+        assert abs(segment.audio.size / SR - 3.5) < 0.1
+        assert len(processor.system_spool) == processor.timeline_position(segment.captured_at) + segment.audio.size
+        processor.system_spool.close()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
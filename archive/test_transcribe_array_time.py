@@ -0,0 +1,91 @@
+"""Per-utterance cost of the temp-WAV path vs. the in-memory transcribe_array path.
+
+Usage:
+    python archive/test_transcribe_array_time.py            # I/O overhead only
+    python archive/test_transcribe_array_time.py --asr      # also run the configured ASR model
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import soundfile as sf
+import scipy.io.wavfile as wav
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SR = 16000
+DURATIONS = [1, 3, 5, 10, 20]
+
+
+def make_utterance(seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(SR * seconds)) / SR
+    return (0.3 * np.sin(2 * np.pi * 220 * t) + 0.05 * rng.standard_normal(t.size)).astype(np.float32)
+
+
+def wav_roundtrip(audio):
+    """What stop_rec used to do: int16 WAV write, then the backend reads it back"""
+    tf = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+    wav.write(tf.name, SR, (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16))
+    tf.close()
+    try:
+        data, _ = sf.read(tf.name, dtype='float32')
+    finally:
+        os.unlink(tf.name)
+    return data
+
+
+def bench_io(runs=20):
+    print("=" * 60)
+    print("Temp WAV write + read overhead per utterance")
+    print("=" * 60)
+    for sec in DURATIONS:
+        audio = make_utterance(sec)
+        wav_roundtrip(audio)  # warm the page cache
+        t0 = time.perf_counter()
+        for _ in range(runs):
+            wav_roundtrip(audio)
+        ms = (time.perf_counter() - t0) * 1000 / runs
+        print(f"{sec:>3}s utterance: {ms:7.2f} ms saved")
+
+
+def bench_asr(runs=3):
+    import yaml
+    from core.transcription import create_transcriber
+    cfg = yaml.safe_load(open('config.yaml', encoding='utf-8'))
+    tc = create_transcriber(cfg['asr']['model'])
+    tc.initialize()
+    lang = cfg['asr'].get('language')
+
+    print("=" * 60)
+    print(f"End-to-end ASR ({cfg['asr']['model']}): file path vs. in-memory")
+    print("=" * 60)
+    for sec in DURATIONS:
+        audio = make_utterance(sec)
+        tc.transcribe_array(audio, SR, language=lang)
+
+        path_ms, array_ms = [], []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            tf = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+            wav.write(tf.name, SR, (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16))
+            tf.close()
+            try:
+                tc.transcribe(tf.name, language=lang)
+            finally:
+                os.unlink(tf.name)
+            path_ms.append((time.perf_counter() - t0) * 1000)
+
+            t0 = time.perf_counter()
+            tc.transcribe_array(audio, SR, language=lang)
+            array_ms.append((time.perf_counter() - t0) * 1000)
+
+        p, a = np.median(path_ms), np.median(array_ms)
+        print(f"{sec:>3}s utterance: path {p:8.1f} ms | array {a:8.1f} ms | saved {p - a:7.1f} ms")
+
+
+if __name__ == "__main__":
+    bench_io()
+    if "--asr" in sys.argv:
+        bench_asr()
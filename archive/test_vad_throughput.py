@@ -0,0 +1,74 @@
+"""Silero VAD throughput in 512-sample frames per second.
+
+Compares the old per-chunk path (concatenate context + chunk, new input dict every call)
+with the preallocated VADStream path, for one stream and for two streams sharing a session.
+
+Usage:
+    python archive/test_vad_throughput.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.audio_utils import SileroVAD
+
+SECONDS = 30
+N_FRAMES = SECONDS * 16000 // 512
+
+
+def make_audio(seed):
+    rng = np.random.default_rng(seed)
+    t = np.arange(SECONDS * 16000) / 16000
+    return (0.3 * np.sin(2 * np.pi * 180 * t) * (np.sin(2 * np.pi * 0.5 * t) > 0)
+            + 0.02 * rng.standard_normal(t.size)).astype(np.float32)
+
+
+def legacy_frames(vad, audio):
+    """Per-chunk allocation pattern used before VADStream"""
+    state = np.zeros((2, 1, 128), dtype=np.float32)
+    context = np.zeros((1, 64), dtype=np.float32)
+    for i in range(N_FRAMES):
+        chunk = audio[i * 512:(i + 1) * 512]
+        x = np.concatenate([context, chunk.reshape(1, -1).astype(np.float32)], axis=1)
+        out, state = vad.model.run(None, {'input': x, 'state': state, 'sr': np.array(16000, dtype=np.int64)})
+        context = x[:, -64:]
+
+
+def stream_frames(vad, audio):
+    stream = vad.new_stream()
+    for i in range(N_FRAMES):
+        vad.predict(audio[i * 512:(i + 1) * 512], stream)
+
+
+def timed(fn, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if __name__ == "__main__":
+    vad = SileroVAD()
+    if not vad.model:
+        sys.exit("VAD model failed to load")
+    mic, system = make_audio(0), make_audio(1)
+
+    print("=" * 60)
+    print(f"VAD throughput over {SECONDS}s of audio ({N_FRAMES} frames per stream)")
+    print("=" * 60)
+    t = timed(legacy_frames, vad, mic)
+    print(f"legacy per-chunk alloc : {N_FRAMES / t:8.0f} frames/s")
+    t = timed(stream_frames, vad, mic)
+    print(f"VADStream (1 stream)   : {N_FRAMES / t:8.0f} frames/s")
+    t = timed(lambda: (stream_frames(vad, mic), stream_frames(vad, system)))
+    print(f"2 streams, sequential  : {2 * N_FRAMES / t:8.0f} frames/s")
+
+    probs = vad.speech_probs(mic)
+    t0 = time.perf_counter()
+    for _ in range(100):
+        vad.timestamps_from_probs(probs, len(mic))
+    print(f"hysteresis post-processing: {(time.perf_counter() - t0) * 10:.3f} ms per {SECONDS}s buffer")
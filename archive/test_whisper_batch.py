@@ -0,0 +1,84 @@
+"""faster-whisper batching: does transcribe_batch really reach the batched pipeline?
+
+Replaces the BatchedInferencePipeline of a WhisperTranscriber with a fake that
+records its arguments and returns one segment per clip (offset like the real
+pipeline does), then checks that a batch of segments goes out in one call with
+sample-based clip_timestamps and that the texts come back to the right segment.
+No model is loaded. Runs directly or under pytest:
+
+    python archive/test_whisper_batch.py
+    pytest archive/test_whisper_batch.py
+"""
+import os
+import sys
+import types
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.transcription.whisper_ import WhisperTranscriber, BATCH_SIZE
+
+SR = 16000
+
+
+class FakeBatched:
+    def __init__(self, words_per_clip=2):
+        self.calls = []
+        self.words = words_per_clip
+
+    def transcribe(self, audio, language=None, beam_size=5, batch_size=8, clip_timestamps=None, vad_filter=True):
+        self.calls.append({'samples': audio.size, 'batch_size': batch_size, 'clips': clip_timestamps})
+        segments = []
+        for n, clip in enumerate(clip_timestamps):
+            step = (clip["end"] - clip["start"]) / self.words
+            for w in range(self.words):
+                start = (clip["start"] + w * step) / SR
+                segments.append(types.SimpleNamespace(start=start, end=start + step / SR, text=f" clip{n}.{w}"))
+        return iter(segments), None
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio, beam_size=5, language=None):
+        self.calls += 1
+        return iter([types.SimpleNamespace(start=0.0, end=audio.size / SR, text=" single")]), None
+
+
+def transcriber(batched):
+    # Skip __init__: no model download, no OpenCC
+    tc = WhisperTranscriber.__new__(WhisperTranscriber)
+    tc.sys, tc.model_name, tc.is_initialized = "Windows", "fake", True
+    tc.model, tc.batched = FakeModel(), batched
+    tc.max_batch_size = BATCH_SIZE
+    return tc
+
+
+def test_batch_reaches_pipeline():
+    batched = FakeBatched()
+    tc = transcriber(batched)
+    audios = [np.zeros(int(s * SR), dtype=np.float32) for s in (3, 7.3, 0.5)]
+    texts = tc.transcribe_batch(audios, SR, language="en")
+    assert len(batched.calls) == 1 and tc.model.calls == 0
+    call = batched.calls[0]
+    assert call['batch_size'] == 3
+    clips = call['clips']
+    assert all(isinstance(c["start"], int) and isinstance(c["end"], int) for c in clips)
+    assert [c["end"] - c["start"] for c in clips] == [a.size for a in audios]
+    assert clips[-1]["end"] <= call['samples']
+    assert texts == [" clip0.0 clip0.1", " clip1.0 clip1.1", " clip2.0 clip2.1"]
+
+
+def test_single_and_unbatched_fall_back():
+    tc = transcriber(FakeBatched())
+    assert tc.transcribe_batch([np.zeros(SR, dtype=np.float32)], SR) == [" single"]
+    tc.max_batch_size = 1
+    assert tc.transcribe_batch([np.zeros(SR, dtype=np.float32)] * 2, SR) == [" single"] * 2
+    assert not tc.batched.calls and tc.model.calls == 3
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_"):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,83 @@
+"""Background encoding of dictation recordings.
+
+Typing the text no longer waits for ffmpeg: stop_rec hands the in-memory buffer to a
+small worker pool and the journal entry is written once the file exists. The queue is
+bounded so a slow encoder can never pile up unbounded audio; when it is full, or
+encoding fails, the recording is not archived but `on_done(None)` still runs, so the
+transcription is journaled without a file.
+"""
+import queue
+import threading
+import numpy as np
+
+from core.i18n import _
+
+FORMATS = {'mp3': '.mp3', 'opus': '.ogg'}
+
+
+class AudioArchiver:
+    def __init__(self, fmt='mp3', workers=1, max_pending=16):
+        """`fmt`: 'mp3' (pydub/ffmpeg), 'opus' (in-process via soundfile/libsndfile) or 'none'"""
+        self.fmt = fmt if fmt in FORMATS or fmt == 'none' else 'mp3'
+        self.jobs = queue.Queue(maxsize=max_pending)
+        self.workers = [threading.Thread(target=self._worker, daemon=True) for _i in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    @property
+    def extension(self):
+        return FORMATS.get(self.fmt, '')
+
+    def submit(self, audio, sr, path_base, on_done=None):
+        """Queue `audio` for encoding to `path_base` + extension; `on_done(path)` runs after writing.
+
+        With archiving disabled or the queue full `on_done(None)` runs right away. Never blocks.
+        """
+        if self.fmt == 'none':
+            on_done and on_done(None)
+            return True
+        try:
+            self.jobs.put_nowait((audio, sr, path_base + self.extension, on_done))
+            return True
+        except queue.Full:
+            print(_("⚠️ Archive encoder is behind, recording not saved"))
+            on_done and on_done(None)
+            return False
+
+    def _worker(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            audio, sr, path, on_done = job
+            try:
+                self._encode(audio, sr, path)
+            except Exception as e:
+                print(_("⚠️ Could not save recording {}: {}").format(path, e))
+                path = None
+            try:
+                on_done and on_done(path)
+            except Exception as e:
+                print(_("⚠️ Could not journal recording: {}").format(e))
+            finally:
+                self.jobs.task_done()
+
+    def _encode(self, audio, sr, path):
+        audio = np.clip(np.asarray(audio, dtype=np.float32).reshape(-1), -1.0, 1.0)
+        if self.fmt == 'opus':
+            import soundfile as sf
+            sf.write(path, audio, sr, format='OGG', subtype='OPUS')
+        else:
+            from pydub import AudioSegment
+            pcm = (audio * 32767).astype(np.int16).tobytes()
+            AudioSegment(data=pcm, sample_width=2, frame_rate=sr, channels=1).export(path, format="mp3", parameters=["-q:a", "2"])
+
+    def shutdown(self, timeout=5.0):
+        """Finish queued recordings (up to `timeout` seconds each worker) and stop the workers"""
+        for _worker in self.workers:
+            try:
+                self.jobs.put(None, timeout=timeout)
+            except queue.Full:
+                break
+        for worker in self.workers:
+            worker.join(timeout)
@@ -0,0 +1,212 @@
+import time
+import threading
+import numpy as np
+from core.audio_utils import AudioDeviceSelector
+
+BLOCK_SIZE = 512
+
+
+class RingBuffer:
+    """Preallocated float32 ring written by one producer (the audio callback).
+
+    Positions are absolute sample counts since the buffer was created, so any number
+    of readers can keep their own cursor without locks: the producer copies a block in
+    and only then advances `written`. Views returned by `view()` alias the ring and stay
+    valid until the producer wraps around, i.e. for `capacity` samples.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = np.zeros(capacity, dtype=np.float32)
+        self.written = 0
+
+    def write(self, samples):
+        n = len(samples)
+        if n > self.capacity:
+            samples, n = samples[-self.capacity:], self.capacity
+        pos = self.written % self.capacity
+        first = min(n, self.capacity - pos)
+        self.data[pos:pos + first] = samples[:first]
+        if first < n:
+            self.data[:n - first] = samples[first:]
+        self.written += n  # Publish after the copy
+
+    @property
+    def oldest(self):
+        return max(0, self.written - self.capacity)
+
+    def view(self, start, end):
+        """Samples [start, end) as a zero-copy view, or a copy if the range wraps around"""
+        start = max(start, self.oldest)
+        end = min(end, self.written)
+        if end <= start:
+            return self.data[:0]
+        a, b = start % self.capacity, end % self.capacity
+        if a < b or b == 0:
+            return self.data[a:b or self.capacity]
+        return np.concatenate((self.data[a:], self.data[:b]))
+
+    def read(self, start, end):
+        """Samples [start, end) as an owned copy"""
+        out = self.view(start, end)
+        return out.copy() if out.base is self.data else out
+
+
+class RingReader:
+    """One consumer's cursor into a RingBuffer"""
+
+    def __init__(self, engine, start):
+        self.engine = engine
+        self.ring = engine.ring
+        self.pos = start
+        self.dropped = 0  # Samples overwritten before this reader got to them
+        self.event = threading.Event()
+
+    def available(self):
+        return self.ring.written - self.pos
+
+    def read_blocks(self, timeout=None, block_size=BLOCK_SIZE):
+        """Wait up to `timeout` for data and return every complete block as a view.
+
+        Blocks line up with the ring when its capacity is a multiple of `block_size`,
+        so no copy is made. Copy a block before keeping it longer than the ring holds.
+        """
+        if self.available() < block_size and timeout:
+            self.event.clear()
+            if self.available() < block_size:
+                self.event.wait(timeout)
+        if self.pos < self.ring.oldest:
+            self.dropped += self.ring.oldest - self.pos
+            self.pos = self.ring.oldest
+        blocks = []
+        while self.ring.written - self.pos >= block_size:
+            blocks.append(self.ring.view(self.pos, self.pos + block_size))
+            self.pos += block_size
+        return blocks
+
+    def close(self):
+        self.engine.remove_reader(self)
+
+
+class PipelineStats:
+    """Health of a capture pipeline: time per block spent in each stage, and lost audio.
+
+    `overflows` counts blocks the audio driver dropped because the capture side did not
+    keep up; `dropped` counts samples a consumer stage lost by falling a whole buffer
+    behind; `max_backlog` is the most blocks a stage found waiting at once. Each stage
+    is written by a single thread, so no lock is taken.
+    """
+
+    def __init__(self):
+        self.time = {}
+        self.blocks = {}
+        self.overflows = 0
+        self.dropped = 0
+        self.max_backlog = 0
+
+    def add(self, stage, seconds, blocks=1):
+        self.time[stage] = self.time.get(stage, 0.0) + seconds
+        self.blocks[stage] = self.blocks.get(stage, 0) + blocks
+
+    def backlog(self, blocks):
+        self.max_backlog = max(self.max_backlog, blocks)
+
+    def per_block_ms(self):
+        """{stage: mean milliseconds per block}, in the order the stages were first seen"""
+        return {stage: 1000 * t / self.blocks[stage] for stage, t in self.time.items() if self.blocks[stage]}
+
+    def summary(self):
+        return ", ".join(f"{stage} {ms:.3f} ms" for stage, ms in self.per_block_ms().items())
+
+
+class CaptureEngine:
+    """Callback-mode input stream feeding a RingBuffer shared by any number of readers.
+
+    The PortAudio callback only copies the block into the ring and wakes readers; VAD,
+    wake word and buffering happen on the consumers' threads, so slow work never
+    blocks the audio thread and no lock is taken per block.
+    """
+
+    def __init__(self, sample_rate=16000, block_size=BLOCK_SIZE, seconds=30.0, device=None, latency='low'):
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.device = device
+        self.latency = latency
+        blocks = max(2, int(seconds * sample_rate) // block_size)
+        self.ring = RingBuffer(blocks * block_size)
+        self.stream = None
+        self._readers = []
+        self.overflows = 0
+        self.callbacks = 0
+        self.callback_time = 0.0
+        self._anchor = None  # (position, perf_counter time) of the latest block's first sample
+
+    def start(self):
+        self.stream = AudioDeviceSelector.input_stream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype=np.float32,
+            blocksize=self.block_size,
+            latency=self.latency,
+            device=self.device,
+            callback=self._callback
+        )
+        self.stream.start()
+        return self
+
+    def _callback(self, indata, frames, time_info, status):
+        t = time.perf_counter()
+        if status.input_overflow:
+            self.overflows += 1
+        # PortAudio's ADC time says how long ago the block's first sample was captured
+        latency = time_info.currentTime - time_info.inputBufferAdcTime if time_info.inputBufferAdcTime > 0 else 0.0
+        self._anchor = (self.ring.written, t - max(0.0, latency))
+        self.ring.write(indata[:, 0])
+        for reader in self._readers:
+            reader.event.set()
+        self.callbacks += 1
+        self.callback_time += time.perf_counter() - t
+
+    @property
+    def position(self):
+        """Absolute sample index of the next sample to be captured"""
+        return self.ring.written
+
+    def position_at(self, t):
+        """Sample position captured at perf_counter time `t`, on this stream's sample clock"""
+        if self._anchor is None:
+            return None
+        position, at = self._anchor
+        return position + int(round((t - at) * self.sample_rate))
+
+    def time_of(self, position):
+        """perf_counter time at which sample `position` was captured"""
+        if self._anchor is None:
+            return None
+        anchor, at = self._anchor
+        return at + (position - anchor) / self.sample_rate
+
+    def reader(self, start=None):
+        """New reader starting at `start` (default: now); older samples must still be in the ring"""
+        reader = RingReader(self, self.position if start is None else max(start, self.ring.oldest))
+        self._readers = self._readers + [reader]  # Copy-on-write: the callback iterates without a lock
+        return reader
+
+    def remove_reader(self, reader):
+        self._readers = [r for r in self._readers if r is not reader]
+
+    @property
+    def active(self):
+        return self.stream is not None and self.stream.active
+
+    def stop(self):
+        if self.stream:
+            self.stream.stop()
+
+    def close(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        for reader in self._readers:
+            reader.event.set()
+        self._readers = []
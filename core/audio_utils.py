@@ -1,18 +1,111 @@
 import numpy as np
 from typing import List, Optional
 import sounddevice as sd
-import noisereduce as nr
-import pyloudnorm as pyln
 import os
-import warnings
+import time
+import threading
 from .i18n import _
-import onnxruntime
 
 class AudioDeviceSelector:
+    """Picks the input device once and caches it until the device list changes.
+
+    Selection enumerates every PortAudio device, so it runs on the first call, after
+    `invalidate()` (e.g. on a PortAudio error) and when the background watcher sees the
+    device table change, not on every recording. The watcher only queries: PortAudio
+    is restarted (so hot-plugged devices appear) solely by `invalidate(reinit=True)`.
+    Device queries and stream opens go through this class, under one lock, so none
+    of them runs while PortAudio is being restarted.
+    """
+    override = None      # Device index or name substring from config.yaml
+    _devices = None      # Device table the cached choice was made from
+    _choice = None
+    _lock = threading.Lock()
+    _watcher = None
+
+    @classmethod
+    def configure(cls, override=None, refresh_s=0):
+        """Set the manual override and start the device watcher (every `refresh_s` seconds)"""
+        with cls._lock:
+            cls.override = override
+            cls._devices = None
+        if refresh_s and cls._watcher is None:
+            cls._watcher = threading.Thread(target=cls._watch, args=(refresh_s,), daemon=True)
+            cls._watcher.start()
+
+    @classmethod
+    def get_best_input_device(cls) -> Optional[int]:
+        with cls._lock:
+            if cls._devices is None:
+                cls._devices = cls._device_table()
+                cls._choice = cls._select(cls._devices)
+            return cls._choice
+
+    @classmethod
+    def query_devices(cls, *args, **kwargs):
+        """sd.query_devices(), never concurrent with a PortAudio restart"""
+        with cls._lock:
+            return sd.query_devices(*args, **kwargs)
+
+    @classmethod
+    def input_stream(cls, **kwargs):
+        """sd.InputStream(**kwargs), never opened while PortAudio is restarting"""
+        with cls._lock:
+            return sd.InputStream(**kwargs)
+
+    @classmethod
+    def invalidate(cls, reinit=False):
+        """Drop the cached choice; `reinit` restarts PortAudio so newly plugged devices show up.
+
+        Only reinit when no stream is open (e.g. after a failed open or a lost device):
+        it invalidates every open stream and every device index cached elsewhere.
+        """
+        with cls._lock:
+            cls._devices = None
+            if reinit:
+                try:
+                    sd._terminate()
+                    sd._initialize()
+                except Exception as e:
+                    print(_("⚠️ Could not restart audio system: {}").format(e))
+
+    @classmethod
+    def _watch(cls, interval):
+        while True:
+            time.sleep(interval)
+            if cls._check():
+                print(_("→ 🎙️ Audio devices changed, selecting again"))
+                cls.invalidate()
+
+    @classmethod
+    def _check(cls) -> bool:
+        """One watcher round: True when the device table (e.g. the default input) differs from the cached one"""
+        with cls._lock:
+            if cls._devices is None:
+                return False
+            try:
+                table = cls._device_table()
+            except Exception:
+                return False
+            return table != cls._devices
+
     @staticmethod
-    def get_best_input_device() -> Optional[int]:
-        devices = sd.query_devices()
-        default_input = sd.default.device[0]
+    def _device_table():
+        """What the choice depends on: the default input and (index, name, input channels) per device"""
+        return (sd.default.device[0],
+                tuple((i, d['name'], d['max_input_channels']) for i, d in enumerate(sd.query_devices())))
+
+    @classmethod
+    def _select(cls, table) -> Optional[int]:
+        default_input, devices = table
+
+        if cls.override is not None:
+            for i, name, channels in devices:
+                # An index picks that device only; a string matches part of the name
+                matches = cls.override == i if isinstance(cls.override, int) else str(cls.override).lower() in name.lower()
+                if channels > 0 and matches:
+                    print(_("→ 🎙️ Using configured audio device: {}").format(name))
+                    return i
+            print(_("⚠️ Configured audio device '{}' not found, selecting automatically").format(cls.override))
         
         external_kw = ['USB', 'External', 'Wireless', 'Blue', 'Logitech', 'Rode', 
                       'Audio-Technica', 'Shure', 'Yeti', 'Snowball', 'Samson', 
@@ -23,15 +116,11 @@ class AudioDeviceSelector:
         virtual_kw = ['Virtual', 'WeMeet', 'Zoom', 'Teams', 'Skype', 'Discord', 
                      'OBS', 'Soundflower', 'BlackHole', 'Loopback', 'Aggregate']
         
-        if default_input is not None:
-            try:
-                default_device = devices[default_input]
-                default_name = default_device['name'].lower()
-                if not any(kw.lower() in default_name for kw in headphone_kw):
-                    print(_("→ 🎙️ Using default audio device: {}").format(default_device['name']))
-                    return default_input
-            except (IndexError, KeyError):
-                pass
+        if default_input is not None and 0 <= default_input < len(devices):
+            default_name = devices[default_input][1]
+            if not any(kw.lower() in default_name.lower() for kw in headphone_kw):
+                print(_("→ 🎙️ Using default audio device: {}").format(default_name))
+                return default_input
         
         print(_("📍 Default device is headphone mic, enabling priority selection"))
         
@@ -39,22 +128,22 @@ class AudioDeviceSelector:
             "external": [], "builtin": [], "headphone": [], "other": []
         }
         
-        for i, dev in enumerate(devices):
-            if dev['max_input_channels'] <= 0:
+        for i, dev_name, channels in devices:
+            if channels <= 0:
                 continue
                 
-            name = dev['name'].lower()
+            name = dev_name.lower()
             if any(kw.lower() in name for kw in virtual_kw):
                 continue
                 
             if any(kw.lower() in name for kw in external_kw):
-                mics["external"].append((i, dev['name']))
+                mics["external"].append((i, dev_name))
             elif any(kw.lower() in name for kw in builtin_kw):
-                mics["builtin"].append((i, dev['name']))
+                mics["builtin"].append((i, dev_name))
             elif any(kw.lower() in name for kw in headphone_kw):
-                mics["headphone"].append((i, dev['name']))
+                mics["headphone"].append((i, dev_name))
             else:
-                mics["other"].append((i, dev['name']))
+                mics["other"].append((i, dev_name))
         
         for k, v, p in [("external", mics["external"], "External mic"), 
                         ("builtin", mics["builtin"], "Built-in mic"),
@@ -65,7 +154,32 @@ class AudioDeviceSelector:
         
         return None
 
+VAD_WINDOW, VAD_CONTEXT = 512, 64  # Silero v5 window and context sizes at 16kHz
+_VAD_SR = np.array(16000, dtype=np.int64)
+
+
+class VADStream:
+    """Per-stream Silero state with preallocated input buffers.
+
+    Any number of streams can share one SileroVAD session; each keeps its own
+    RNN state and 64-sample context so streams never interfere.
+    """
+
+    def __init__(self):
+        self.x = np.zeros((1, VAD_CONTEXT + VAD_WINDOW), dtype=np.float32)  # [context | window]
+        self.state = np.zeros((2, 1, 128), dtype=np.float32)
+        self.feed = {'input': self.x, 'state': self.state, 'sr': _VAD_SR}
+
+    def reset(self):
+        self.x.fill(0)
+        self.state.fill(0)
+
+
 class SileroVAD:
+    # One ONNX session per model file, shared by every SileroVAD instance
+    _sessions = {}
+    _sessions_lock = threading.Lock()
+
     def __init__(self, threshold=0.6, min_speech_duration_ms=250, 
                  min_silence_duration_ms=100, window_size_samples=1536):
         self.threshold = threshold
@@ -74,35 +188,40 @@ class SileroVAD:
         self.window_size_samples = window_size_samples
         self.model = None
         self.sample_rate = 16000
+        self._stream = VADStream()           # Realtime stream for is_speech_realtime
+        self._offline_stream = VADStream()   # Whole-buffer passes in get_speech_timestamps
         
         try:
             onnx_model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'silero_vad.onnx')
-            # Create ONNX inference session with optimized settings
-            opts = onnxruntime.SessionOptions()
-            opts.inter_op_num_threads = 1
-            opts.intra_op_num_threads = 1
-            
-            # Each instance gets its own completely independent ONNX session
-            self.model = onnxruntime.InferenceSession(
-                onnx_model_path, 
-                providers=['CPUExecutionProvider'], 
-                sess_options=opts
-            )
-            
-            # Initialize states for this instance
-            self._reset_states()
-            
+            self.model = self._shared_session(onnx_model_path)
         except Exception as e:
             print(_("Warning: Silero VAD ONNX init failed: {}").format(e))
             print(_("→ Skipping VAD processing"))
             self.model = None
     
-    def _reset_states(self):
-        """Reset VAD internal states"""
-        self._state = np.zeros((2, 1, 128), dtype=np.float32)
-        self._context = np.zeros((1, 64), dtype=np.float32)
-        self._last_sr = 0
-        self._last_batch_size = 0
+    @classmethod
+    def _shared_session(cls, onnx_model_path):
+        with cls._sessions_lock:
+            if onnx_model_path not in cls._sessions:
+                # Create ONNX inference session with optimized settings
+                import onnxruntime
+                opts = onnxruntime.SessionOptions()
+                opts.inter_op_num_threads = 1
+                opts.intra_op_num_threads = 1
+                cls._sessions[onnx_model_path] = onnxruntime.InferenceSession(
+                    onnx_model_path, 
+                    providers=['CPUExecutionProvider'], 
+                    sess_options=opts
+                )
+            return cls._sessions[onnx_model_path]
+    
+    def new_stream(self) -> VADStream:
+        """Create an independent state object that shares this instance's session"""
+        return VADStream()
+    
+    def reset(self):
+        """Reset the realtime stream state"""
+        self._stream.reset()
     
     def get_speech_timestamps(self, audio: np.ndarray, sample_rate=16000) -> List[dict]:
         if not self.model:
@@ -119,10 +238,6 @@ class SileroVAD:
             ).astype(np.float32)
         
         try:
-            # Ensure audio is writable
-            if not audio.flags.writeable:
-                audio = audio.copy()
-            
             # Use simplified timestamp extraction (based on Silero's get_speech_timestamps)
             return self._get_speech_timestamps_onnx(audio)
             
@@ -130,167 +245,276 @@ class SileroVAD:
             print(_("VAD processing error: {}").format(e))
             return [{'start': 0, 'end': len(audio)}]
     
+    def speech_probs(self, audio: np.ndarray, stream: Optional[VADStream] = None) -> np.ndarray:
+        """Run the model over every 512-sample window of `audio` and return the probabilities"""
+        stream = stream or self._offline_stream
+        n = len(audio)
+        probs = np.empty((n + VAD_WINDOW - 1) // VAD_WINDOW, dtype=np.float32)
+        for i, start in enumerate(range(0, n, VAD_WINDOW)):
+            probs[i] = self.predict(audio[start:start + VAD_WINDOW], stream)
+        return probs
+    
     def _get_speech_timestamps_onnx(self, audio: np.ndarray) -> List[dict]:
         """ONNX-based speech timestamp extraction"""
-        window_size_samples = 512  # Fixed for 16kHz
+        self._offline_stream.reset()
+        return self.timestamps_from_probs(self.speech_probs(audio), len(audio))
+    
+    def timestamps_from_probs(self, probs: np.ndarray, audio_length_samples: int) -> List[dict]:
+        """Convert window probabilities to padded speech timestamps.
+
+        Vectorised version of Silero's hysteresis: speech starts at a window >= threshold
+        and ends at the first window below threshold - 0.15 once the run of such windows
+        spans min_silence_duration_ms without another window >= threshold.
+        """
+        w = VAD_WINDOW
         min_speech_samples = self.sample_rate * self.min_speech_duration_ms / 1000
         min_silence_samples = self.sample_rate * self.min_silence_duration_ms / 1000
         speech_pad_samples = self.sample_rate * 30 / 1000  # 30ms padding
-        
-        # Reset states for this audio
-        self._reset_states()
-        
-        audio_length_samples = len(audio)
-        speech_probs = []
-        
-        # Process audio in chunks
-        for current_start_sample in range(0, audio_length_samples, window_size_samples):
-            chunk = audio[current_start_sample: current_start_sample + window_size_samples]
-            if len(chunk) < window_size_samples:
-                chunk = np.pad(chunk, (0, window_size_samples - len(chunk)))
-            
-            # ONNX inference for this chunk
-            speech_prob = self._predict_chunk(chunk)
-            speech_probs.append(speech_prob)
-        
-        # Convert probabilities to timestamps
-        triggered = False
-        speeches = []
-        current_speech = {}
-        temp_end = 0
         neg_threshold = max(self.threshold - 0.15, 0.01)
         
-        for i, speech_prob in enumerate(speech_probs):
-            if (speech_prob >= self.threshold) and temp_end:
-                temp_end = 0
-            
-            if (speech_prob >= self.threshold) and not triggered:
-                triggered = True
-                current_speech['start'] = window_size_samples * i
-                continue
-            
-            if (speech_prob < neg_threshold) and triggered:
-                if not temp_end:
-                    temp_end = window_size_samples * i
-                if (window_size_samples * i) - temp_end < min_silence_samples:
-                    continue
-                else:
-                    current_speech['end'] = temp_end
-                    if (current_speech['end'] - current_speech['start']) > min_speech_samples:
-                        speeches.append(current_speech)
-                    current_speech = {}
-                    temp_end = 0
-                    triggered = False
-                    continue
-        
-        # Handle final speech segment
-        if current_speech and (audio_length_samples - current_speech['start']) > min_speech_samples:
-            current_speech['end'] = audio_length_samples
-            speeches.append(current_speech)
-        
-        # Add padding
-        for i, speech in enumerate(speeches):
-            if i == 0:
-                speech['start'] = int(max(0, speech['start'] - speech_pad_samples))
-            if i != len(speeches) - 1:
-                silence_duration = speeches[i+1]['start'] - speech['end']
-                if silence_duration < 2 * speech_pad_samples:
-                    speech['end'] += int(silence_duration // 2)
-                    speeches[i+1]['start'] = int(max(0, speeches[i+1]['start'] - silence_duration // 2))
-                else:
-                    speech['end'] = int(min(audio_length_samples, speech['end'] + speech_pad_samples))
-                    speeches[i+1]['start'] = int(max(0, speeches[i+1]['start'] - speech_pad_samples))
-            else:
-                speech['end'] = int(min(audio_length_samples, speech['end'] + speech_pad_samples))
-        
-        return speeches
+        probs = np.asarray(probs)
+        above = np.flatnonzero(probs >= self.threshold)
+        if above.size == 0:
+            return []
+        below = np.flatnonzero(probs < neg_threshold)
+        
+        # For the gap after each speech window, find the first and last low window before the next speech window
+        gap_end = np.append(above[1:], probs.size)
+        first_i = np.searchsorted(below, above, side='right')
+        last_i = np.searchsorted(below, gap_end, side='left') - 1
+        has_low = first_i <= last_i
+        first_low = below[np.minimum(first_i, max(below.size - 1, 0))] if below.size else np.zeros_like(above)
+        last_low = below[np.maximum(last_i, 0)] if below.size else np.zeros_like(above)
+        closes = has_low & ((last_low - first_low) * w >= min_silence_samples)
+        
+        starts = np.concatenate([above[:1], above[1:][closes[:-1]]]) * w
+        ends = first_low[closes] * w
+        if not closes[-1]:
+            ends = np.append(ends, audio_length_samples)
+        keep = (ends - starts) > min_speech_samples
+        starts, ends = starts[keep].astype(np.int64), ends[keep].astype(np.int64)
+        if starts.size == 0:
+            return []
+        
+        # Add padding, splitting short gaps between neighbouring segments
+        pad = int(speech_pad_samples)
+        gaps = starts[1:] - ends[:-1]
+        shift = np.where(gaps < 2 * speech_pad_samples, gaps // 2, pad)
+        starts[1:] = np.maximum(0, starts[1:] - shift)
+        ends[:-1] = np.where(gaps < 2 * speech_pad_samples, ends[:-1] + shift,
+                             np.minimum(audio_length_samples, ends[:-1] + pad))
+        starts[0] = max(0, starts[0] - pad)
+        ends[-1] = min(audio_length_samples, ends[-1] + pad)
+        
+        return [{'start': int(s), 'end': int(e)} for s, e in zip(starts, ends)]
     
-    def _predict_chunk(self, chunk: np.ndarray) -> float:
-        """Predict speech probability for a single chunk using ONNX"""
-        # Prepare input
-        x = chunk.reshape(1, -1).astype(np.float32)  # Add batch dimension
-        x = np.concatenate([self._context, x], axis=1)
-        
-        # ONNX inference
-        ort_inputs = {
-            'input': x,
-            'state': self._state,
-            'sr': np.array(self.sample_rate, dtype=np.int64)
-        }
-        ort_outs = self.model.run(None, ort_inputs)
-        out, state = ort_outs
-        
-        # Update states
-        self._state = state
-        self._context = x[:, -64:]  # Keep last 64 samples as context
-        
-        return float(out[0, 0])  # Return probability
+    def predict(self, chunk: np.ndarray, stream: Optional[VADStream] = None) -> float:
+        """Predict speech probability for one window, updating `stream` in place"""
+        stream = stream or self._stream
+        x = stream.x
+        n = min(len(chunk), VAD_WINDOW)
+        x[0, VAD_CONTEXT:VAD_CONTEXT + n] = chunk[:n]
+        if n < VAD_WINDOW:
+            x[0, VAD_CONTEXT + n:] = 0
+        
+        out, state = self.model.run(None, stream.feed)
+        
+        # Update states: keep last 64 samples as context
+        stream.state[...] = state
+        x[0, :VAD_CONTEXT] = x[0, -VAD_CONTEXT:]
+        return float(out[0, 0])
     
     def extract_speech_segments(self, audio: np.ndarray, sample_rate=16000, padding_ms=300) -> np.ndarray:
         if not self.model:
             return audio.copy()  # Return a copy to ensure it's writable
             
         timestamps = self.get_speech_timestamps(audio, sample_rate)
-        
-        if not timestamps:
+        return self.trim_to_timestamps(audio, timestamps, sample_rate, padding_ms)
+    
+    def trim_to_timestamps(self, audio: np.ndarray, timestamps: List[dict], sample_rate=16000, padding_ms=300) -> np.ndarray:
+        """Cut `audio` to the overall speech range of `timestamps`, extended by `padding_ms`"""
+        bounds = self.speech_range(timestamps, len(audio), sample_rate, padding_ms)
+        if bounds is None:
             print(_("No speech detected"))
             return np.array([], dtype=audio.dtype)
         
-        # Calculate padding samples
-        padding_samples = int(padding_ms * sample_rate / 1000)
-        
-        # Find the overall speech range (from first start to last end)
-        overall_start = timestamps[0]['start']
-        overall_end = timestamps[-1]['end']
-        
-        # Extend the range by padding_ms, but keep within audio bounds
-        extended_start = max(0, overall_start - padding_samples)
-        extended_end = min(len(audio), overall_end + padding_samples)
-        
         # Extract the extended segment that includes original audio padding
-        result = audio[extended_start:extended_end].copy()
-        
-        return result
+        return audio[bounds[0]:bounds[1]].copy()
+    
+    def speech_range(self, timestamps: List[dict], length: int, sample_rate=16000, padding_ms=300) -> Optional[tuple]:
+        """(start, end) from the first speech start to the last speech end, extended by `padding_ms`
+        and kept within `length` samples; None without speech"""
+        if not timestamps:
+            return None
+        padding_samples = int(padding_ms * sample_rate / 1000)
+        return max(0, timestamps[0]['start'] - padding_samples), min(length, timestamps[-1]['end'] + padding_samples)
+    
+    def is_speech_realtime(self, audio_chunk: np.ndarray, sample_rate=16000, stream: Optional[VADStream] = None) -> bool:
+        return self.speech_prob_realtime(audio_chunk, sample_rate, stream) > self.threshold
     
-    def is_speech_realtime(self, audio_chunk: np.ndarray, sample_rate=16000) -> bool:
+    def speech_prob_realtime(self, audio_chunk: np.ndarray, sample_rate=16000, stream: Optional[VADStream] = None) -> float:
+        """Speech probability of one realtime chunk; 1.0/0.0 from its energy when the model is unavailable"""
         if not self.model:
-            return np.mean(np.abs(audio_chunk)) > 0.01
+            return float(np.mean(np.abs(audio_chunk)) > 0.01)
         
         req_samples = 512 if sample_rate == 16000 else 256
         
         # Ensure correct chunk size
-        if len(audio_chunk) != req_samples:
-            if len(audio_chunk) < req_samples:
-                audio_chunk = np.pad(audio_chunk, (0, req_samples - len(audio_chunk)), 'constant')
-            else:
-                audio_chunk = audio_chunk[:req_samples]
+        if len(audio_chunk) > req_samples:
+            audio_chunk = audio_chunk[:req_samples]
         
         # Resample if needed
         if sample_rate != self.sample_rate:
+            if len(audio_chunk) < req_samples:
+                audio_chunk = np.pad(audio_chunk, (0, req_samples - len(audio_chunk)), 'constant')
             ratio = self.sample_rate / sample_rate
             audio_chunk = np.interp(
                 np.arange(0, len(audio_chunk), 1/ratio), 
                 np.arange(len(audio_chunk)), 
                 audio_chunk
             ).astype(np.float32)
-            
-            if len(audio_chunk) < 512:
-                audio_chunk = np.pad(audio_chunk, (0, 512 - len(audio_chunk)), 'constant')
-            elif len(audio_chunk) > 512:
-                audio_chunk = audio_chunk[:512]
         
         try:
-            # ONNX-based realtime speech detection
-            speech_prob = self._predict_chunk(audio_chunk)
-            return speech_prob > self.threshold
+            # ONNX-based realtime speech detection; short chunks are zero-padded in place
+            return self.predict(audio_chunk, stream)
         except Exception as e:
             print(_("Realtime VAD error: {}").format(e))
-            return np.mean(np.abs(audio_chunk)) > 0.01  # Fallback to energy detection
+            return float(np.mean(np.abs(audio_chunk)) > 0.01)  # Fallback to energy detection
+
+
+ENHANCE_N_FFT, ENHANCE_HOP = 512, 128  # 32 ms frames, 75% overlap at 16kHz
+SNR_BYPASS_DB = 30.0  # Skip denoising when speech is this far above the noise floor
+NOISE_DECAY = 0.995   # Per-frame forgetting of the noise profile (~6 s of non-speech)
+MIN_NOISE_FRAMES = 20
+
+
+class LoudnessMeter:
+    """ITU-R BS.1770 integrated loudness, measured incrementally.
+
+    K-weighting coefficients are built once per sample rate and the filter state carries
+    over between `feed()` calls, so a clip can be fed block by block or all at once.
+    """
+    _coeffs = {}
+
+    def __init__(self, sample_rate=16000):
+        self.sr = sample_rate
+        self.sub = sample_rate // 10  # 100 ms sub-blocks; a 400 ms gating block is 4 of them
+        if sample_rate not in self._coeffs:
+            from pyloudnorm.iirfilter import IIRfilter
+            stages = [IIRfilter(4.0, 1 / np.sqrt(2), 1500.0, sample_rate, 'high_shelf'),
+                      IIRfilter(0.0, 0.5, 38.0, sample_rate, 'high_pass')]
+            self._coeffs[sample_rate] = [(f.b, f.a, f.passband_gain) for f in stages]
+        self.stages = self._coeffs[sample_rate]
+        self.reset()
+
+    def reset(self):
+        self._zi = [np.zeros(max(len(a), len(b)) - 1) for b, a, _g in self.stages]
+        self._tail = np.zeros(0)
+        self._power = []  # Mean square of each complete 100 ms sub-block
+
+    def feed(self, block):
+        from scipy.signal import lfilter
+        y = np.asarray(block, dtype=np.float64)
+        for i, (b, a, gain) in enumerate(self.stages):
+            y, self._zi[i] = lfilter(b, a, y, zi=self._zi[i])
+            y = y * gain
+        y = np.concatenate((self._tail, y))
+        n = y.size // self.sub * self.sub
+        self._power.extend(np.mean(np.square(y[:n]).reshape(-1, self.sub), axis=1))
+        self._tail = y[n:]
+
+    def integrated(self):
+        """Gated loudness in LUFS of everything fed since reset (-inf for silence)"""
+        p = np.array(self._power)
+        if p.size < 4:
+            # Shorter than one gating block: measure it as a single block
+            z = np.array([np.mean(np.square(self._tail))]) if p.size == 0 else np.array([p.mean()])
+        else:
+            z = np.convolve(p, np.ones(4) / 4, mode='valid')
+        with np.errstate(divide='ignore'):
+            lk = -0.691 + 10 * np.log10(z)
+            gated = z[lk >= -70.0]
+            if gated.size == 0:
+                return -np.inf
+            rel = -0.691 + 10 * np.log10(gated.mean()) - 10.0
+            return float(-0.691 + 10 * np.log10(z[(lk > rel) & (lk >= -70.0)].mean()))
+
+
+class EnhancerStream:
+    """Noise profile of one audio source (dictation mic, meeting mic, system audio).
+
+    Learned from non-speech audio as it is captured, so each clip is denoised against
+    the room's noise rather than against itself.
+    """
+
+    def __init__(self, n_fft=ENHANCE_N_FFT):
+        bins = n_fft // 2 + 1
+        self.window = np.hanning(n_fft).astype(np.float32)
+        self.n_fft = n_fft
+        self.weight = 0.0
+        self.db_sum = np.zeros(bins)
+        self.db_sq = np.zeros(bins)
+        self.power = 0.0  # Mean square of the noise in the time domain
+        self.lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self.weight >= MIN_NOISE_FRAMES
+
+    def observe(self, audio):
+        """Add non-speech audio to the profile (one frame per `n_fft` samples)"""
+        n = len(audio) // self.n_fft * self.n_fft
+        if n == 0:
+            return
+        frames = np.asarray(audio[:n], dtype=np.float32).reshape(-1, self.n_fft)
+        self.observe_frames(frames, _amp_db(np.fft.rfft(frames * self.window, axis=1)))
+
+    def observe_frames(self, frames, db):
+        with self.lock:
+            for i in range(len(db)):
+                self.db_sum = self.db_sum * NOISE_DECAY + db[i]
+                self.db_sq = self.db_sq * NOISE_DECAY + db[i] ** 2
+                w = self.weight * NOISE_DECAY + 1
+                self.power += (np.mean(np.square(frames[i])) - self.power) / w
+                self.weight = w
+
+    def threshold(self, n_std=1.5):
+        """Per-bin gate in dB: mean + n_std standard deviations of the noise spectrum"""
+        with self.lock:
+            mean = self.db_sum / self.weight
+            std = np.sqrt(np.maximum(self.db_sq / self.weight - mean ** 2, 0))
+        return mean + n_std * std
+
+
+def _amp_db(spec):
+    return 20 * np.log10(np.maximum(np.abs(spec), 1e-6))
+
+
+def _smoothing_kernel(n):
+    """Triangular ramp of 2n+1 taps, normalized"""
+    k = np.concatenate((np.linspace(0, 1, n + 1, endpoint=False)[1:], np.linspace(1, 0, n + 2)[:-1]))
+    return k / k.sum()
 
 
 class AudioEnhancer:
+    """Stationary spectral gating plus loudness normalization.
+
+    Same gate as noisereduce's stationary mode, but the noise threshold comes from an
+    EnhancerStream's profile when one is given, and denoising is skipped when the clip's
+    SNR is already above SNR_BYPASS_DB.
+    """
+
     def __init__(self, sample_rate=16000):
         self.sr = sample_rate
+        self.n_fft, self.hop = ENHANCE_N_FFT, ENHANCE_HOP
+        self.window = np.hanning(self.n_fft).astype(np.float32)
+        self.freq_kernel = _smoothing_kernel(int(500 / (sample_rate / self.n_fft)))  # 500 Hz
+        self.time_kernel = _smoothing_kernel(int(0.05 * sample_rate / self.hop))     # 50 ms
+        self.stats = {'clips': 0, 'bypassed': 0, 'audio_s': 0.0, 'denoise_s': 0.0, 'loudness_s': 0.0}
+    
+    def new_stream(self) -> EnhancerStream:
+        """Independent noise profile for one audio source"""
+        return EnhancerStream(self.n_fft)
     
     def _to_mono_1d(self, x: np.ndarray) -> np.ndarray:
         x = np.asarray(x, dtype=np.float32)
@@ -303,40 +527,91 @@ class AudioEnhancer:
         a = np.asarray(audio, dtype=np.float32)
         if a.size == 0:
             return a
-        
-        meter = pyln.Meter(self.sr)
-        loudness = meter.integrated_loudness(a)
-        
-        # Suppress the clipped samples warning from pyloudnorm
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", message="Possible clipped samples in output")
-            normalized = pyln.normalize.loudness(a, loudness, target_lufs)
-        
-        return np.clip(np.asarray(normalized, dtype=np.float32), -1.0, 1.0)
+        meter = LoudnessMeter(self.sr)
+        meter.feed(a)
+        loudness = meter.integrated()
+        if not np.isfinite(loudness):
+            return a
+        return np.clip(a * np.float32(10 ** ((target_lufs - loudness) / 20)), -1.0, 1.0)
+    
+    def _stft(self, a):
+        pad = self.n_fft // 2
+        padded = np.pad(a, (pad, pad + (-(a.size + 2 * pad - self.n_fft)) % self.hop))
+        frames = np.lib.stride_tricks.sliding_window_view(padded, self.n_fft)[::self.hop]
+        return np.fft.rfft(frames * self.window, axis=1), padded.size
+    
+    def _istft(self, spec, padded_size, n):
+        frames = np.fft.irfft(spec, n=self.n_fft, axis=1).astype(np.float32) * self.window
+        r, count = self.n_fft // self.hop, len(frames)
+        out = np.zeros((count + r - 1, self.hop), dtype=np.float32)
+        norm = np.zeros_like(out)
+        chunks = frames.reshape(count, r, self.hop)
+        win = (self.window ** 2).reshape(r, self.hop)
+        for k in range(r):
+            out[k:k + count] += chunks[:, k]
+            norm[k:k + count] += win[k]
+        out, norm = out.reshape(-1), norm.reshape(-1)
+        out = out / np.maximum(norm, 1e-8)
+        pad = self.n_fft // 2
+        return out[pad:pad + n]
+    
+    def _snr_db(self, a, noise_power):
+        frames = a[:a.size // self.hop * self.hop].reshape(-1, self.hop)
+        power = np.mean(np.square(frames), axis=1)
+        if noise_power is None:
+            noise_power = np.percentile(power, 10)
+        return 10 * np.log10(max(np.percentile(power, 90), 1e-12) / max(noise_power, 1e-12))
     
-    def enhance_audio(self, audio: np.ndarray) -> np.ndarray:
+    def denoise(self, a, stream=None, prop_decrease=0.9):
+        from scipy.ndimage import convolve1d
+        spec, padded_size = self._stft(a)
+        db = _amp_db(spec)
+        if stream is not None and not stream.ready:
+            # No non-speech seen yet for this source: bootstrap from the clip's quietest frames
+            quiet = np.argsort(np.mean(db, axis=1))[:max(1, len(db) // 5)]
+            pos = np.clip(quiet * self.hop - self.n_fft // 2, 0, max(0, a.size - self.n_fft))
+            stream.observe_frames([a[p:p + self.n_fft] for p in pos], db[quiet])
+        if stream is not None:
+            thresh = stream.threshold()
+        else:
+            # Whole clip as the noise estimate, like noisereduce without y_noise
+            thresh = db.mean(axis=0) + 1.5 * db.std(axis=0)
+        mask = (db > thresh).astype(np.float32)
+        mask = convolve1d(convolve1d(mask, self.freq_kernel, axis=1, mode='constant'), self.time_kernel, axis=0, mode='constant')
+        mask = mask * prop_decrease + (1.0 - prop_decrease)
+        return self._istft(spec * mask, padded_size, a.size)
+    
+    def enhance_audio(self, audio: np.ndarray, stream: Optional[EnhancerStream] = None) -> np.ndarray:
         # Ensure we're working with a writable copy
         if not audio.flags.writeable:
             audio = audio.copy()
         a = self._to_mono_1d(audio)
         n = a.size
         
-        if n < max(20, int(self.sr * 0.08)):
+        if n < max(self.n_fft, int(self.sr * 0.08)):
             return a
         
-        n_fft = 2048 if n >= 2048 else 1024 if n >= 1024 else 512 if n >= 512 else 256 if n >= 256 else 128
-        hop = max(32, n_fft // 4)
-        
-        try:
-            den = nr.reduce_noise(
-                y=a, sr=self.sr, stationary=True, prop_decrease=0.9,
-                n_fft=n_fft, hop_length=hop, win_length=n_fft
-            )
-        except Exception as e:
-            print(_("Noise reduction failed ({}), skipping.").format(e))
+        t0 = time.perf_counter()
+        snr = self._snr_db(a, stream.power if stream is not None and stream.ready else None)
+        bypass = bool(snr >= SNR_BYPASS_DB)
+        if bypass:
             den = a
+        else:
+            try:
+                den = self.denoise(a, stream)
+            except Exception as e:
+                print(_("Noise reduction failed ({}), skipping.").format(e))
+                den = a
+        t1 = time.perf_counter()
         
         # Apply loudness normalization instead of manual peak normalization
         normalized_audio = self._loudness_normalize(den, target_lufs=-23.0)
-        
-        return np.clip(np.tanh(normalized_audio * 0.8) * 0.95, -1.0, 1.0)
+        out = np.clip(np.tanh(normalized_audio * 0.8) * 0.95, -1.0, 1.0)
+        
+        st = self.stats
+        st['clips'] += 1
+        st['bypassed'] += bypass
+        st['audio_s'] += n / self.sr
+        st['denoise_s'] += t1 - t0
+        st['loudness_s'] += time.perf_counter() - t1
+        return out
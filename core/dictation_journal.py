@@ -0,0 +1,116 @@
+"""Append-only journal of push-to-talk dictations.
+
+One JSON record per line in `transcription.jsonl`, so recording a dictation is a
+single append instead of rewriting the whole history. Records are appended in time
+order; a sparse (time, byte offset) index built on first query lets `query()` seek
+straight to a time range. The legacy `transcription.json` is migrated on first use
+and can be regenerated with:
+
+    python -m core.dictation_journal export [path]
+"""
+import os
+import sys
+import json
+import bisect
+import threading
+
+LOG_DIR = "./recordings/push-to-talk"
+JOURNAL_NAME = "transcription.jsonl"
+LEGACY_NAME = "transcription.json"
+INDEX_EVERY = 256  # Records between index entries
+
+
+class DictationJournal:
+    def __init__(self, log_dir=LOG_DIR):
+        self.log_dir = log_dir
+        self.path = os.path.join(log_dir, JOURNAL_NAME)
+        self.lock = threading.Lock()
+        self._index = None  # [(time, offset)] every INDEX_EVERY records; built on first query
+        self._count = 0
+        os.makedirs(log_dir, exist_ok=True)
+        self._migrate()
+
+    def _migrate(self):
+        """Convert the legacy JSON array once; the original is kept as .bak"""
+        legacy = os.path.join(self.log_dir, LEGACY_NAME)
+        if os.path.exists(self.path) or not os.path.exists(legacy):
+            return
+        try:
+            with open(legacy, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            return
+        records.sort(key=lambda r: r.get("time", ""))
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+        os.replace(legacy, legacy + ".bak")
+
+    def append(self, record):
+        """Add one record; O(1) regardless of how many are already journaled"""
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.lock:
+            with open(self.path, "ab") as f:
+                offset = f.tell()
+                f.write(line)
+            if self._index is not None:
+                if self._count % INDEX_EVERY == 0:
+                    self._index.append((record.get("time", ""), offset))
+                self._count += 1
+
+    def _build_index(self):
+        self._index, self._count = [], 0
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                if self._count % INDEX_EVERY == 0:
+                    try:
+                        self._index.append((json.loads(line).get("time", ""), offset))
+                    except ValueError:
+                        self._index.append(("", offset))
+                offset += len(line)
+                self._count += 1
+
+    def query(self, start=None, end=None):
+        """Records with start <= time < end (ISO strings or datetimes; None is open-ended)"""
+        start = start.isoformat() if hasattr(start, "isoformat") else start
+        end = end.isoformat() if hasattr(end, "isoformat") else end
+        with self.lock:
+            if self._index is None:
+                self._build_index()
+            times = [t for t, _o in self._index]
+            i = max(0, bisect.bisect_left(times, start) - 1) if start else 0
+            offset = self._index[i][1] if self._index else 0
+        records = []
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line after a crash
+                t = record.get("time", "")
+                if end and t >= end:
+                    break
+                if not start or t >= start:
+                    records.append(record)
+        return records
+
+    def export_json(self, path=None):
+        """Write every record as the legacy indented JSON array"""
+        path = path or os.path.join(self.log_dir, LEGACY_NAME)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.query(), f, ensure_ascii=False, indent=2)
+        return path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "export":
+        sys.exit("usage: python -m core.dictation_journal export [path]")
+    print(DictationJournal().export_json(sys.argv[2] if len(sys.argv) > 2 else None))
@@ -1,7 +1,6 @@
 import yaml
 import re
 from pathlib import Path
-from openai import OpenAI
 
 _config = None
 _client = None
@@ -23,6 +22,7 @@ def _load_config():
         api_key = llm_config.get("api_key")
         base_url = llm_config.get("base_url")
         if api_key and base_url:
+            from openai import OpenAI
             _client = OpenAI(api_key=api_key, base_url=base_url)
 
 def rewrite_text(text: str, mode: str = "dictation") -> str:
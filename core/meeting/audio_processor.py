@@ -1,20 +1,28 @@
 import time
-import sounddevice as sd
 import numpy as np
 import threading
 import queue
 import platform
-import warnings
+import os
 
-from core.audio_utils import AudioDeviceSelector
+from core.audio_utils import AudioDeviceSelector, LoudnessMeter
+from core.audio_capture import CaptureEngine, PipelineStats, BLOCK_SIZE
+from core.meeting.audio_spool import AudioSpool
+from core.meeting.segmenter import AdaptiveSegmenter, SpeechSegment, MAX_S, TARGET_S
 from core.i18n import _
 
-if platform.system() == 'Windows':
-    from core.meeting.system_recorder_win import SystemAudioRecorder
-elif platform.system() == 'Darwin':
-    from core.meeting.system_recorder_mac import SystemAudioRecorder
-else:
-    raise ImportError("System audio recording is not supported on this OS.")
+SPOOL_ROOT = "./recordings/meetings"
+
+
+def _system_recorder_class():
+    """Platform system audio recorder, imported on first meeting (pulls in scipy, pydub, soundcard)"""
+    if platform.system() == 'Windows':
+        from core.meeting.system_recorder_win import SystemAudioRecorder
+    elif platform.system() == 'Darwin':
+        from core.meeting.system_recorder_mac import SystemAudioRecorder
+    else:
+        raise ImportError("System audio recording is not supported on this OS.")
+    return SystemAudioRecorder
 
 class MeetingAudioProcessor:
     """Audio processor for meeting mode recording and processing."""
@@ -26,18 +34,25 @@ class MeetingAudioProcessor:
         # Use pre-initialized VAD instances from main app
         self.microphone_vad = transcriber_ref.meeting_microphone_vad
         self.system_vad = transcriber_ref.meeting_system_vad
+        # Noise profiles per source; the mic one learns from blocks between speech
+        self.microphone_noise = transcriber_ref.audio_enhancer.new_stream()
+        self.system_noise = transcriber_ref.audio_enhancer.new_stream()
 
         self.stream = None
-        self.meeting_audio_buffer = []
-        self.meeting_audio_buffer_lock = threading.RLock()
+        # Full-meeting tracks are spooled to disk, not kept in memory
+        self.spool_dir = None
+        self.microphone_spool = None
+        self.system_spool = None
 
         self.system_recorder = None
         self.system_audio_thread = None
-        self.system_audio_buffer = []
-        self.system_audio_buffer_lock = threading.RLock()
 
         self.recording_start_time = None
+        self.timeline_start = None
+        self._mic_origin = None
 
+        self.capturing = False  # Mic loop still running; it queues the last segment on its way out
+        self.microphone_stats = PipelineStats()
         self.meeting_audio_queue = queue.Queue(maxsize=100)
         self.system_audio_queue = queue.Queue(maxsize=100)
 
@@ -52,93 +67,103 @@ class MeetingAudioProcessor:
                 pass
             self.stream = None
 
-        # Clear audio buffers
-        with self.meeting_audio_buffer_lock:
-            self.meeting_audio_buffer = []
-        with self.system_audio_buffer_lock:
-            self.system_audio_buffer = []
-
-        # Record start time for sync
+        # Record start time for sync; both tracks are laid out on a timeline starting here
         self.recording_start_time = time.time()
+        self.timeline_start = time.perf_counter()
+        self._mic_origin = None  # (engine, engine position, timeline position) of the first mic sample
+
+        # Fresh on-disk tracks for this meeting
+        self.spool_dir = os.path.join(SPOOL_ROOT, time.strftime(".spool_%Y%m%d_%H%M%S"))
+        self.microphone_spool = AudioSpool(self.spool_dir, "microphone", self.transcriber_ref.sr)
+        self.microphone_stats = PipelineStats()
+        self.system_spool = AudioSpool(self.spool_dir, "system", self.transcriber_ref.sr)
 
         # Start system audio recording
-        if SystemAudioRecorder:
-            try:
-                # Pass the system VAD instance to reuse it
-                self.system_recorder = SystemAudioRecorder(sample_rate=self.transcriber_ref.sr, vad_instance=self.system_vad)
-                
-                if self.system_recorder.start():
-                    print(_("→ 💡 System audio recording started"))
-
-                    # Wait for audio system to stabilize
-                    time.sleep(0.1)
-
-                    # Start system audio processing thread
-                    self.system_audio_thread = threading.Thread(target=self._process_system_audio, daemon=True)
-                    self.system_audio_thread.start()
-                else:
-                    print(_("→ ⚠️ System audio recording failed, only recording microphone"))
-                    self.system_recorder = None
-            except Exception as e:
-                print(_("→ ⚠️ Could not initialize system audio: {}").format(e))
+        try:
+            # Pass the system VAD instance to reuse it
+            self.system_recorder = _system_recorder_class()(sample_rate=self.transcriber_ref.sr, vad_instance=self.system_vad)
+            self.system_recorder.keep_audio = False
+            
+            if self.system_recorder.start():
+                print(_("→ 💡 System audio recording started"))
+
+                # Wait for audio system to stabilize
+                time.sleep(0.1)
+
+                # Start system audio processing thread
+                self.system_audio_thread = threading.Thread(target=self._process_system_audio, daemon=True)
+                self.system_audio_thread.start()
+            else:
+                print(_("→ ⚠️ System audio recording failed, only recording microphone"))
                 self.system_recorder = None
+        except Exception as e:
+            print(_("→ ⚠️ Could not initialize system audio: {}").format(e))
+            self.system_recorder = None
 
         # Start microphone recording thread after system audio setup
         print(_("→ 🎤 Starting microphone recording (after system audio setup)..."))
+        self.capturing = True
         microphone_thread = threading.Thread(target=self._microphone_recording_loop, daemon=True)
         microphone_thread.start()
 
         return microphone_thread
 
     def _microphone_recording_loop(self):
-        """Microphone recording loop."""
-        stream = None
+        """Microphone processing stage.
+
+        Capture is only the engine's audio callback filling the ring; spooling, VAD and
+        segmentation run here, so a slow block delays this loop but never the device.
+        """
+        engine = None
         try:
             # Short delay to ensure audio system is ready
             time.sleep(0.1)
 
             best_device_id = AudioDeviceSelector.get_best_input_device()
             # Selected microphone device
-            print(_("→ 🎙️ Selected microphone device: {}").format(sd.query_devices(best_device_id)['name'] if best_device_id is not None else "Default"))
-
-            self.stream = sd.InputStream(
-                samplerate=self.transcriber_ref.sr,
-                channels=1,
-                dtype=np.float32,
-                blocksize=512,
-                latency='low',
-                device=best_device_id
-            )
-            stream = self.stream
-            stream.start()
+            print(_("→ 🎙️ Selected microphone device: {}").format(AudioDeviceSelector.query_devices(best_device_id)['name'] if best_device_id is not None else "Default"))
+
+            sr = self.transcriber_ref.sr
+            segmenter = self._segmenter()
+            # Segments are cut straight out of the ring, so it must hold the longest one
+            engine = CaptureEngine(sr, BLOCK_SIZE, seconds=segmenter.span_s + 5, device=best_device_id)
+            self.stream = engine
+            engine.start()
+            reader = engine.reader()
 
             segment_count = 0
-            chunk_count = 0
-            silence_duration = 0.0
-            speech_segment_buffer = []
-            speech_active = False
-            SILENCE_THRESHOLD = 1.5
+            overflows = 0
+            dropped = 0
+            segmenter.reset(reader.pos)
+            stats = self.microphone_stats
+            recorder = self.transcriber_ref.meeting_recorder
 
-            while hasattr(self.transcriber_ref, 'meeting_recorder') and self.transcriber_ref.meeting_recorder.meeting_mode and not self.transcriber_ref.meeting_recorder.meeting_stopping:
+            while recorder.meeting_mode and not recorder.meeting_stopping:
                 try:
-                    # Check stop signal
-                    if self.transcriber_ref.meeting_recorder.meeting_stopping or not self.transcriber_ref.meeting_recorder.meeting_mode:
-                        break
-
-                    d, overflowed = stream.read(512)
-                    if overflowed:
+                    blocks = reader.read_blocks(timeout=0.1)
+                    stats.backlog(len(blocks))
+                    if engine.overflows != overflows:
+                        overflows = stats.overflows = engine.overflows
                         # Audio input overflow
                         print(_("  → Audio input overflow"))
 
-                    if d is not None and len(d) > 0:
-                        # Convert to float32 array
-                        audio_chunk = np.asarray(d, dtype=np.float32).reshape(-1)
-                        chunk_count += 1
-
-                        # Store as bytes for full recording
-                        with self.meeting_audio_buffer_lock:
-                            chunk_bytes = audio_chunk.tobytes()
-                            self.meeting_audio_buffer.append(chunk_bytes)
+                    first = reader.pos - BLOCK_SIZE * len(blocks)
+                    if blocks and self._mic_origin is None:
+                        # Pin the mic track to the timeline; from here on the mic sample clock is the reference
+                        origin = self.timeline_position(engine.time_of(first))
+                        self.microphone_spool.write_at(origin, np.zeros(0, dtype=np.float32))
+                        self._mic_origin = (engine, first, origin)
+                    if reader.dropped != dropped:
+                        # Samples lost to a stalled reader: keep the track on the sample clock
+                        self.microphone_spool.write(np.zeros(reader.dropped - dropped, dtype=np.float32))
+                        dropped = stats.dropped = reader.dropped
+                    for i, audio_chunk in enumerate(blocks):
+                        block_end = first + (i + 1) * BLOCK_SIZE
+                        t0 = time.perf_counter()
+
+                        # Full recording goes to disk
+                        self.microphone_spool.write(audio_chunk)
+                        t1 = time.perf_counter()
 
                         # Use microphone VAD for speech detection, pre-filter first
                         chunk_energy = np.mean(np.abs(audio_chunk))
@@ -146,93 +171,81 @@ class MeetingAudioProcessor:
                         # Pre-filter, only run VAD on audio with enough energy
                         if chunk_energy > 0.01 and self.microphone_vad is not None:
                             try:
-                                chunk_has_speech = self.microphone_vad.is_speech_realtime(audio_chunk, self.transcriber_ref.sr)
+                                prob = self.microphone_vad.speech_prob_realtime(audio_chunk, sr)
                             except Exception as e:
                                 print(_("→ [Mic] VAD detection error: {}").format(e))
-                                chunk_has_speech = False
+                                prob = 0.0
                         else:
                             # Skip VAD detection for low energy audio or if VAD is None
-                            chunk_has_speech = False
-
-                        chunk_duration = len(audio_chunk) / self.transcriber_ref.sr
-
-                        # Store audio chunk bytes to speech buffer
-                        speech_segment_buffer.append(chunk_bytes)
-
-                        if chunk_has_speech:
-                            if not speech_active:
-                                speech_active = True
-                                print(_("→ Speech detected, recording..."))
-                                try:
-                                    self.transcriber_ref.tray.set_status("recording")
-                                except Exception:
-                                    pass
-                            silence_duration = 0.0
-                        else:
-                            if speech_active:
-                                silence_duration += chunk_duration
-
-                                if silence_duration >= SILENCE_THRESHOLD:
-                                    if len(speech_segment_buffer) > 0:
-                                        segment_count += 1
-
-                                        # Reconstruct audio from bytes
-                                        segment_audio = self._bytes_to_audio(speech_segment_buffer)
-                                        segment_duration = len(segment_audio) / self.transcriber_ref.sr
-
-                                        print(_("  → Speech paused, processing segment {}: {:.1f}s").format(segment_count, segment_duration))
-                                        try:
-                                            self.transcriber_ref.tray.set_status("processing")
-                                        except Exception:
-                                            pass
-
-                                        # Send audio bytes to queue
-                                        try:
-                                            self.meeting_audio_queue.put(segment_audio.tobytes(), block=False)
-                                        except queue.Full:
-                                            print(_("  → Warning: Audio queue is full, skipping segment"))
-
-                                        speech_segment_buffer = []
-                                        speech_active = False
-                                        silence_duration = 0.0
-                                        try:
-                                            self.transcriber_ref.tray.set_status("recording")
-                                        except Exception:
-                                            pass
-                            else:
-                                # Trim buffer to save memory
-                                max_buffer_duration = 1.0
-                                max_buffer_chunks = int(max_buffer_duration * self.transcriber_ref.sr / 512)
-                                if len(speech_segment_buffer) > max_buffer_chunks:
-                                    speech_segment_buffer = speech_segment_buffer[-max_buffer_chunks:]
+                            prob = 0.0
+                        t2 = time.perf_counter()
+
+                        if prob <= segmenter.threshold:
+                            self.microphone_noise.observe(audio_chunk)
+                        elif not segmenter.active:
+                            print(_("→ Speech detected, recording..."))
+                            try:
+                                self.transcriber_ref.tray.set_status("recording")
+                            except Exception:
+                                pass
+
+                        for ranges, overlap in segmenter.feed(prob, block_end):
+                            segment_count += 1
+                            self._queue_microphone_segment(engine, segmenter, ranges, overlap, segment_count)
+                        t3 = time.perf_counter()
+                        stats.add('spool', t1 - t0)
+                        stats.add('vad', t2 - t1)
+                        stats.add('segment', t3 - t2)
 
                 except Exception as e:
-                    if hasattr(self.transcriber_ref, 'meeting_recorder') and self.transcriber_ref.meeting_recorder.meeting_mode and not self.transcriber_ref.meeting_recorder.meeting_stopping:
+                    if recorder.meeting_mode and not recorder.meeting_stopping:
                         print(_("  → Error in meeting recording: {}").format(e))
                     break
 
-            if stream:
-                stream.stop()
-                stream.close()
-            self.stream = None
+            # Speech still pending when the meeting stops is transcribed too
+            for ranges, overlap in segmenter.flush(reader.pos):
+                segment_count += 1
+                self._queue_microphone_segment(engine, segmenter, ranges, overlap, segment_count)
 
         except Exception as e:
             print(_("  → Meeting recording error: {}").format(e))
+            AudioDeviceSelector.invalidate()
             if hasattr(self.transcriber_ref, 'meeting_recorder'):
                 self.transcriber_ref.meeting_recorder.meeting_mode = False
         finally:
             # Ensure proper cleanup with forced garbage collection
-            if stream:
+            if engine:
+                # Time the audio callback spent per block: all the capture side does
+                self.microphone_stats.add('capture', engine.callback_time, engine.callbacks)
                 try:
-                    stream.stop()
-                    stream.close()
+                    engine.stop()
+                    engine.close()
                 except Exception:
                     pass
             self.stream = None
+            self.capturing = False
             # Force cleanup on macOS to prevent segfault
             import gc
             gc.collect()
 
+    def _segmenter(self):
+        config = self.transcriber_ref.config.get('meeting', {})
+        threshold = self.microphone_vad.threshold if self.microphone_vad is not None else 0.5
+        return AdaptiveSegmenter(self.transcriber_ref.sr, threshold,
+                                 max_s=config.get('max_segment_s', MAX_S),
+                                 target_s=config.get('target_segment_s', TARGET_S))
+
+    def _queue_microphone_segment(self, engine, segmenter, ranges, overlap, number):
+        """Cut a finished segment out of the ring and queue it with its VAD probabilities"""
+        sr = self.transcriber_ref.sr
+        segment = SpeechSegment(np.concatenate([engine.ring.read(start, end) for start, end in ranges]),
+                                segmenter.probs_for(ranges), overlap=overlap / sr)
+        print(_("  → Speech paused, processing segment {}: {:.1f}s").format(number, segment.audio.size / sr))
+        try:
+            self.meeting_audio_queue.put(segment, block=False)
+        except queue.Full:
+            print(_("  → Warning: Audio queue is full, skipping segment"))
+
     def _process_system_audio(self):
         """System audio processing and buffer storage."""
         # Check if system recorder is in skip mode
@@ -243,55 +256,45 @@ class MeetingAudioProcessor:
         while hasattr(self.transcriber_ref, 'meeting_recorder') and self.transcriber_ref.meeting_recorder.meeting_mode and not self.transcriber_ref.meeting_recorder.meeting_stopping:
             if self.system_recorder:
                 try:
-                    segments = self.system_recorder.get_speech_segments()
-                    for segment_audio in segments:
-                        if segment_audio.size > 0:
-                            # Store system audio segment to buffer for mixing
-                            with self.system_audio_buffer_lock:
-                                chunk_bytes = segment_audio.tobytes()
-                                self.system_audio_buffer.append(chunk_bytes)
-
-                            # Also put into queue for transcription
-                            try:
-                                self.system_audio_queue.put(
-                                    segment_audio.tobytes(),
-                                    block=False
-                                )
-                                print(_("→ [System] Speech segment queued for independent transcription"))
-                            except queue.Full:
-                                print(_("→ [System] Independent transcription queue is full"))
+                    self._store_system_segments(self.system_recorder.get_speech_segments())
                 except Exception as e:
                     if hasattr(self.transcriber_ref, 'meeting_recorder') and not self.transcriber_ref.meeting_recorder.meeting_stopping:
                         print(_("→ [System] Error processing audio: {}").format(e))
             time.sleep(0.1)
 
-    def _bytes_to_audio(self, byte_chunks):
-        """Convert list of byte chunks to numpy audio array."""
-        if not byte_chunks:
-            return np.array([], dtype=np.float32)
-
-        # Join all bytes
-        all_bytes = b''.join(byte_chunks)
-
-        # Convert back to numpy array (make writable copy)
-        audio = np.frombuffer(all_bytes, dtype=np.float32).copy()
-        return audio
-
-    def _loudness_normalize(self, audio, target_lufs=-23.0):
-        """Loudness normalization."""
-        a = np.asarray(audio, dtype=np.float32)
-        if a.size == 0:
-            return a
-        import pyloudnorm as pyln
-        meter = pyln.Meter(self.transcriber_ref.sr)
-        loudness = meter.integrated_loudness(a)
-        
-        # Suppress the clipped samples warning from pyloudnorm
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", message="Possible clipped samples in output")
-            normalized = pyln.normalize.loudness(a, loudness, target_lufs)
-        
-        return np.clip(np.asarray(normalized, dtype=np.float32), -1.0, 1.0)
+    def _store_system_segments(self, segments):
+        """Spool system speech segments and queue them for transcription"""
+        for segment in segments:
+            if segment.audio.size > 0:
+                # Place the segment where it was captured, so silence between segments stays silent
+                self.system_spool.write_at(self.timeline_position(segment.captured_at), segment.audio)
+
+                # Also put into queue for transcription
+                try:
+                    self.system_audio_queue.put(segment, block=False)
+                    print(_("→ [System] Speech segment queued for independent transcription"))
+                except queue.Full:
+                    print(_("→ [System] Independent transcription queue is full"))
+
+    def pipeline_stats(self):
+        """{source: PipelineStats} of the capture pipelines of the current meeting"""
+        stats = {'microphone': self.microphone_stats}
+        if self.system_recorder and getattr(self.system_recorder, 'stats', None):
+            stats['system'] = self.system_recorder.stats
+        return stats
+
+    def timeline_position(self, t):
+        """Meeting timeline sample for perf_counter time `t`.
+
+        Once the mic is running its sample clock is used, so system segments stay in
+        sync with the mic track however long the meeting runs.
+        """
+        if self._mic_origin is not None:
+            engine, position, origin = self._mic_origin
+            at = engine.position_at(t)
+            if at is not None:
+                return max(0, origin + at - position)
+        return max(0, int(round((t - self.timeline_start) * self.transcriber_ref.sr)))
 
     def stop_audio_recording(self):
         """Stop audio recording."""
@@ -312,6 +315,13 @@ class MeetingAudioProcessor:
             if self.system_audio_thread.is_alive():
                 print(_("→ Warning: System audio thread did not terminate cleanly"))
 
+        # The recorder queues the speech still in progress when it stops; store it like any other segment
+        if self.system_recorder and self.system_spool is not None:
+            try:
+                self._store_system_segments(self.system_recorder.get_speech_segments())
+            except Exception as e:
+                print(_("→ [System] Error processing audio: {}").format(e))
+
         # Close audio stream
         if self.stream:
             print(_("→ Closing audio stream..."))
@@ -324,53 +334,63 @@ class MeetingAudioProcessor:
             finally:
                 self.stream = None
 
-    def get_recorded_audio(self):
-        """Get recorded audio data."""
-        with self.meeting_audio_buffer_lock:
-            mic_audio = self._bytes_to_audio(self.meeting_audio_buffer)
+    def recorded_audio_blocks(self):
+        """Yield the recorded meeting audio block by block, mixing mic and system audio.
 
-        # Get system audio buffer data
-        with self.system_audio_buffer_lock:
-            system_audio = self._bytes_to_audio(self.system_audio_buffer)
+        Streams from the on-disk tracks: one pass to measure loudness, one to mix, so
+        memory use stays flat however long the meeting was.
+        """
+        sr = self.transcriber_ref.sr
+        mic, system = self.microphone_spool, self.system_spool
+        if mic is None:
+            return
+        mic_s, system_s = len(mic) / sr, len(system) / sr
 
         # Check if we were in built-in speaker mode
-        if self.system_recorder and hasattr(self.system_recorder, 'skip_system_recording'):
-            was_builtin_speaker = getattr(self.system_recorder, 'skip_system_recording', False)
-            if was_builtin_speaker:
-                print(_("→ Built-in speaker mode: Using microphone audio only (includes speaker audio)"))
-                print(_("→ Microphone audio length: {:.1f}s").format(len(mic_audio)/self.transcriber_ref.sr))
-                return mic_audio
+        if self.system_recorder and getattr(self.system_recorder, 'skip_system_recording', False):
+            print(_("→ Built-in speaker mode: Using microphone audio only (includes speaker audio)"))
+            print(_("→ Microphone audio length: {:.1f}s").format(mic_s))
+            yield from mic.blocks()
+            return
 
         # If system audio exists, mix
-        if len(system_audio) > 0:
-            # Align audio length
-            max_len = max(len(mic_audio), len(system_audio))
-
-            # Pad shorter audio
-            if len(mic_audio) < max_len:
-                mic_audio = np.pad(mic_audio, (0, max_len - len(mic_audio)))
-            if len(system_audio) < max_len:
-                system_audio = np.pad(system_audio, (0, max_len - len(system_audio)))
-
-            # Loudness normalization
-            target_lufs = -23.0
-            mic_normalized = self._loudness_normalize(mic_audio, target_lufs=target_lufs)
-            sys_normalized = self._loudness_normalize(system_audio, target_lufs=target_lufs)
+        if len(system) == 0:
+            # Microphone audio only
+            print(_("→ Microphone audio only: {:.1f}s").format(mic_s))
+            yield from mic.blocks()
+            return
 
+        # Loudness normalization gains, measured in a streaming pass
+        target_lufs = -23.0
+        mic_gain, system_gain = (self._loudness_gain(spool, target_lufs) for spool in (mic, system))
+        print(_("→ Mixed audio: Microphone {:.1f}s + System {:.1f}s").format(mic_s, system_s))
+
+        empty = np.zeros(0, dtype=np.float32)
+        mic_blocks, system_blocks = mic.blocks(), system.blocks()
+        while True:
+            m, s = next(mic_blocks, empty), next(system_blocks, empty)
+            if m.size == 0 and s.size == 0:
+                break
+            # Pad the shorter track
+            n = max(m.size, s.size)
+            m, s = np.pad(m, (0, n - m.size)), np.pad(s, (0, n - s.size))
             # Simple mixing: average normalized signals then clip
-            mixed_audio = (mic_normalized + sys_normalized) / 2.0
-            mixed_audio = np.clip(mixed_audio, -1.0, 1.0)
-
-            print(_("→ Mixed audio: Microphone {:.1f}s + System {:.1f}s").format(
-                len(mic_audio)/self.transcriber_ref.sr,
-                len(system_audio)/self.transcriber_ref.sr
-            ))
-
-            return mixed_audio
-        else:
-            # Microphone audio only
-            print(_("→ Microphone audio only: {:.1f}s").format(len(mic_audio)/self.transcriber_ref.sr))
-            return mic_audio
+            mixed = (np.clip(m * mic_gain, -1.0, 1.0) + np.clip(s * system_gain, -1.0, 1.0)) / 2.0
+            yield np.clip(mixed, -1.0, 1.0)
+
+    def _loudness_gain(self, spool, target_lufs):
+        meter = LoudnessMeter(self.transcriber_ref.sr)
+        for block in spool.blocks():
+            meter.feed(block)
+        loudness = meter.integrated()
+        return np.float32(10 ** ((target_lufs - loudness) / 20)) if np.isfinite(loudness) else np.float32(1.0)
+
+    def discard_recording(self):
+        """Delete the on-disk tracks once the meeting has been exported"""
+        for spool in (self.microphone_spool, self.system_spool):
+            if spool:
+                spool.remove()
+        self.microphone_spool = self.system_spool = None
 
     def cleanup_resources(self):
         """Cleanup resources."""
@@ -399,19 +419,10 @@ class MeetingAudioProcessor:
         except Exception:
             pass
 
-        # Clear system audio data
-        try:
-            with self.system_audio_buffer_lock:
-                self.system_audio_buffer = []
-        except Exception:
-            pass
-            
-        # Clear meeting audio data
-        try:
-            with self.meeting_audio_buffer_lock:
-                self.meeting_audio_buffer = []
-        except Exception:
-            pass
+        # Close the on-disk tracks; anything not exported stays in recordings/meetings for recovery
+        for spool in (self.microphone_spool, self.system_spool):
+            if spool:
+                spool.close()
             
         # Force garbage collection on macOS
         import gc
@@ -0,0 +1,94 @@
+import os
+import shutil
+import threading
+import numpy as np
+
+CHUNK_SECONDS = 600  # One int16 file per 10 minutes of audio
+READ_BLOCK_SECONDS = 10
+
+
+class AudioSpool:
+    """Append-only mono int16 track on disk, split into fixed-length chunk files.
+
+    Meeting audio is written here as it is captured instead of being kept in RAM;
+    `blocks()` reads it back one block at a time, so memory use does not grow with
+    the meeting length.
+    """
+
+    def __init__(self, directory, name, sample_rate=16000, chunk_seconds=CHUNK_SECONDS):
+        self.directory = directory
+        self.name = name
+        self.sr = sample_rate
+        self.chunk_samples = int(chunk_seconds * sample_rate)
+        self.length = 0
+        self._file = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, index):
+        return os.path.join(self.directory, f"{self.name}_{index:04d}.pcm")
+
+    def __len__(self):
+        return self.length
+
+    def write(self, samples):
+        """Append float32 samples in [-1, 1]"""
+        pcm = (np.clip(np.asarray(samples, dtype=np.float32).reshape(-1), -1.0, 1.0) * 32767).astype(np.int16)
+        with self._lock:
+            while pcm.size:
+                offset = self.length % self.chunk_samples
+                if offset == 0 or self._file is None:
+                    if self._file:
+                        self._file.close()
+                    self._file = open(self._path(self.length // self.chunk_samples), "ab")
+                n = min(pcm.size, self.chunk_samples - offset)
+                self._file.write(pcm[:n].tobytes())
+                self.length += n
+                pcm = pcm[n:]
+
+    def write_at(self, position, samples):
+        """Write samples starting at track position `position`, zero-filling any gap.
+
+        The part of `samples` that falls before the current end of the track is dropped.
+        """
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        if position > self.length:
+            gap = position - self.length
+            while gap:
+                n = min(gap, self.chunk_samples)
+                self.write(np.zeros(n, dtype=np.float32))
+                gap -= n
+        elif position < self.length:
+            samples = samples[self.length - position:]
+        if samples.size:
+            self.write(samples)
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def blocks(self, block_size=None):
+        """Yield the track as float32 blocks of `block_size` samples (the last may be shorter)"""
+        self.close()
+        block_size = block_size or READ_BLOCK_SECONDS * self.sr
+        index = 0
+        while index * self.chunk_samples < self.length:
+            n = min(self.chunk_samples, self.length - index * self.chunk_samples)
+            with open(self._path(index), "rb") as f:
+                for start in range(0, n, block_size):
+                    yield np.fromfile(f, dtype=np.int16, count=min(block_size, n - start)).astype(np.float32) / 32767
+            index += 1
+
+    def remove(self):
+        """Delete this track's files, and the directory once it is empty"""
+        self.close()
+        for index in range(-(-self.length // self.chunk_samples)):
+            try:
+                os.unlink(self._path(index))
+            except OSError:
+                pass
+        self.length = 0
+        if os.path.isdir(self.directory) and not os.listdir(self.directory):
+            shutil.rmtree(self.directory, ignore_errors=True)
@@ -1,120 +1,125 @@
 import os
+import wave
+import shutil
 import datetime
+import itertools
+import subprocess
 import numpy as np
-import scipy.io.wavfile as wav
 
 from core.i18n import _
 
+MEETINGS_DIR = "./recordings/meetings"
+OLLAMA_TIMEOUT_S = 120  # Local models think before answering, and summaries are long
 
-def summarize_meeting(transcripts):
-        """Summarize meeting transcripts."""
+
+def summarize_meeting(transcripts, prompt="summarize_meeting"):
+        """Summarize meeting transcripts (or part of them, with prompt="summarize_meeting_chunk")."""
         from core.llm_context import cfg, ollama, OpenAI
-        with open("core/prompts/summarize_meeting.md", encoding="utf-8") as f:
+        with open(f"core/prompts/{prompt}.md", encoding="utf-8") as f:
             prompt_template = f.read()
         prompt = prompt_template.replace('{recording}', transcripts)
         m = [{"role": "user", "content": prompt}]
         
         if "ollama" in cfg['base_url'].lower():
-            result = ollama.chat(model=cfg['model'], messages=m, think=True)['message']['content']
+            result = ollama.Client(timeout=OLLAMA_TIMEOUT_S).chat(model=cfg['model'], messages=m, think=True)['message']['content']
         else:
             result = OpenAI(api_key=cfg['api_key'], base_url=cfg['base_url']).chat.completions.create(
                 model=cfg['model'], messages=m, timeout=30).choices[0].message.content
         return result
 
-def save_meeting_results(transcriber_ref, meeting_start_time, transcripts, final_audio):
+def save_meeting_results(transcriber_ref, meeting_start_time, transcripts, audio_blocks, summarizer=None):
         # Save meeting results (transcripts and audio)
         if not meeting_start_time:
             return
 
-        output_dir = "./recordings/meetings"
+        output_dir = MEETINGS_DIR
         os.makedirs(output_dir, exist_ok=True)
 
         timestamp = meeting_start_time.strftime("%Y%m%d_%H%M%S")
 
         # Save transcripts if available
         if transcripts:
-            _save_transcripts(output_dir, timestamp, meeting_start_time, transcripts)
+            _save_transcripts(output_dir, timestamp, meeting_start_time, transcripts, summarizer)
 
         # Save audio if available
-        if final_audio is not None and len(final_audio) > 0:
-            _save_audio(transcriber_ref, output_dir, timestamp, final_audio)
-
-def _save_transcripts(output_dir, timestamp, meeting_start_time, transcripts):
-        # Save transcript text file
-        sorted_transcripts = sorted(transcripts, key=lambda x: x['timestamp'])
+        if audio_blocks is not None:
+            _save_audio(transcriber_ref, output_dir, timestamp, audio_blocks)
 
+def _save_transcripts(output_dir, timestamp, meeting_start_time, transcripts, summarizer=None):
+        # Entries are already safe in the meeting's JSONL log, so the text file is
+        # written once, summary first, streaming the entries from the log
         transcript_file = f"{output_dir}/meeting_{timestamp}.txt"
-        
-        # Prepare transcript content
-        transcript_content = []
-        transcript_content.append(f"Meeting Recording - {meeting_start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-        transcript_content.append("=" * 60 + "\n\n")
-
-        # Collect transcripts with source tags
-        transcript_text_only = []
-        for entry in sorted_transcripts:
-            source_tag = "🎤" if entry.get('source') == 'microphone' else "🔊" if entry.get('source') == 'system' else "❓"
-            transcript_content.append(f"[{entry['timestamp'].strftime('%H:%M:%S')}] {source_tag} {entry['text']}\n\n")
-            transcript_text_only.append(f"[{entry['timestamp'].strftime('%H:%M:%S')}] {entry['text']}")
-
-        transcript_content.append("\n" + "=" * 60 + "\n")
-        transcript_content.append(f"End of meeting - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        transcript_content.append(f"\nLegend: 🎤=Microphone, 🔊=System Audio\n")
-        
-        # First save the transcripts without summary to ensure they're preserved
-        with open(transcript_file, 'w', encoding='utf-8') as f:
-            f.write("".join(transcript_content))
-        
-        print(_("📄 Transcripts saved to: {}").format(transcript_file))
-        print(_("  → {} microphone transcripts").format(
-            sum(1 for t in sorted_transcripts if t.get('source') == 'microphone')
-        ))
-        print(_("  → {} system audio transcripts").format(
-            sum(1 for t in sorted_transcripts if t.get('source') == 'system')
-        ))
-        
-        # Now try to generate and add summary
+
+        summary_text = None
         try:
             print(_("📝 Generating meeting summary..."))
-            summary_text = summarize_meeting("\n".join(transcript_text_only))
-            
-            # Read the existing content
-            with open(transcript_file, 'r', encoding='utf-8') as f:
-                existing_content = f.read()
-            
-            # Write the file again with summary at the beginning
-            with open(transcript_file, 'w', encoding='utf-8') as f:
-                f.write(f"<summary>\n\n{summary_text}\n\n</summary>\n\n")
-                f.write("=" * 60 + "\n")
-                f.write(existing_content)
-                
-            print(_("✅ Meeting summary generated and added"))
+            if summarizer:
+                # Most of the meeting was condensed while it ran: one final call
+                summary_text = summarizer.finish()
+            else:
+                summary_text = summarize_meeting("\n".join(
+                    f"[{entry['timestamp'].strftime('%H:%M:%S')}] {entry['text']}" for entry in transcripts
+                ))
         except Exception as e:
             print(_(f"⚠️ Failed to generate summary: {e}"))
-            # Transcripts are already saved, so no action needed
 
-def _save_audio(transcriber_ref, output_dir, timestamp, final_audio):
-        # Save audio file (WAV and MP3)
-        wav_file = f"{output_dir}/meeting_{timestamp}_temp.wav"
-        mp3_file = f"{output_dir}/meeting_{timestamp}.mp3"
+        counts = {}
+        with open(transcript_file, 'w', encoding='utf-8') as f:
+            if summary_text:
+                f.write(f"<summary>\n\n{summary_text}\n\n</summary>\n\n")
+                f.write("=" * 60 + "\n")
+            f.write(f"Meeting Recording - {meeting_start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write("=" * 60 + "\n\n")
 
-        # Write WAV file
-        wav.write(
-            wav_file,
-            transcriber_ref.sr,
-            (np.clip(final_audio, -1.0, 1.0) * 32767).astype(np.int16)
-        )
+            # Transcripts with source tags
+            for entry in transcripts:
+                source_tag = "🎤" if entry.get('source') == 'microphone' else "🔊" if entry.get('source') == 'system' else "❓"
+                f.write(f"[{entry['timestamp'].strftime('%H:%M:%S')}] {source_tag} {entry['text']}\n\n")
+                counts[entry.get('source')] = counts.get(entry.get('source'), 0) + 1
 
-        # Convert to MP3
-        _convert_to_mp3(wav_file, mp3_file)
+            f.write("\n" + "=" * 60 + "\n")
+            f.write(f"End of meeting - {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"\nLegend: 🎤=Microphone, 🔊=System Audio\n")
 
-        # Remove temporary WAV file
-        os.unlink(wav_file)
+        print(_("📄 Transcripts saved to: {}").format(transcript_file))
+        print(_("  → {} microphone transcripts").format(counts.get('microphone', 0)))
+        print(_("  → {} system audio transcripts").format(counts.get('system', 0)))
+        if summary_text:
+            print(_("✅ Meeting summary generated and added"))
+
+def _save_audio(transcriber_ref, output_dir, timestamp, audio_blocks):
+        # Stream the mixed audio straight into the MP3 encoder, no temporary WAV
+        blocks = iter(audio_blocks)
+        first = next(blocks, None)
+        if first is None:
+            return False
+        mp3_file = f"{output_dir}/meeting_{timestamp}.mp3"
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            # No encoder available: keep a WAV instead
+            mp3_file = f"{output_dir}/meeting_{timestamp}.wav"
+            with wave.open(mp3_file, "wb") as out:
+                out.setnchannels(1)
+                out.setsampwidth(2)
+                out.setframerate(transcriber_ref.sr)
+                for block in itertools.chain([first], blocks):
+                    out.writeframes(_to_pcm16(block))
+        else:
+            proc = subprocess.Popen(
+                [ffmpeg, "-y", "-loglevel", "error", "-f", "s16le", "-ar", str(transcriber_ref.sr), "-ac", "1",
+                 "-i", "pipe:0", "-q:a", "2", mp3_file],
+                stdin=subprocess.PIPE
+            )
+            try:
+                for block in itertools.chain([first], blocks):
+                    proc.stdin.write(_to_pcm16(block))
+            finally:
+                proc.stdin.close()
+            if proc.wait() != 0:
+                raise RuntimeError(_("ffmpeg exited with code {}").format(proc.returncode))
 
         print(_("🎵 Audio saved to: {}").format(mp3_file))
+        return True
 
-def _convert_to_mp3(wav_path, mp3_path):
-        # Convert WAV to MP3 with quality level 2
-        from pydub import AudioSegment
-        audio = AudioSegment.from_wav(str(wav_path))
-        audio.export(str(mp3_path), format="mp3", parameters=["-q:a", "2"])
\ No newline at end of file
+def _to_pcm16(audio):
+        return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
@@ -0,0 +1,119 @@
+"""Incremental meeting summarisation.
+
+Transcript entries are collected as they are produced; every `chunk_minutes` of
+meeting (or MAX_CHUNK_CHARS of text, whichever comes first) the chunk is condensed
+into notes by a background worker. When the notes themselves grow past
+MAX_NOTES_CHARS, the oldest ones are merged into a single note, so the input of the
+final step stays bounded however long the meeting runs.
+
+At stop, `finish()` makes one LLM call over the notes plus the not-yet-condensed
+tail, so stop-to-summary latency no longer depends on the meeting length. Raw text
+that was never condensed (the tail, chunks the worker did not get to) is clipped to
+MAX_RAW_CHARS in total, keeping the start and end of each part.
+"""
+import queue
+import threading
+
+from core.i18n import _
+
+CHUNK_MINUTES = 10
+MAX_CHUNK_CHARS = 12000   # Cut a chunk early during very dense talk
+MAX_NOTES_CHARS = 24000   # Merge the oldest notes once they exceed this
+MERGE_NOTES = 4           # Notes merged into one per hierarchical step
+FINISH_WAIT_S = 45        # How long stop waits for an in-flight chunk before using its raw text
+MAX_RAW_CHARS = MAX_CHUNK_CHARS  # Raw text (unfinished chunks and the tail) allowed into the final call
+
+
+class RollingSummarizer:
+    def __init__(self, chunk_minutes=CHUNK_MINUTES):
+        self.chunk_seconds = max(1, chunk_minutes) * 60
+        self.notes = []      # [(first, last, text)] in time order
+        self._lines = []     # Current chunk: "[HH:MM:SS] text" lines
+        self._chunk_start = None
+        self._chunk_end = None
+        self._chars = 0
+        self._lock = threading.Lock()
+        self._pending = []   # Chunks handed to the worker and not yet condensed
+        self.jobs = queue.Queue()
+        self.worker = threading.Thread(target=self._worker, daemon=True)
+        self.worker.start()
+
+    def add(self, timestamp, text):
+        """Record one transcript entry; hands a full chunk to the background worker"""
+        line = f"[{timestamp.strftime('%H:%M:%S')}] {text}"
+        with self._lock:
+            if self._chunk_start is None:
+                self._chunk_start = timestamp
+            self._lines.append(line)
+            self._chunk_end = timestamp
+            self._chars += len(line) + 1
+            if (timestamp - self._chunk_start).total_seconds() >= self.chunk_seconds or self._chars >= MAX_CHUNK_CHARS:
+                self._cut()
+
+    def _cut(self):
+        chunk = (self._chunk_start, self._chunk_end, "\n".join(self._lines))
+        self._lines, self._chunk_start, self._chunk_end, self._chars = [], None, None, 0
+        self._pending.append(chunk)
+        self.jobs.put(chunk)
+
+    def _worker(self):
+        from core.meeting.meeting_exporter import summarize_meeting
+        while True:
+            chunk = self.jobs.get()
+            if chunk is None:
+                break
+            first, last, text = chunk
+            try:
+                note = summarize_meeting(text, prompt="summarize_meeting_chunk")
+            except Exception as e:
+                print(_("⚠️ Failed to summarize meeting part {}: {}").format(first.strftime('%H:%M:%S'), e))
+                note = text  # Keep the raw text so the final summary still covers it
+            with self._lock:
+                self._pending.remove(chunk)
+                self.notes.append((first, last, note))
+                merge = sum(len(n[2]) for n in self.notes) > MAX_NOTES_CHARS and len(self.notes) > 1
+            if merge:
+                self._merge(summarize_meeting)
+            self.jobs.task_done()
+
+    def _merge(self, summarize_meeting):
+        """Condense the oldest notes into one (hierarchical step)"""
+        with self._lock:
+            group = self.notes[:MERGE_NOTES]
+        try:
+            merged = summarize_meeting(_format(group), prompt="summarize_meeting_chunk")
+        except Exception as e:
+            print(_("⚠️ Failed to merge meeting notes: {}").format(e))
+            return
+        with self._lock:
+            self.notes[:len(group)] = [(group[0][0], group[-1][1], merged)]
+
+    def finish(self, timeout=FINISH_WAIT_S):
+        """Final summary over the notes and the remaining transcript: a single LLM call"""
+        from core.meeting.meeting_exporter import summarize_meeting
+        self.jobs.put(None)
+        self.worker.join(timeout)
+        with self._lock:
+            if not self.notes and not self._pending:
+                # Short meeting: nothing was condensed, summarise the transcript itself
+                return summarize_meeting("\n".join(self._lines)) if self._lines else None
+            raw = list(self._pending)
+            if self._lines:
+                raw.append((self._chunk_start, self._chunk_end, "\n".join(self._lines)))
+            parts = self.notes + [(first, last, _clip(text, MAX_RAW_CHARS // len(raw))) for first, last, text in raw]
+        return summarize_meeting(_format(parts))
+
+    def close(self):
+        """Stop the worker without summarising"""
+        self.jobs.put(None)
+
+
+def _clip(text, limit):
+    """`text` cut to about `limit` characters, keeping its start and end"""
+    if len(text) <= limit:
+        return text
+    return text[:limit // 2].rstrip() + "\n[...]\n" + text[-(limit // 2):].lstrip()
+
+
+def _format(parts):
+    return "\n\n".join(f"[{first.strftime('%H:%M:%S')} - {last.strftime('%H:%M:%S')}]\n{text}" for first, last, text in parts)
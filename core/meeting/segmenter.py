@@ -0,0 +1,237 @@
+"""Adaptive speech segmentation for meeting audio.
+
+Segments used to be closed only by 1.5 s of silence: a speaker who never pauses
+produced one huge segment, and choppy talk produced many tiny ones, each paying the
+full per-call ASR overhead. `AdaptiveSegmenter` works on absolute sample positions
+and per-block VAD probabilities and
+
+- closes a segment at `max_s`, cutting at the least speech-like block of its second
+  half and keeping `overlap_s` of audio in both halves;
+- holds segments shorter than `target_s` and merges them with the next ones (the
+  silence between them is left out), emitting once `target_s` is reached or no new
+  speech starts within `merge_wait_s`.
+
+Words spoken across a forced cut end up in both transcripts; `drop_repeated_prefix`
+removes them from the second one.
+
+Segments travel to transcription as `SpeechSegment`s carrying the VAD probabilities
+computed at capture time, so the speech range is found without running the model
+over the segment again. System audio is cut by the simpler `PauseSegmenter`.
+"""
+import re
+import numpy as np
+
+from core.audio_capture import BLOCK_SIZE
+from core.audio_utils import VAD_WINDOW
+
+SILENCE_S = 1.5     # Pause that closes a segment
+MAX_S = 20.0        # Longest segment sent to ASR
+TARGET_S = 6.0      # Shorter segments wait to be merged with the next ones
+OVERLAP_S = 0.5     # Audio shared by the two halves of a forced cut
+MERGE_WAIT_S = 1.0  # Further silence after which a held segment is sent anyway
+PRE_SPEECH_S = 1.0  # Audio kept before speech onset
+TAIL_S = 0.3        # Audio kept after speech ends
+
+_TOKEN = re.compile(r'[\u3040-\u30ff\u3400-\u9fff\uf900-\ufaff]|\w+')
+_LEADING_PUNCT = " ,.;:!?，。、；：！？"
+
+
+class SpeechSegment:
+    """Captured audio on its way to ASR, with one speech probability per VAD_WINDOW samples.
+
+    `captured_at` is the perf_counter time of the first sample (system audio only);
+    `overlap` the seconds at its start that were already sent with the previous segment.
+    """
+    __slots__ = ('audio', 'probs', 'captured_at', 'overlap')
+
+    def __init__(self, audio, probs, captured_at=None, overlap=0.0):
+        self.audio = audio
+        self.probs = probs
+        self.captured_at = captured_at
+        self.overlap = overlap
+
+    def speech_range(self, vad, sr, padding_ms):
+        """(start, end) samples of the speech extended by `padding_ms`, or None without speech"""
+        if vad is None or not vad.model:
+            return 0, len(self.audio)
+        timestamps = vad.timestamps_from_probs(self.probs, len(self.audio))
+        return vad.speech_range(timestamps, len(self.audio), sr, padding_ms)
+
+
+def window_probs(chunk_probs, chunk_lengths):
+    """Spread per-chunk probabilities over VAD_WINDOW windows of the chunks joined together;
+    each window takes the probability of the chunk holding its middle sample"""
+    ends = np.cumsum(chunk_lengths)
+    if not len(ends):
+        return np.zeros(0, dtype=np.float32)
+    middles = np.arange(VAD_WINDOW // 2, ends[-1], VAD_WINDOW)
+    return np.asarray(chunk_probs, dtype=np.float32)[np.searchsorted(ends, middles, side='right')]
+
+
+class PauseSegmenter:
+    """Cuts system audio into SpeechSegments at pauses of `silence_s`.
+
+    Fed chunk by chunk with the VAD probability and perf_counter capture time of each
+    chunk's last sample; keeps PRE_SPEECH_S of audio before speech starts. `flush()`
+    returns the segment still open when recording stops.
+    """
+
+    def __init__(self, sr, threshold, silence_s=1.0, block_size=BLOCK_SIZE):
+        self.sr = sr
+        self.threshold = threshold
+        self.silence_s = silence_s
+        self.max_idle = int(PRE_SPEECH_S * sr / block_size)
+        self.reset()
+
+    def reset(self):
+        self.chunks, self.probs = [], []
+        self.active = False
+        self.silence = 0.0
+        self.end = None
+
+    def feed(self, chunk, prob, captured_end):
+        """Add a mono float32 chunk; returns the SpeechSegment a pause completes, else None"""
+        self.chunks.append(chunk)
+        self.probs.append(prob)
+        self.end = captured_end
+        if prob > self.threshold:
+            self.active, self.silence = True, 0.0
+        elif self.active:
+            self.silence += len(chunk) / self.sr
+            if self.silence >= self.silence_s:
+                return self.flush()
+        elif len(self.chunks) > self.max_idle:
+            self.chunks, self.probs = self.chunks[-self.max_idle:], self.probs[-self.max_idle:]
+        return None
+
+    def flush(self):
+        """The segment in progress, or None when no speech started since the last one"""
+        segment = None
+        if self.active and self.chunks:
+            audio = np.concatenate(self.chunks).astype(np.float32, copy=False)
+            probs = window_probs(self.probs, [len(c) for c in self.chunks])
+            segment = SpeechSegment(audio, probs, self.end - len(audio) / self.sr)
+        self.reset()
+        return segment
+
+
+class AdaptiveSegmenter:
+    def __init__(self, sr, threshold, block_size=BLOCK_SIZE, silence_s=SILENCE_S, max_s=MAX_S,
+                 target_s=TARGET_S, overlap_s=OVERLAP_S, merge_wait_s=MERGE_WAIT_S):
+        self.threshold = threshold
+        self.block = block_size
+        self.silence = int(silence_s * sr)
+        self.max = int(max_s * sr)
+        self.target = int(target_s * sr)
+        self.overlap = int(overlap_s * sr)
+        self.merge_wait = int(merge_wait_s * sr)
+        self.pre_speech = int(PRE_SPEECH_S * sr)
+        self.tail = min(int(TAIL_S * sr), self.silence)
+        # Oldest audio a pending cut can still refer to, so the caller can size its buffer
+        self.span_s = (self.max + self.pre_speech) / sr
+        # Probability of every recent block, indexed by block number, for probs_for()
+        self.history = np.zeros(-(-int(self.span_s * sr) // block_size) + 2, dtype=np.float32)
+        self.reset(0)
+
+    def reset(self, position):
+        self.start = position      # Where the current segment begins
+        self.active = False
+        self.silence_run = 0
+        self.probs = []            # [(prob, block end)] of the current segment
+        self.carry = 0             # Overlap the current segment shares with the previous cut
+        self.held = []             # Closed ranges waiting to be merged
+        self.held_len = 0
+        self.held_end = 0
+        self.held_carry = 0
+
+    def feed(self, prob, end):
+        """Account for the block ending at sample `end`.
+
+        Returns the segments completed by it as (ranges, overlap) pairs: `ranges` is a
+        list of (start, end) sample positions to concatenate, `overlap` the number of
+        leading samples already sent at the end of the previous segment.
+        """
+        out = []
+        self.history[(end // self.block - 1) % self.history.size] = prob
+        if prob > self.threshold:
+            self.active = True
+            self.silence_run = 0
+        elif self.active:
+            self.silence_run += self.block
+        else:
+            self.start = max(self.start, end - self.pre_speech)
+        if self.active:
+            self.probs.append((prob, end))
+
+        if self.held and (end - self.held[0][0] >= self.max or not self.active and end - self.held_end >= self.merge_wait):
+            out.append(self._release())
+        if self.active and self.silence_run >= self.silence:
+            self._close(end - self.silence_run + self.tail, end, out)
+            self.start = end
+        elif self.active and end - self.start >= self.max:
+            out.extend(self._split(end))
+        elif self.held and self.active and self.held_len + end - self.start > self.max:
+            out.append(self._release())  # Merging would exceed max_s: stop waiting
+        return out
+
+    def probs_for(self, ranges):
+        """VAD_WINDOW probabilities of the audio of `ranges` joined together, from the blocks fed so far"""
+        probs, lengths = [], []
+        for start, end in ranges:
+            blocks = np.arange(start // self.block, -(-end // self.block))
+            probs.append(self.history[blocks % self.history.size])
+            lengths.append(np.minimum(end, (blocks + 1) * self.block) - np.maximum(start, blocks * self.block))
+        return window_probs(np.concatenate(probs), np.concatenate(lengths)) if probs else window_probs([], [])
+
+    def flush(self, end):
+        """Complete everything still pending at the end of the recording"""
+        out = []
+        if self.active:
+            self._close(end, end, out)
+        if self.held:
+            out.append(self._release())
+        self.reset(end)
+        return out
+
+    def _close(self, stop, end, out):
+        length = stop - self.start
+        if self.held and self.held_len + length > self.max:
+            out.append(self._release())
+        if not self.held:
+            self.held_carry = self.carry
+        self.held.append((self.start, stop))
+        self.held_len += length
+        self.held_end = end
+        if self.held_len >= self.target:
+            out.append(self._release())
+        self.active, self.silence_run, self.probs, self.carry = False, 0, [], 0
+
+    def _split(self, end):
+        """Cut a segment that reached max_s at its least speech-like block of the second half"""
+        out = [self._release()] if self.held else []
+        half = self.start + self.max // 2
+        prob, cut = min((p, e - self.block // 2) for p, e in self.probs if e > half)
+        stop = min(end, cut + self.overlap)
+        out.append(([(self.start, stop)], self.carry))
+        self.start, self.carry = cut, stop - cut
+        self.probs = [(p, e) for p, e in self.probs if e > cut]
+        return out
+
+    def _release(self):
+        cut = (self.held, self.held_carry)
+        self.held, self.held_len, self.held_carry = [], 0, 0
+        return cut
+
+
+def drop_repeated_prefix(previous, text, max_tokens=12, min_tokens=2):
+    """Remove the start of `text` that repeats the end of `previous` (overlapping segments).
+
+    Words are compared case-insensitively, CJK character by character; punctuation is
+    ignored.
+    """
+    prev = [m.group().lower() for m in _TOKEN.finditer(previous)][-max_tokens:]
+    new = list(_TOKEN.finditer(text))
+    for k in range(min(len(prev), len(new), max_tokens), min_tokens - 1, -1):
+        if prev[-k:] == [m.group().lower() for m in new[:k]]:
+            return text[new[k - 1].end():].lstrip(_LEADING_PUNCT)
+    return text
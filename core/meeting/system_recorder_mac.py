@@ -1,6 +1,7 @@
 import time
 import threading
 import queue
+from collections import deque
 import numpy as np
 import sounddevice as sd
 import subprocess
@@ -10,7 +11,9 @@ import scipy.io.wavfile as wav
 from scipy import signal
 from pydub import AudioSegment
 import os
-from core.audio_utils import SileroVAD
+from core.audio_utils import SileroVAD, AudioDeviceSelector
+from core.audio_capture import PipelineStats
+from core.meeting.segmenter import PauseSegmenter
 from core.i18n import _
 
 
@@ -25,6 +28,9 @@ class SystemAudioRecorder:
         self.audio_queue = queue.Queue(maxsize=100)
         self.audio_buffer = []
         self.buffer_lock = threading.RLock()
+        self.keep_audio = True  # Keep the whole recording for stop(); meeting mode spools segments to disk instead
+        self._pending = deque()  # (capture end time, mono block at the device rate) not yet seen by the VAD loop
+        self.stats = PipelineStats()
         self.segment_counter = 0
         self.original_device = None
         self.stream = None
@@ -100,7 +106,7 @@ class SystemAudioRecorder:
 
         print(_("→ Querying input devices..."))
         try:
-            input_devices = sd.query_devices()
+            input_devices = AudioDeviceSelector.query_devices()
             print(_("→ Found {} devices").format(len(input_devices) if input_devices else 0))
         except Exception as e:
             print(_("→ Error querying devices: {}").format(e))
@@ -120,7 +126,7 @@ class SystemAudioRecorder:
         print(_("→ Using recording device: {} (index: {})").format(input_devices[blackhole_input]['name'], blackhole_input))
         
         # Get device's native sample rate
-        device_info = sd.query_devices(blackhole_input)
+        device_info = AudioDeviceSelector.query_devices(blackhole_input)
         self._device_sample_rate = int(device_info.get('default_samplerate', 48000))
         if self._device_sample_rate != self.sr:
             print(_("→ Device sample rate: {}Hz, will resample to {}Hz").format(self._device_sample_rate, self.sr))
@@ -128,6 +134,8 @@ class SystemAudioRecorder:
         self.is_recording = True
         self.skip_system_recording = False
         self.audio_buffer = []
+        self._pending.clear()
+        self.stats = PipelineStats()
         self.segment_counter = 0
         self._stop_event.clear()
 
@@ -143,49 +151,38 @@ class SystemAudioRecorder:
     def _recording_loop(self, device_index):
         """System audio recording loop using callback"""
         try:
-            device_info = sd.query_devices(device_index)
+            device_info = AudioDeviceSelector.query_devices(device_index)
             channels = min(2, device_info['max_input_channels'])
             # Use device's native sample rate to avoid resampling issues
             actual_sr = self._device_sample_rate or self.sr
             need_resample = actual_sr != self.sr
 
             # VAD processing state - thread local
-            silence_duration = 0.0
-            speech_segment_buffer = []
-            speech_active = False
             SILENCE_THRESHOLD = 1.0
+            cutter = PauseSegmenter(self.sr, self.vad.threshold, SILENCE_THRESHOLD) if self.vad else None
 
             def audio_callback(indata, frames, time_info, status):
-                """Audio callback - must be lightweight and fast"""
-                # Suppress unused parameter warnings
-                _ = frames, time_info
+                """Audio callback - only downmixes and queues the block; resampling and VAD run in the loop below"""
+                t = time.perf_counter()
+                # perf_counter time the block's last sample was captured, from PortAudio's ADC timestamp
+                latency = time_info.currentTime - time_info.inputBufferAdcTime if time_info.inputBufferAdcTime > 0 else 0.0
+                captured_end = t - max(0.0, latency) + frames / actual_sr
                 
                 if self._stop_event.is_set():
                     raise sd.CallbackStop
                 
-                if status:
-                    print(_("→ [System] Audio callback status: {}").format(status))
+                if status.input_overflow:
+                    self.stats.overflows += 1
 
                 # Convert to mono float32
-                if indata.ndim == 2:
-                    audio_chunk = indata.mean(axis=1)
-                else:
-                    audio_chunk = indata.copy()
-                audio_chunk = audio_chunk.astype(np.float32, copy=False).flatten()
+                audio_chunk = indata.mean(axis=1, dtype=np.float32) if indata.ndim == 2 else indata.astype(np.float32)
                 
-                # Resample if needed (keep lightweight)
-                if need_resample and len(audio_chunk) > 0:
-                    audio_chunk = signal.resample_poly(audio_chunk, self.sr, actual_sr)
-                    audio_chunk = audio_chunk.astype(np.float32, copy=False)
-
-                chunk_bytes = audio_chunk.tobytes()
-                
-                # Store in buffer
                 with self.buffer_lock:
-                    self.audio_buffer.append(chunk_bytes)
+                    self._pending.append((captured_end, audio_chunk))
+                self.stats.add('capture', time.perf_counter() - t)
 
             # Create callback-based stream
-            self.stream = sd.InputStream(
+            self.stream = AudioDeviceSelector.input_stream(
                 samplerate=actual_sr,
                 channels=channels,
                 dtype='float32',
@@ -198,54 +195,50 @@ class SystemAudioRecorder:
             self.stream.start()
             print(_("→ Recording started (callback mode), channels: {}, sample_rate: {}Hz").format(channels, actual_sr))
 
-            # Main processing loop - runs in separate thread, processes buffered audio for VAD
-            CHUNK_SIZE = 512
-            while not self._stop_event.is_set():
-                time.sleep(0.05)  # Small sleep to avoid busy waiting
+            # Processing stage - runs in this thread, resamples and runs VAD on the queued blocks
+            overflows = 0
+            while True:
+                stopping = self._stop_event.is_set()
+                if self.stats.overflows != overflows:
+                    overflows = self.stats.overflows
+                    print(_("→ [System] Audio input overflow"))
                 
-                # Process buffered audio chunks for VAD (if any)
-                chunks_to_process = []
+                # Process every chunk captured since the last pass, exactly once
                 with self.buffer_lock:
-                    if len(self.audio_buffer) > 0:
-                        # Take recent chunks for VAD processing
-                        recent_chunks = self.audio_buffer[-10:]  # Process last 10 chunks
-                        chunks_to_process = recent_chunks.copy()
-
-                if self.vad and chunks_to_process:
-                    for chunk_bytes in chunks_to_process:
-                        audio_chunk = np.frombuffer(chunk_bytes, dtype=np.float32)
-                        if len(audio_chunk) == 0:
-                            continue
-                            
-                        chunk_has_speech = self.vad.is_speech_realtime(audio_chunk, self.sr)
-                        chunk_duration = len(audio_chunk) / self.sr
-
-                        speech_segment_buffer.append(chunk_bytes)
-
-                        if chunk_has_speech:
-                            if not speech_active:
-                                speech_active = True
-                                print(_("→ [System] Speech detected"))
-                            silence_duration = 0.0
-                        else:
-                            if speech_active:
-                                silence_duration += chunk_duration
-                                if silence_duration >= SILENCE_THRESHOLD and len(speech_segment_buffer) > 0:
-                                    segment_audio = self._bytes_to_audio(speech_segment_buffer)
-                                    try:
-                                        self.audio_queue.put(segment_audio.tobytes(), block=False)
-                                        self.segment_counter += 1
-                                        print(_("→ [System] Speech segment {}: {:.1f}s").format(self.segment_counter, len(segment_audio)/self.sr))
-                                    except queue.Full:
-                                        print(_("→ [System] Queue full"))
-                                    speech_segment_buffer = []
-                                    speech_active = False
-                                    silence_duration = 0.0
-                            else:
-                                # Trim buffer to save memory
-                                max_buffer_chunks = int(1.0 * self.sr / CHUNK_SIZE)
-                                if len(speech_segment_buffer) > max_buffer_chunks:
-                                    speech_segment_buffer = speech_segment_buffer[-max_buffer_chunks:]
+                    chunks_to_process = list(self._pending)
+                    self._pending.clear()
+                self.stats.backlog(len(chunks_to_process))
+
+                for captured_end, audio_chunk in chunks_to_process:
+                    if len(audio_chunk) == 0:
+                        continue
+                    t0 = time.perf_counter()
+                    # Resample if needed
+                    if need_resample:
+                        audio_chunk = signal.resample_poly(audio_chunk, self.sr, actual_sr).astype(np.float32, copy=False)
+                    if self.keep_audio:
+                        with self.buffer_lock:
+                            self.audio_buffer.append(audio_chunk.tobytes())
+                    t1 = time.perf_counter()
+                    if not self.vad:
+                        self.stats.add('resample', t1 - t0)
+                        continue
+
+                    prob = self.vad.speech_prob_realtime(audio_chunk, self.sr)
+                    t2 = time.perf_counter()
+                    if prob > self.vad.threshold and not cutter.active:
+                        print(_("→ [System] Speech detected"))
+                    self._queue_segment(cutter.feed(audio_chunk, prob, captured_end))
+                    self.stats.add('resample', t1 - t0)
+                    self.stats.add('vad', t2 - t1)
+                    self.stats.add('segment', time.perf_counter() - t2)
+
+                if stopping:
+                    # Whatever the remote side was still saying is the last segment
+                    if cutter:
+                        self._queue_segment(cutter.flush())
+                    break
+                time.sleep(0.05)  # Small sleep to avoid busy waiting
 
         except Exception as e:
             print(_("→ [System] Recording failed: {}").format(e))
@@ -264,6 +257,16 @@ class SystemAudioRecorder:
             self.is_recording = False
             print(_("→ [System] Recording loop ended"))
 
+    def _queue_segment(self, segment):
+        if segment is None:
+            return
+        try:
+            self.audio_queue.put(segment, block=False)
+            self.segment_counter += 1
+            print(_("→ [System] Speech segment {}: {:.1f}s").format(self.segment_counter, len(segment.audio)/self.sr))
+        except queue.Full:
+            print(_("→ [System] Queue full"))
+
     def _bytes_to_audio(self, byte_chunks):
         """Convert byte chunks to audio array"""
         if not byte_chunks:
@@ -324,7 +327,7 @@ class SystemAudioRecorder:
         return None
 
     def get_speech_segments(self):
-        """Get speech segments from queue"""
+        """Get the SpeechSegments cut since the last call"""
         # If we skipped system recording, return empty
         if self.skip_system_recording:
             return []
@@ -332,8 +335,7 @@ class SystemAudioRecorder:
         segments = []
         while not self.audio_queue.empty():
             try:
-                segment_bytes = self.audio_queue.get_nowait()
-                segments.append(np.frombuffer(segment_bytes, dtype=np.float32).copy())
+                segments.append(self.audio_queue.get_nowait())
             except queue.Empty:
                 break
         return segments
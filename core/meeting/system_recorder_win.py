@@ -1,6 +1,7 @@
 import time
 import threading
 import queue
+from collections import deque
 import numpy as np
 import soundcard as sc
 import os
@@ -10,6 +11,8 @@ import scipy.io.wavfile as wav
 from pydub import AudioSegment
 from soundcard.mediafoundation import SoundcardRuntimeWarning
 from core.audio_utils import SileroVAD
+from core.audio_capture import PipelineStats
+from core.meeting.segmenter import PauseSegmenter
 from core.i18n import _
 import pythoncom
 
@@ -27,6 +30,9 @@ class SystemAudioRecorder:
         self.audio_queue = queue.Queue(maxsize=100)
         self.audio_buffer = []
         self.buffer_lock = threading.RLock()
+        self.keep_audio = True  # Keep the whole recording for stop(); meeting mode spools segments to disk instead
+        self._pending = deque()  # (capture end time, chunk bytes) not yet seen by the VAD stage
+        self.stats = PipelineStats()
         self.segment_counter = 0
         self.recorder = None  # Store recorder reference for cleanup
         self._stop_event = threading.Event()  # Use Event for clean thread communication
@@ -45,6 +51,8 @@ class SystemAudioRecorder:
         self.is_recording = True
         self.is_stopping = False
         self.audio_buffer = []
+        self._pending.clear()
+        self.stats = PipelineStats()
         self.segment_counter = 0
         self._stop_event.clear()
         self.recording_thread = threading.Thread(target=self._recording_loop, daemon=True)
@@ -53,58 +61,31 @@ class SystemAudioRecorder:
         return True
 
     def _recording_loop(self):
-        """System audio recording loop"""
+        """System audio capture loop: read, downmix and hand the chunk to the VAD stage"""
         # Initialize COM for this thread (required for Windows audio)
         pythoncom.CoInitialize()
+        vad_thread = threading.Thread(target=self._vad_loop, daemon=True)
         try:
             self.recorder = self.loopback.recorder(samplerate=self.sr)
             self.recorder.__enter__()  # Manually enter context
+            vad_thread.start()
             try:
-                silence_duration = 0.0
-                speech_segment_buffer = []
-                speech_active = False
-                SILENCE_THRESHOLD = 1.0
                 CHUNK_SIZE = 512
                 while not self._stop_event.is_set():
                     try:
                         audio_chunk = self.recorder.record(numframes=CHUNK_SIZE)
+                        captured_end = time.perf_counter()  # record() returns once the chunk is captured
                         if audio_chunk is None or len(audio_chunk) == 0:
                             continue
                         # Convert to mono if stereo
                         if audio_chunk.ndim == 2:
                             audio_chunk = audio_chunk.mean(axis=1)
-                        audio_chunk = audio_chunk.astype(np.float32)
-                        chunk_bytes = audio_chunk.tobytes()
+                        chunk_bytes = audio_chunk.astype(np.float32).tobytes()
                         with self.buffer_lock:
-                            self.audio_buffer.append(chunk_bytes)
-                        chunk_has_speech = self.vad.is_speech_realtime(audio_chunk, self.sr)
-                        chunk_duration = len(audio_chunk) / self.sr
-                        speech_segment_buffer.append(chunk_bytes)
-                        if chunk_has_speech:
-                            if not speech_active:
-                                speech_active = True
-                                print(_("→ [System] Speech detected"))
-                            silence_duration = 0.0
-                        else:
-                            if speech_active:
-                                silence_duration += chunk_duration
-                                if silence_duration >= SILENCE_THRESHOLD and len(speech_segment_buffer) > 0:
-                                    segment_audio = self._bytes_to_audio(speech_segment_buffer)
-                                    try:
-                                        self.audio_queue.put(segment_audio.tobytes(), block=False)
-                                        self.segment_counter += 1
-                                        print(_("→ [System] Speech segment {}: {:.1f}s").format(
-                                            self.segment_counter, len(segment_audio)/self.sr))
-                                    except queue.Full:
-                                        print(_("→ [System] Queue is full"))
-                                    speech_segment_buffer = []
-                                    speech_active = False
-                                    silence_duration = 0.0
-                            else:
-                                # Limit buffer size for silence
-                                max_buffer_chunks = int(1.0 * self.sr / CHUNK_SIZE)
-                                if len(speech_segment_buffer) > max_buffer_chunks:
-                                    speech_segment_buffer = speech_segment_buffer[-max_buffer_chunks:]
+                            self._pending.append((captured_end, chunk_bytes))
+                            if self.keep_audio:
+                                self.audio_buffer.append(chunk_bytes)
+                        self.stats.add('capture', time.perf_counter() - captured_end)
                     except Exception as e:
                         if not self._stop_event.is_set():
                             print(_("→ [System] Recording error: {}").format(e))
@@ -121,11 +102,53 @@ class SystemAudioRecorder:
             if not self._stop_event.is_set():
                 print(_("→ [System] Recording failed: {}").format(e))
         finally:
+            self._stop_event.set()
+            if vad_thread.is_alive():
+                vad_thread.join(timeout=2)
             self.is_recording = False
             # Uninitialize COM when thread exits
             pythoncom.CoUninitialize()
             print(_("→ [System] Recording loop ended"))
 
+    def _vad_loop(self):
+        """VAD stage: cut the captured chunks into speech segments, off the capture thread"""
+        SILENCE_THRESHOLD = 1.0
+        cutter = PauseSegmenter(self.sr, self.vad.threshold, SILENCE_THRESHOLD)
+        while True:
+            stopping = self._stop_event.is_set()
+            # Process every chunk captured since the last pass, exactly once
+            with self.buffer_lock:
+                chunks_to_process = list(self._pending)
+                self._pending.clear()
+            self.stats.backlog(len(chunks_to_process))
+
+            for captured_end, chunk_bytes in chunks_to_process:
+                t0 = time.perf_counter()
+                audio_chunk = np.frombuffer(chunk_bytes, dtype=np.float32)
+                prob = self.vad.speech_prob_realtime(audio_chunk, self.sr)
+                t1 = time.perf_counter()
+                if prob > self.vad.threshold and not cutter.active:
+                    print(_("→ [System] Speech detected"))
+                self._queue_segment(cutter.feed(audio_chunk, prob, captured_end))
+                self.stats.add('vad', t1 - t0)
+                self.stats.add('segment', time.perf_counter() - t1)
+            if stopping:
+                # Whatever the remote side was still saying is the last segment
+                self._queue_segment(cutter.flush())
+                break
+            time.sleep(0.05)  # Small sleep to avoid busy waiting
+
+    def _queue_segment(self, segment):
+        if segment is None:
+            return
+        try:
+            self.audio_queue.put(segment, block=False)
+            self.segment_counter += 1
+            print(_("→ [System] Speech segment {}: {:.1f}s").format(
+                self.segment_counter, len(segment.audio)/self.sr))
+        except queue.Full:
+            print(_("→ [System] Queue is full"))
+
     def _bytes_to_audio(self, byte_chunks):
         """Convert byte chunks to numpy audio array"""
         if not byte_chunks:
@@ -177,12 +200,11 @@ class SystemAudioRecorder:
         return None
 
     def get_speech_segments(self):
-        """Get speech segments from queue"""
+        """Get the SpeechSegments cut since the last call"""
         segments = []
         while not self.audio_queue.empty():
             try:
-                segment_bytes = self.audio_queue.get_nowait()
-                segments.append(np.frombuffer(segment_bytes, dtype=np.float32).copy())
+                segments.append(self.audio_queue.get_nowait())
             except queue.Empty:
                 break
         return segments
@@ -0,0 +1,65 @@
+import os
+import json
+import time
+import datetime
+import threading
+
+FSYNC_EVERY = 10      # Entries between fsyncs
+FSYNC_INTERVAL_S = 5  # ...or seconds, whichever comes first
+
+
+class TranscriptLog:
+    """Append-only JSONL log of a meeting's transcript entries.
+
+    Every entry is flushed to the OS as soon as it is transcribed, so a crash of the
+    app loses nothing; fsync is batched so a power loss costs at most a few entries.
+    Entries are appended under a lock as they are produced, so the file is already in
+    time order and the export can stream it without sorting.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._synced_at = time.time()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def append(self, text, source):
+        """Record one entry stamped with the current time; returns (timestamp, text)"""
+        with self._lock:
+            timestamp = datetime.datetime.now()
+            self._file.write(json.dumps({"time": timestamp.isoformat(), "source": source, "text": text}, ensure_ascii=False) + "\n")
+            self._file.flush()
+            self.count += 1
+            self._unsynced += 1
+            if self._unsynced >= FSYNC_EVERY or time.time() - self._synced_at >= FSYNC_INTERVAL_S:
+                self._sync()
+        return timestamp, text
+
+    def __len__(self):
+        return self.count
+
+    def _sync(self):
+        os.fsync(self._file.fileno())
+        self._unsynced, self._synced_at = 0, time.time()
+
+    def close(self):
+        with self._lock:
+            if self._file and not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def __iter__(self):
+        """Stream entries back as dicts with a datetime 'timestamp'"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line after a crash
+                yield {'timestamp': datetime.datetime.fromisoformat(entry['time']), 'text': entry['text'], 'source': entry['source']}
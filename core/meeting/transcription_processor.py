@@ -1,15 +1,18 @@
 import time
-import tempfile
-import os
-import datetime
 import queue
 import threading
 import numpy as np
-import scipy.io.wavfile as wav
 
 from core.i18n import _
 from core import transcription_queue
+from core.meeting.transcript_log import TranscriptLog
+from core.meeting.rolling_summary import RollingSummarizer, CHUNK_MINUTES
+from core.meeting.segmenter import drop_repeated_prefix
 
+# Meeting segments yield to dictation, so give them a generous deadline
+MEETING_TIMEOUT = 120
+# Segments drained from a capture queue per round, transcribed as one batch
+MAX_BATCH_SEGMENTS = 8
 
 class MeetingTranscriptionProcessor:
     """Transcription processor for meeting mode audio."""
@@ -25,8 +28,11 @@ class MeetingTranscriptionProcessor:
         self.meeting_transcription_active = False
         self.system_transcription_active = False
 
-        # Transcription results
-        self.meeting_transcripts = []
+        # Transcription results, appended to disk as they are produced
+        self.transcript_log = None
+        # Condenses the transcript in the background so the summary at stop is quick
+        self.summarizer = None
+        self._last_text = {}  # Per source, for removing words repeated across overlapping segments
 
     def start_transcription_processing(self):
         """Start transcription processing threads."""
@@ -45,17 +51,45 @@ class MeetingTranscriptionProcessor:
         else:
             print(_("→ Skipping system audio transcription (built-in speaker mode)"))
 
+    def _drain(self, audio_queue):
+        """Next segment plus any already waiting behind it, so they can be transcribed as one batch"""
+        batch = [audio_queue.get(timeout=1.0)]
+        while len(batch) < MAX_BATCH_SEGMENTS:
+            try:
+                batch.append(audio_queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _prepare_segment(self, segment, vad, padding_ms, noise=None):
+        """Cut a queued SpeechSegment to its speech with the probabilities from capture, then enhance only that"""
+        bounds = segment.speech_range(vad, self.transcriber_ref.sr, padding_ms)
+        if bounds is None:
+            print(_("No speech detected"))
+            return np.zeros(0, dtype=np.float32)
+        return self.transcriber_ref.audio_enhancer.enhance_audio(segment.audio[bounds[0]:bounds[1]], noise)
+
+    def _add_transcript(self, text, source, overlap=False):
+        if overlap and source in self._last_text:
+            text = drop_repeated_prefix(self._last_text[source], text)
+        if not text.strip():
+            return None
+        self._last_text[source] = text
+        text = text.strip() + ('' if text and text[-1] in '.,!?;:。，！？；：' else '.')
+        entry = self.transcript_log.append(text, source)  # source: microphone or system audio
+        if self.summarizer:
+            self.summarizer.add(*entry)
+        return entry
+
     def _process_microphone_transcription(self):
         """Process microphone audio queue and transcribe."""
-        segment_counter = 0
         SPEECH_PADDING_MS = 300
 
         while (hasattr(self.transcriber_ref, 'meeting_recorder') and
-               self.transcriber_ref.meeting_recorder.meeting_mode) or not self.audio_processor.meeting_audio_queue.empty():
+               self.transcriber_ref.meeting_recorder.meeting_mode) or self.audio_processor.capturing or not self.audio_processor.meeting_audio_queue.empty():
             try:
-                # Get audio bytes from queue
-                segment_bytes = self.audio_processor.meeting_audio_queue.get(timeout=1.0)
-                segment_counter += 1
+                # Get segments from queue
+                batch = self._drain(self.audio_processor.meeting_audio_queue)
                 self.meeting_transcription_active = True
 
                 # Safely update tray status
@@ -64,72 +98,42 @@ class MeetingTranscriptionProcessor:
                 except Exception:
                     pass
 
-                # Convert bytes to audio (make writable copy)
-                segment_audio = np.frombuffer(segment_bytes, dtype=np.float32).copy()
-
-                # Enhance audio
-                if not segment_audio.flags.writeable:
-                    segment_audio = segment_audio.copy()
-                segment_audio = self.transcriber_ref.audio_enhancer.enhance_audio(segment_audio)
-
-                # Extract speech segments using microphone VAD
-                if self.audio_processor.microphone_vad is not None:
-                    processed_audio = self.audio_processor.microphone_vad.extract_speech_segments(
-                        segment_audio, self.transcriber_ref.sr, SPEECH_PADDING_MS
-                    )
-                else:
+                if self.audio_processor.microphone_vad is None:
                     print(_("  → Warning: Microphone VAD is None, using raw audio"))
-                    processed_audio = segment_audio
-
-                print(_("  → Starting ASR transcription, length: {:.1f} s ... ").format(
-                    processed_audio.size / self.transcriber_ref.sr
-                ))
-
-                if processed_audio.size / self.transcriber_ref.sr < 0.5:
-                    print(_("  → Warning: Audio too short, skipping transcription"))
-                    try:
-                        self.transcriber_ref.tray.set_status("recording")
-                    except Exception:
-                        pass
-                    continue
-
-                # Save to temp file and transcribe
-                tf = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-                wav.write(tf.name, self.transcriber_ref.sr,
-                          (np.clip(processed_audio, -1.0, 1.0) * 32767).astype(np.int16))
-                tf.close()
+                segments, overlaps = [], []
+                for segment in batch:
+                    processed_audio = self._prepare_segment(segment, self.audio_processor.microphone_vad, SPEECH_PADDING_MS, self.audio_processor.microphone_noise)
+                    print(_("  → Starting ASR transcription, length: {:.1f} s ... ").format(
+                        processed_audio.size / self.transcriber_ref.sr
+                    ))
+                    if processed_audio.size / self.transcriber_ref.sr < 0.5:
+                        print(_("  → Warning: Audio too short, skipping transcription"))
+                        continue
+                    segments.append(processed_audio)
+                    overlaps.append(segment.overlap > 0)
 
                 start_time = time.time()
 
                 try:
-                    text = transcription_queue.transcribe(
-                        audio_path=tf.name,
-                        language=self.transcriber_ref.language
-                    )
-                    print(_("  ✓ Transcription completed in {:.1f} s").format(time.time() - start_time))
+                    texts = transcription_queue.transcribe_batch(
+                        segments,
+                        sr=self.transcriber_ref.sr,
+                        language=self.transcriber_ref.language,
+                        timeout=MEETING_TIMEOUT,
+                        priority=transcription_queue.MEETING_MIC
+                    ) if segments else []
+                    if segments:
+                        print(_("  ✓ Transcription completed in {:.1f} s").format(time.time() - start_time))
                 except Exception as e:
                     print(_("  ❌ Meeting transcription error: {}").format(e))
-                    text = ""
-                finally:
-                    try:
-                        os.unlink(tf.name)
-                    except:
-                        pass
-
-                if text.strip():
-                    timestamp = datetime.datetime.now()
-                    text = text.strip() + ('' if text and text[-1] in '.,!?;:。，！？；：' else '.')
+                    texts = [""] * len(segments)
 
-                    transcript_entry = {
-                        'timestamp': timestamp,
-                        'text': text,
-                        'source': 'microphone'  # Mark as microphone audio
-                    }
-                    self.meeting_transcripts.append(transcript_entry)
-
-                    print(_("→ [Mic-{}] {}").format(timestamp.strftime("%H:%M:%S"), text))
-                else:
-                    print(_("→ Transcription result is empty"))
+                for text, overlap in zip(texts, overlaps):
+                    entry = self._add_transcript(text, 'microphone', overlap)
+                    if entry:
+                        print(_("→ [Mic-{}] {}").format(entry[0].strftime("%H:%M:%S"), entry[1]))
+                    else:
+                        print(_("→ Transcription result is empty"))
 
                 if not (hasattr(self.transcriber_ref, 'meeting_recorder') and self.transcriber_ref.meeting_recorder.meeting_stopping):
                     try:
@@ -160,76 +164,48 @@ class MeetingTranscriptionProcessor:
         while (hasattr(self.transcriber_ref, 'meeting_recorder') and
                self.transcriber_ref.meeting_recorder.meeting_mode) or not self.audio_processor.system_audio_queue.empty():
             try:
-                # Get audio bytes from system queue
-                segment_bytes = self.audio_processor.system_audio_queue.get(timeout=1.0)
-                segment_counter += 1
+                # Get segments from system queue
+                batch = self._drain(self.audio_processor.system_audio_queue)
                 self.system_transcription_active = True
 
-                print(_("  → [System] Starting independent ASR transcription #{} ... ").format(segment_counter))
-
-                # Convert bytes to audio (make writable copy)
-                segment_audio = np.frombuffer(segment_bytes, dtype=np.float32).copy()
-
-                # Enhance audio
-                if not segment_audio.flags.writeable:
-                    segment_audio = segment_audio.copy()
-                segment_audio = self.transcriber_ref.audio_enhancer.enhance_audio(segment_audio)
-
-                # Extract speech segments using system VAD (independent instance)
-                if self.audio_processor.system_vad is not None:
-                    processed_audio = self.audio_processor.system_vad.extract_speech_segments(
-                        segment_audio, self.transcriber_ref.sr, SPEECH_PADDING_MS
-                    )
-                else:
+                if self.audio_processor.system_vad is None:
                     print(_("  → [System] Warning: System VAD is None, using raw audio"))
-                    processed_audio = segment_audio
-
-                duration = processed_audio.size / self.transcriber_ref.sr
-                print(_("  → [System] Processing audio length: {:.1f}s").format(duration))
-
-                if duration < 0.5:
-                    print(_("  → [System] Warning: Audio too short, skipping transcription"))
-                    self.system_transcription_active = False
-                    continue
-
-                # Save to temp file and transcribe
-                tf = tempfile.NamedTemporaryFile(suffix="_system.wav", delete=False)
-                wav.write(tf.name, self.transcriber_ref.sr,
-                          (np.clip(processed_audio, -1.0, 1.0) * 32767).astype(np.int16))
-                tf.close()
+                segments, numbers = [], []
+                for segment in batch:
+                    segment_counter += 1
+                    print(_("  → [System] Starting independent ASR transcription #{} ... ").format(segment_counter))
+                    processed_audio = self._prepare_segment(segment, self.audio_processor.system_vad, SPEECH_PADDING_MS, self.audio_processor.system_noise)
+                    duration = processed_audio.size / self.transcriber_ref.sr
+                    print(_("  → [System] Processing audio length: {:.1f}s").format(duration))
+                    if duration < 0.5:
+                        print(_("  → [System] Warning: Audio too short, skipping transcription"))
+                        continue
+                    segments.append(processed_audio)
+                    numbers.append(segment_counter)
 
                 start_time = time.time()
 
                 try:
-                    text = transcription_queue.transcribe(
-                        audio_path=tf.name,
-                        language=self.transcriber_ref.language
-                    )
-                    transcription_time = time.time() - start_time
-                    print(_("  ✓ [System] Transcription completed in {:.1f}s").format(transcription_time))
+                    texts = transcription_queue.transcribe_batch(
+                        segments,
+                        sr=self.transcriber_ref.sr,
+                        language=self.transcriber_ref.language,
+                        timeout=MEETING_TIMEOUT,
+                        priority=transcription_queue.MEETING_SYSTEM
+                    ) if segments else []
+                    if segments:
+                        transcription_time = time.time() - start_time
+                        print(_("  ✓ [System] Transcription completed in {:.1f}s").format(transcription_time))
                 except Exception as e:
                     print(_("  ❌ [System] Transcription error: {}").format(e))
-                    text = ""
-                finally:
-                    try:
-                        os.unlink(tf.name)
-                    except:
-                        pass
+                    texts = [""] * len(segments)
 
-                if text.strip():
-                    timestamp = datetime.datetime.now()
-                    text = text.strip() + ('' if text and text[-1] in '.,!?;:。，！？；：' else '.')
-
-                    transcript_entry = {
-                        'timestamp': timestamp,
-                        'text': text,
-                        'source': 'system'  # Mark as system audio
-                    }
-                    self.meeting_transcripts.append(transcript_entry)
-
-                    print(_("→ [System-{:02d}] {}").format(segment_counter, text))
-                else:
-                    print(_("→ [System] Transcription result is empty"))
+                for number, text in zip(numbers, texts):
+                    entry = self._add_transcript(text, 'system')
+                    if entry:
+                        print(_("→ [System-{:02d}] {}").format(number, entry[1]))
+                    else:
+                        print(_("→ [System] Transcription result is empty"))
 
                 self.system_transcription_active = False
 
@@ -291,12 +267,21 @@ class MeetingTranscriptionProcessor:
             print(_("⚠️ Timeout waiting for transcriptions, some audio may not be processed"))
 
     def get_transcripts(self):
-        """Get all transcription results."""
-        return self.meeting_transcripts
-
-    def clear_transcripts(self):
-        """Clear all transcription results."""
-        self.meeting_transcripts = []
+        """Get all transcription results (a TranscriptLog; iterate to stream the entries)."""
+        if self.transcript_log:
+            self.transcript_log.close()
+        return self.transcript_log
+
+    def clear_transcripts(self, log_path):
+        """Start a new meeting transcript, logged to `log_path`."""
+        if self.transcript_log:
+            self.transcript_log.close()
+        self.transcript_log = TranscriptLog(log_path)
+        self._last_text = {}
+        if self.summarizer:
+            self.summarizer.close()
+        chunk_minutes = self.transcriber_ref.config.get('meeting', {}).get('summary_chunk_minutes', CHUNK_MINUTES)
+        self.summarizer = RollingSummarizer(chunk_minutes) if chunk_minutes else None
 
     def cleanup_resources(self):
         """Cleanup transcription processor resources."""
@@ -307,8 +292,11 @@ class MeetingTranscriptionProcessor:
         if self.system_transcription_thread and self.system_transcription_thread.is_alive():
             self.system_transcription_thread.join(timeout=3)
         
-        # Clear transcripts
-        self.meeting_transcripts = []
+        # Close the transcript log (it stays on disk)
+        if self.transcript_log:
+            self.transcript_log.close()
+        if self.summarizer:
+            self.summarizer.close()
         
         # Reset active flags
         self.meeting_transcription_active = False
@@ -3,7 +3,7 @@ import datetime
 from core.i18n import _
 from core.meeting.audio_processor import MeetingAudioProcessor
 from core.meeting.transcription_processor import MeetingTranscriptionProcessor
-from core.meeting.meeting_exporter import save_meeting_results
+from core.meeting.meeting_exporter import save_meeting_results, MEETINGS_DIR
 from core import transcription_queue
 
 
@@ -35,7 +35,7 @@ class MeetingRecorder:
         print(_("→ 💡 Starting meeting recording..."))
         self.meeting_mode = True
         self.meeting_start_time = datetime.datetime.now()
-        self.transcription_processor.clear_transcripts()
+        self.transcription_processor.clear_transcripts(f"{MEETINGS_DIR}/meeting_{self.meeting_start_time.strftime('%Y%m%d_%H%M%S')}.jsonl")
         self.transcriber_ref.keyboard_handler.disable_all_listeners()
         if hasattr(self.transcriber_ref, 'fn_listener') and self.transcriber_ref.fn_listener:
             self.transcriber_ref.fn_listener.disable_all_listeners()
@@ -64,11 +64,18 @@ class MeetingRecorder:
                 # Force cleanup to prevent resource leaks
                 import gc
                 gc.collect()
+        for source, st in self.audio_processor.pipeline_stats().items():
+            print(_("→ Capture pipeline [{}] per block: {}; {} overflows, {} samples dropped, max backlog {} blocks").format(
+                source, st.summary(), st.overflows, st.dropped, st.max_backlog))
         self.transcription_processor.wait_for_transcription_completion()
+        for name, st in transcription_queue.queue_stats().items():
+            if st['count']:
+                print(_("→ Queue wait [{}]: p50 {:.0f}ms, p95 {:.0f}ms, max {:.0f}ms ({} tasks)").format(name, st['p50_ms'], st['p95_ms'], st['max_ms'], st['count']))
         try:
             transcripts = self.transcription_processor.get_transcripts()
-            final_audio = self.audio_processor.get_recorded_audio()
-            save_meeting_results(self.transcriber_ref, self.meeting_start_time, transcripts, final_audio)
+            save_meeting_results(self.transcriber_ref, self.meeting_start_time, transcripts, self.audio_processor.recorded_audio_blocks(),
+                                 self.transcription_processor.summarizer)
+            self.audio_processor.discard_recording()
             print(_("✅ Meeting recording saved"))
         except Exception as e:
             print(_("❌ Error saving meeting results: {}").format(e))
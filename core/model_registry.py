@@ -0,0 +1,223 @@
+"""Offline-first registry for every model file Hey Aura loads.
+
+Bundled models (Silero VAD, hey_aura.onnx) are pinned by checksum here. Downloaded
+models (openwakeword feature models, ASR weights) are fetched once with
+`python -m core.model_registry prefetch`, which records their files, sizes and
+sha256 in models/manifest.json. At startup `prepare()` stats those files; when
+everything is present the Hugging Face libraries are switched to offline mode and
+no network request is made.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import platform
+import importlib.util
+
+MODELS_DIR = os.path.join(os.getcwd(), "models")
+MANIFEST_PATH = os.path.join(MODELS_DIR, "manifest.json")
+_CORE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+BUNDLED = {
+    "silero_vad": (os.path.join(_CORE_DIR, "silero_vad.onnx"), "2623a2953f6ff3d2c1e61740c6cdb7168133479b267dfef114a4a3cc5bdd788f"),
+    "hey_aura": (os.path.join(_CORE_DIR, "hey_aura.onnx"), "bff229bad1a604e9053768338a840df58f0df8fa2730a7781f5e6dc05207add4"),
+}
+OPENWAKEWORD_FILES = ["melspectrogram.onnx", "embedding_model.onnx", "melspectrogram.tflite", "embedding_model.tflite"]
+MLX_MAP = {"large-v3-turbo": "mlx-community/whisper-large-v3-turbo", "large-v3": "mlx-community/whisper-large-v3-mlx"}
+PARAKEET_REPO = {"Darwin": "mlx-community/parakeet-tdt-0.6b-v3"}
+PARAKEET_DEFAULT = "nvidia/parakeet-tdt-0.6b-v3"
+FUNASR_MODEL = "iic/speech_paraformer-large_asr_nat-zh-cn-16k-common-vocab8404-pytorch"
+
+_offline = False
+
+
+def configure_cache():
+    """Point every model cache at ./models. Safe to call any number of times."""
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    os.environ.setdefault("HF_HUB_CACHE", MODELS_DIR)
+    os.environ.setdefault("MODELSCOPE_CACHE", MODELS_DIR)
+
+
+def hf_cache(asr_model):
+    """Hugging Face cache the backend of `asr_model` reads: faster-whisper passes ./models as
+    its download_root, the others use HF_HUB_CACHE, which a user setting may have overridden"""
+    if platform.system() != "Darwin" and asr_model not in ("parakeet", "funasr"):
+        return MODELS_DIR
+    return os.environ.get("HF_HUB_CACHE", MODELS_DIR)
+
+
+def is_offline() -> bool:
+    """True once prepare() verified every model locally"""
+    return _offline
+
+
+def asr_source(model_type: str):
+    """Return (hub, repo_id) for an ASR model name, mirroring create_transcriber"""
+    if os.path.exists(model_type):
+        return "local", model_type
+    system = platform.system()
+    if model_type == "parakeet":
+        return "hf", PARAKEET_REPO.get(system, PARAKEET_DEFAULT)
+    if model_type == "funasr":
+        return "modelscope", FUNASR_MODEL
+    name = model_type.replace("whisper-", "", 1) if model_type.startswith("whisper-") else model_type
+    if "/" in name:
+        return "hf", name
+    if system == "Darwin":
+        return "hf", MLX_MAP.get(name, name)
+    from faster_whisper.utils import _MODELS
+    return "hf", _MODELS.get(name, name)
+
+
+def openwakeword_dir():
+    spec = importlib.util.find_spec("openwakeword")
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    return os.path.join(list(spec.submodule_search_locations)[0], "resources", "models")
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _load_manifest():
+    try:
+        with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"version": 1, "models": {}}
+
+
+def _record(root):
+    """Describe every file under `root` (or the single file `root`) for the manifest"""
+    paths = [root] if os.path.isfile(root) else [
+        os.path.join(d, n) for d, _, names in os.walk(root) for n in names
+    ]
+    return {os.path.abspath(p): {"size": os.path.getsize(p), "sha256": _sha256(p)} for p in sorted(paths)}
+
+
+def _check_files(files, full=False):
+    """Return the list of problems with recorded files; stats only unless `full`"""
+    problems = []
+    for path, meta in files.items():
+        try:
+            if os.path.getsize(path) != meta["size"]:
+                problems.append(f"{path}: size mismatch")
+            elif full and _sha256(path) != meta["sha256"]:
+                problems.append(f"{path}: checksum mismatch")
+        except OSError:
+            problems.append(f"{path}: missing")
+    return problems
+
+
+def verify(asr_model=None, full=False):
+    """Check bundled and downloaded models; returns {name: [problems]} for anything not OK"""
+    report = {}
+    for name, (path, digest) in BUNDLED.items():
+        if not os.path.exists(path):
+            report[name] = [f"{path}: missing"]
+        elif _sha256(path) != digest:
+            report[name] = [f"{path}: checksum mismatch"]
+
+    models = _load_manifest()["models"]
+    names = ["openwakeword"] + ([f"asr:{asr_model}"] if asr_model else [])
+    for name in names:
+        if name not in models:
+            report[name] = ["not prefetched"]
+            continue
+        problems = _check_files(models[name]["files"], full)
+        if problems:
+            report[name] = problems
+    return report
+
+
+def prefetch(asr_model):
+    """Download all models needed for `asr_model` and record them in the manifest"""
+    from core.i18n import _
+    configure_cache()
+    manifest = _load_manifest()
+    models = manifest["models"]
+
+    print(_("→ Prefetching openwakeword base models"))
+    import openwakeword.utils
+    openwakeword.utils.download_models()
+    oww_dir = openwakeword_dir()
+    models["openwakeword"] = {"source": "openwakeword", "files": {}}
+    for name in OPENWAKEWORD_FILES:
+        if os.path.exists(os.path.join(oww_dir, name)):
+            models["openwakeword"]["files"].update(_record(os.path.join(oww_dir, name)))
+
+    hub, repo = asr_source(asr_model)
+    print(_("→ Prefetching ASR model {} ({}: {})").format(asr_model, hub, repo))
+    if hub == "hf":
+        from huggingface_hub import snapshot_download
+        path = snapshot_download(repo, cache_dir=hf_cache(asr_model))
+    elif hub == "modelscope":
+        from modelscope import snapshot_download
+        # Default location, i.e. under MODELSCOPE_CACHE, where funasr looks
+        path = snapshot_download(repo)
+    else:
+        path = repo
+    models[f"asr:{asr_model}"] = {"source": f"{hub}:{repo}", "path": os.path.abspath(path), "files": _record(path)}
+
+    manifest["updated"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    print(_("✅ Manifest written to {}").format(MANIFEST_PATH))
+
+
+def prepare(asr_model):
+    """Startup fast path: verify local models and go offline when all are present.
+
+    Returns True when every model is verified. Otherwise the libraries are left
+    online so missing models are downloaded lazily as before.
+    """
+    global _offline
+    from core.i18n import _
+    configure_cache()
+    t = time.time()
+    report = verify(asr_model)
+    if not report:
+        os.environ["HF_HUB_OFFLINE"] = "1"
+        os.environ["TRANSFORMERS_OFFLINE"] = "1"
+        _offline = True
+        print(_("→ All models verified locally in {:.0f}ms, running offline").format((time.time() - t) * 1000))
+        return True
+    for name, problems in report.items():
+        print(_("  ⚠️ Model {}: {}").format(name, problems[0]))
+    print(_("→ Some models are not prefetched, they will be downloaded on first use (run: python -m core.model_registry prefetch)"))
+    return False
+
+
+def ensure_openwakeword():
+    """Download the openwakeword base models unless they are already verified"""
+    if _offline or "openwakeword" not in verify():
+        return
+    import openwakeword.utils
+    openwakeword.utils.download_models()
+
+
+if __name__ == "__main__":
+    import argparse
+    import yaml
+    from core.i18n import _
+    parser = argparse.ArgumentParser(description="Hey Aura model registry")
+    parser.add_argument("command", choices=["prefetch", "verify"])
+    parser.add_argument("--asr", help="ASR model name (defaults to asr.model in config.yaml)")
+    parser.add_argument("--full", action="store_true", help="verify: hash every file instead of checking sizes")
+    args = parser.parse_args()
+    asr_model = args.asr or yaml.safe_load(open('config.yaml', encoding='utf-8'))['asr']['model']
+
+    if args.command == "prefetch":
+        prefetch(asr_model)
+    report = verify(asr_model, full=args.full or args.command == "prefetch")
+    for name, problems in report.items():
+        print(_("❌ {}: {}").format(name, "; ".join(problems)))
+    if not report:
+        print(_("✅ All models present and verified"))
+    sys.exit(1 if report else 0)
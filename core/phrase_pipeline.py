@@ -0,0 +1,127 @@
+import re
+import threading
+import time
+from concurrent.futures import CancelledError
+import numpy as np
+
+from core import transcription_queue
+from core.i18n import _
+
+BLOCK_SIZE = 512
+_CJK = re.compile(r'[\u3000-\u30ff\u3400-\u9fff\uac00-\ud7af\uff00-\uffef]')
+
+
+def join_phrases(texts):
+    """Join phrase transcripts, adding spaces only between non-CJK words"""
+    out = ""
+    for t in (t.strip() for t in texts):
+        if not t:
+            continue
+        if out and not (_CJK.match(out[-1]) or _CJK.match(t[0])):
+            out += " "
+        out += t
+    return out
+
+
+class PhrasePipeline:
+    """Transcribe finished phrases of a long push-to-talk dictation while the key is held.
+
+    The capture thread calls `feed()` with the VAD probability of every block it appends
+    to `VoiceTranscriber.aud`.
+    Once enough audio has accumulated and the speaker pauses, the phrase up to the middle
+    of the pause is enhanced and sent to `transcription_queue` in the background. On
+    release `stop_rec` only has to transcribe the audio after `tail_start`, once
+    `wait_mode()` says whether the first phrase started with the wake word.
+    """
+
+    def __init__(self, vt, min_phrase_seconds=8.0, silence_ms=500, padding_ms=300):
+        self.vt = vt
+        self.min_phrase_blocks = int(min_phrase_seconds * vt.sr / BLOCK_SIZE)
+        self.silence_blocks = max(1, int(silence_ms * vt.sr / 1000 / BLOCK_SIZE))
+        self.padding_blocks = int(padding_ms * vt.sr / 1000 / BLOCK_SIZE)
+        self.reset()
+
+    def reset(self):
+        """Clear state before a new recording, cancelling phrases of an abandoned one"""
+        self.cancel()
+        self.n_blocks = 0
+        self.tail_start = 0        # First block not yet sent for transcription
+        self.first_speech = None   # First speech block of the current phrase
+        self.silence_run = 0
+        self.jobs = []
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.jobs)
+
+    def feed(self, prob: float):
+        """Track speech/silence for one captured block and cut a phrase when it is due"""
+        idx = self.n_blocks
+        self.n_blocks += 1
+        if prob > self.vt.vad.threshold:
+            if self.first_speech is None:
+                self.first_speech = idx
+            self.silence_run = 0
+            return
+        self.silence_run += 1
+        if (self.first_speech is not None and self.silence_run >= self.silence_blocks
+                and self.n_blocks - self.tail_start >= self.min_phrase_blocks):
+            # Cut in the middle of the pause so neither side loses a syllable
+            cut = self.n_blocks - self.silence_run // 2
+            start = max(self.tail_start, self.first_speech - self.padding_blocks)
+            self._submit(start, cut)
+            self.tail_start, self.first_speech, self.silence_run = cut, None, 0
+
+    def _submit(self, start, end):
+        audio = np.concatenate(self.vt.aud[start:end]).reshape(-1)
+        job = {'index': len(self.jobs), 'text': "", 'audio': None, 'future': None, 'cancelled': False,
+               'checked': threading.Event(), 'done': threading.Event()}
+        self.jobs.append(job)
+        print(_("  → Phrase {} sent for transcription ({:.1f}s)").format(job['index'] + 1, audio.size / self.vt.sr))
+        threading.Thread(target=self._transcribe, args=(job, audio), daemon=True).start()
+
+    def _transcribe(self, job, audio):
+        vt = self.vt
+        try:
+            audio = vt.audio_enhancer.enhance_audio(audio, vt.rec_noise)
+            job['audio'] = audio
+            if job['index'] == 0 and vt.mode == 'dictation':
+                vt.check_wakeword(audio)
+            job['checked'].set()
+            if job['cancelled']:
+                return
+            job['future'] = transcription_queue.submit(
+                audio, sr=vt.sr, language=vt.language, beam_size=5, vad_filter=False, timeout=30
+            )
+            if job['cancelled']:
+                job['future'].cancel()
+            job['text'] = transcription_queue.wait(job['future'], 30).strip()
+        except CancelledError:
+            pass
+        except Exception as e:
+            print(_("❌ Phrase transcription error: {}").format(e))
+        finally:
+            job['checked'].set()
+            job['done'].set()
+
+    def cancel(self):
+        """Abandon every submitted phrase; queued ones never reach the model"""
+        for job in getattr(self, 'jobs', []):
+            job['cancelled'] = True
+            if job['future'] is not None:
+                job['future'].cancel()
+
+    def wait_mode(self, timeout=30):
+        """Wait until the first phrase has been checked for the wake word, which sets `vt.mode`"""
+        if self.jobs and not self.jobs[0]['checked'].wait(timeout):
+            self.cancel()
+            raise TimeoutError(_("Transcription timeout"))
+
+    def collect(self, timeout=30):
+        """Wait for all submitted phrases and return (texts, audios) in order"""
+        deadline = time.time() + timeout
+        for job in self.jobs:
+            if not job['done'].wait(max(0, deadline - time.time())):
+                self.cancel()
+                raise TimeoutError(_("Transcription timeout"))
+        return [j['text'] for j in self.jobs], [j['audio'] for j in self.jobs if j['audio'] is not None]
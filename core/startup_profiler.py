@@ -0,0 +1,134 @@
+"""Startup profiler for `python app.py --profile-startup`.
+
+Times every first-time import (inclusive and self time), including submodules
+loaded by `from package import submodule`, every model load wrapped
+in `timed()`, and the moment hotkeys become ready. Disabled unless `enable()` is
+called, in which case only `timed()` bookkeeping runs.
+"""
+import builtins
+import importlib.util
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_t0 = time.perf_counter()
+_enabled = False
+_orig_import = builtins.__import__
+_local = threading.local()
+_lock = threading.Lock()
+_imports = {}   # module name -> [inclusive seconds, self seconds]
+_loads = []     # (label, seconds)
+_ready = None
+
+
+def enable():
+    """Start recording imports; call before the heavy imports in app.py"""
+    global _enabled
+    if not _enabled:
+        _enabled = True
+        builtins.__import__ = _timed_import
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    full = name
+    if level:
+        try:
+            full = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+        except (ImportError, ValueError):
+            return _orig_import(name, globals, locals, fromlist, level)
+    if full not in sys.modules:
+        # Without the fromlist: its submodules are timed on their own below
+        _record(full, _orig_import, name, globals, locals, (), level)
+    module = sys.modules.get(full) if fromlist else None
+    if module is not None:
+        # `from pkg import sub` loads pkg.sub through importlib, not __import__; time it here
+        for item in fromlist:
+            sub = f"{full}.{item}"
+            if item != '*' and sub not in sys.modules and not hasattr(module, item):
+                try:
+                    _record(sub, _orig_import, sub)
+                except ModuleNotFoundError as e:
+                    if e.name != sub:
+                        raise
+    return _orig_import(name, globals, locals, fromlist, level)
+
+
+def _record(full, load, *args):
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(0.0)
+    t = time.perf_counter()
+    try:
+        return load(*args)
+    finally:
+        dt = time.perf_counter() - t
+        children = stack.pop()
+        if stack:
+            stack[-1] += dt
+        with _lock:
+            rec = _imports.setdefault(full, [0.0, 0.0])
+            rec[0] += dt
+            rec[1] += dt - children
+
+
+@contextmanager
+def timed(label):
+    """Record how long a model load or other startup step takes"""
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _lock:
+            _loads.append((label, time.perf_counter() - t))
+
+
+def mark_ready():
+    """Hotkeys are live; freeze the time-to-ready measurement"""
+    global _ready
+    if _ready is None:
+        _ready = time.perf_counter() - _t0
+    return _ready
+
+
+def report(top=15) -> dict:
+    """Summary with import time per top-level package, load time per step and time to ready"""
+    with _lock:
+        packages = {}
+        for name, (_, self_time) in _imports.items():
+            root = name.split('.')[0]
+            packages[root] = packages.get(root, 0.0) + self_time
+        loads = list(_loads)
+        modules = sorted(_imports)
+    ranked = sorted(packages.items(), key=lambda kv: kv[1], reverse=True)
+    return {
+        'ready_ms': round((_ready if _ready is not None else time.perf_counter() - _t0) * 1000, 1),
+        'import_ms': round(sum(packages.values()) * 1000, 1),
+        'imports': [{'module': m, 'ms': round(s * 1000, 1)} for m, s in ranked[:top]],
+        'loads': [{'step': label, 'ms': round(s * 1000, 1)} for label, s in loads],
+        'modules': modules,
+    }
+
+
+def print_report(path=None):
+    r = report()
+    print("=" * 60)
+    print(f"Startup profile: hotkeys ready after {r['ready_ms']:.0f} ms")
+    print("=" * 60)
+    print(f"Imports ({r['import_ms']:.0f} ms total, self time per package):")
+    for item in r['imports']:
+        print(f"  {item['module']:<28}{item['ms']:>9.1f} ms")
+    print("Model loads:")
+    for item in r['loads']:
+        print(f"  {item['step']:<28}{item['ms']:>9.1f} ms")
+    print("=" * 60)
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(r, f, indent=2)
+    return r
@@ -1,35 +1,162 @@
+import os
+import time
+import tempfile
 from abc import ABC, abstractmethod
+from concurrent.futures import CancelledError
 from typing import Optional
 
+import numpy as np
+
+# Default warm-up: one short clip loads the weights and sets up the kernels. Longer
+# shapes (e.g. 1, 5, 20) are opt-in through asr.warmup, they add seconds of startup
+WARMUP_SECONDS = (1,)
+
 
 class TranscriptionModel(ABC):
     """Base interface for transcription models"""
-    
+
+    # Segments transcribe_batch can decode in one pass; 1 means the backend cannot batch
+    max_batch_size = 1
+    # False when the runtime cannot run two instances side by side (replicate() is not used)
+    can_replicate = True
+
     def __init__(self, model_name: str, **kwargs):
         self.model_name = model_name
         self.is_initialized = False
-    
+        self.sessions = 1  # Concurrent transcribe calls one instance can serve
+
     @abstractmethod
     def initialize(self) -> None:
         """Initialize the model"""
         pass
-    
+
     @abstractmethod
     def transcribe(self, audio_path: str, language: Optional[str] = None, **kwargs) -> str:
         """
         Transcribe audio file
-        
+
         Args:
             audio_path: Path to audio file
             language: Language code (optional)
             **kwargs: Additional arguments
-            
+
         Returns:
             str: Transcription text
         """
         pass
-    
+
+    def transcribe_array(self, audio: np.ndarray, sr: int = 16000, language: Optional[str] = None, **kwargs) -> str:
+        """
+        Transcribe an in-memory mono float32 buffer
+
+        Backends override this to feed the buffer straight to the model. The
+        default falls back to a temporary WAV file so custom backends keep working.
+
+        Args:
+            audio: Mono float32 samples in [-1, 1]
+            sr: Sample rate of `audio`
+            language: Language code (optional)
+            **kwargs: Additional arguments
+
+        Returns:
+            str: Transcription text
+        """
+        import soundfile as sf
+        tf = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+        tf.close()
+        try:
+            sf.write(tf.name, as_float32(audio), sr)
+            return self.transcribe(tf.name, language=language, **kwargs)
+        finally:
+            try: os.unlink(tf.name)
+            except OSError: pass
+
+    def transcribe_batch(self, audios: list, sr: int = 16000, language: Optional[str] = None, **kwargs) -> list:
+        """
+        Transcribe several in-memory buffers, in one batch where the backend can
+
+        Args:
+            audios: Mono float32 buffers, at most max_batch_size of them
+            sr: Sample rate of every buffer
+            language: Language code (optional)
+            **kwargs: Additional arguments; `should_stop` is a callable polled
+                between decoding chunks, raising CancelledError once it returns True
+
+        Returns:
+            list: Transcription text per buffer, in order
+        """
+        texts = []
+        for a in audios:
+            check_stop(kwargs)
+            texts.append(self.transcribe_array(a, sr, language=language, **kwargs))
+        return texts
+
+    def replicate(self) -> "TranscriptionModel":
+        """
+        Load an independent, initialized copy of this model for the transcription pool
+
+        Only called when `can_replicate` is True.
+
+        Returns:
+            TranscriptionModel: New instance that can transcribe concurrently
+        """
+        replica = type(self)(self.model_name)
+        replica.initialize()
+        return replica
+
+    def warmup(self, durations=WARMUP_SECONDS, sr: int = 16000, language: Optional[str] = None, **kwargs) -> dict:
+        """
+        Run in-memory transcriptions of typical utterance lengths after initialize()
+
+        Lazy kernel setup and allocator growth happen here instead of in the
+        user's first dictation. Goes through transcribe_array, so every backend
+        is covered; backends override it only to add backend-specific steps.
+
+        Args:
+            durations: Utterance lengths in seconds, shortest first
+            sr: Sample rate of the synthetic audio
+            language: Language code passed to every call (optional)
+            **kwargs: Decoding arguments used for real requests, e.g. beam_size
+
+        Returns:
+            dict: cold_ms (first call), warm_ms (same call after warm-up) and
+            durations_ms {seconds: latency}
+        """
+        def timed_call(seconds):
+            t = time.perf_counter()
+            self.transcribe_array(warmup_audio(seconds, sr), sr, language=language, **kwargs)
+            return (time.perf_counter() - t) * 1000
+
+        timings = {sec: timed_call(sec) for sec in durations}
+        return {'cold_ms': timings[durations[0]], 'warm_ms': timed_call(durations[0]), 'durations_ms': timings}
+
     @abstractmethod
     def get_supported_languages(self) -> list:
         """Get list of supported languages"""
-        pass
\ No newline at end of file
+        pass
+
+
+def check_stop(kwargs: dict):
+    """Raise CancelledError if the caller passed a `should_stop` callable that now returns True"""
+    should_stop = kwargs.get('should_stop')
+    if should_stop is not None and should_stop():
+        raise CancelledError()
+
+
+def as_float32(audio: np.ndarray) -> np.ndarray:
+    """Return `audio` as a contiguous mono float32 array, copying only when needed"""
+    audio = np.asarray(audio)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1) if audio.shape[1] <= 2 else audio.reshape(-1)
+    return np.ascontiguousarray(audio, dtype=np.float32)
+
+
+def warmup_audio(seconds: float, sr: int = 16000) -> np.ndarray:
+    """Deterministic speech-like signal: voiced harmonics in syllable-length bursts over low noise"""
+    t = np.arange(int(sr * seconds)) / sr
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 3 * t), 0, None) * (np.sin(2 * np.pi * 0.4 * t) > -0.6)
+    noise = np.random.default_rng(0).standard_normal(t.size)
+    return (0.15 * voiced * envelope + 0.005 * noise).astype(np.float32)
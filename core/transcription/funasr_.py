@@ -1,6 +1,7 @@
-import os, time, soundfile as sf, librosa, tempfile
+import time, soundfile as sf, librosa, numpy as np
 from typing import Optional
-from core.transcription.base import TranscriptionModel
+from core.transcription.base import TranscriptionModel, as_float32
+from core.model_registry import configure_cache
 from core.i18n import _
 
 class FunASRTranscriber(TranscriptionModel):
@@ -15,20 +16,35 @@ class FunASRTranscriber(TranscriptionModel):
         print(f"→ {_('Initializing')}: {self.model_name}")
         t = time.time()
         
-        os.environ["MODELSCOPE_CACHE"] = os.path.join(os.getcwd(), "models")
-        os.makedirs(os.environ["MODELSCOPE_CACHE"], exist_ok=True)
+        configure_cache()
         
         from funasr import AutoModel
         self.model = AutoModel(model=self.model_name, disable_pbar=True, disable_update=True)
+        self.max_batch_size = 8
         
         self.is_initialized = True
         print(f"→ {_('Ready')} {time.time()-t:.2f}s")
     
     def transcribe(self, path: str, language: Optional[str] = None, **kw) -> str:
-        audio, _ = sf.read(path)
-        r = self.model.generate(input=audio, is_final=True)
+        audio, sr = sf.read(path, dtype='float32')
+        return self.transcribe_array(audio, sr, language=language, **kw)
+    
+    def transcribe_array(self, audio: np.ndarray, sr: int = 16000, language: Optional[str] = None, **kw) -> str:
+        r = self.model.generate(input=self._prepare(audio, sr), is_final=True)
         return r[0]["text"] if r and len(r) > 0 and "text" in r[0] else ""
     
+    def transcribe_batch(self, audios: list, sr: int = 16000, language: Optional[str] = None, **kw) -> list:
+        # generate() takes a list of inputs and returns one result per input, in order
+        r = self.model.generate(input=[self._prepare(a, sr) for a in audios], batch_size=len(audios), is_final=True) or []
+        texts = [x.get("text", "") for x in r]
+        return texts + [""] * (len(audios) - len(texts))
+    
+    def _prepare(self, audio, sr):
+        audio = as_float32(audio)
+        if sr != self.sr:
+            audio = librosa.resample(audio, orig_sr=sr, target_sr=self.sr)
+        return audio
+    
     def get_supported_languages(self) -> list: return ['zh']
 
 if __name__ == "__main__":
@@ -36,6 +52,4 @@ if __name__ == "__main__":
     t.initialize()
     
     audio, sr = librosa.load("docs/test.mp3", sr=16000)
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
-        sf.write(tmp.name, audio, sr, format='WAV')
-        print(f"{_('Result')}: {t.transcribe(tmp.name)}")
\ No newline at end of file
+    print(f"{_('Result')}: {t.transcribe_array(audio, sr)}")
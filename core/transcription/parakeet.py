@@ -1,4 +1,3 @@
-import os
 import sys
 import signal
 import time
@@ -14,7 +13,8 @@ import platform
 import torch
 import soundfile as sf
 
-from core.transcription.base import TranscriptionModel
+from core.transcription.base import TranscriptionModel, as_float32
+from core.model_registry import configure_cache
 from core.i18n import _
 
 class NeMoTranscriber(TranscriptionModel):
@@ -34,12 +34,13 @@ class NeMoTranscriber(TranscriptionModel):
         print(f"→ {_('Initializing transcription model')}: parakeet")
         start = time.time()
         
-        os.environ["HF_HUB_CACHE"] = os.path.join(os.getcwd(), "models")
+        configure_cache()
         if platform.system() == "Darwin":
             print(f"  {_('Using parakeet-mlx (macOS)')}")
             from parakeet_mlx import from_pretrained
             self.model = from_pretrained("mlx-community/parakeet-tdt-0.6b-v3")
             self.backend, self.device = "mlx", "mps"
+            self.can_replicate = False  # One MLX model per process
         else:
             print(f"  {_('Using NeMo')}")
             import nemo.collections.asr as nemo_asr
@@ -48,30 +49,43 @@ class NeMoTranscriber(TranscriptionModel):
             for p in self.model.parameters():
                 p.requires_grad = False
             self.backend = "nemo"
+            self.max_batch_size = 8
         
         self.is_initialized = True
         print(f"→ {_('Model ready')} ({self.backend}, {self.device}) {time.time() - start:.2f}s")
     
     def transcribe(self, audio_path: str, language: Optional[str] = None, **kwargs) -> str:
-        audio_data, _ = sf.read(audio_path)
-
-        if _ != self.sample_rate:
-            audio_data = librosa.resample(audio_data, orig_sr=_, target_sr=self.sample_rate)
-        
+        audio_data, sr = sf.read(audio_path, dtype='float32')
+        return self.transcribe_array(audio_data, sr, language=language, **kwargs)
+    
+    def transcribe_array(self, audio: np.ndarray, sr: int = 16000, language: Optional[str] = None, **kwargs) -> str:
         if self.backend == "nemo":
-            with torch.no_grad():
-                transcripts = self.model.transcribe([audio_path], batch_size=1, verbose=False, timestamps=False)
-                if transcripts and len(transcripts) > 0:
-                    # Handle both string and Hypothesis object returns
-                    result = transcripts[0]
-                    if hasattr(result, 'text'):
-                        return result.text
-                    elif isinstance(result, str):
-                        return result
-                    else:
-                        return str(result)
-                return ""
-        return self._transcribe_mlx(audio_data)
+            return self.transcribe_batch([audio], sr, language=language, **kwargs)[0]
+        return self._transcribe_mlx(self._prepare(audio, sr))
+    
+    def transcribe_batch(self, audios: list, sr: int = 16000, language: Optional[str] = None, **kwargs) -> list:
+        audios = [self._prepare(a, sr) for a in audios]
+        if self.backend != "nemo":
+            return [self._transcribe_mlx(a) for a in audios]
+        with torch.no_grad():
+            transcripts = self.model.transcribe(audios, batch_size=len(audios), verbose=False, timestamps=False)
+        transcripts = list(transcripts or [])
+        return [self._hypothesis_text(t) for t in transcripts] + [""] * (len(audios) - len(transcripts))
+    
+    def _prepare(self, audio, sr):
+        audio_data = as_float32(audio)
+        if sr != self.sample_rate:
+            audio_data = librosa.resample(audio_data, orig_sr=sr, target_sr=self.sample_rate)
+        return audio_data
+    
+    @staticmethod
+    def _hypothesis_text(result) -> str:
+        # Handle both string and Hypothesis object returns
+        if hasattr(result, 'text'):
+            return result.text
+        elif isinstance(result, str):
+            return result
+        return str(result)
     
     def _transcribe_mlx(self, audio_data: np.ndarray) -> str:
         from parakeet_mlx.audio import get_logmel
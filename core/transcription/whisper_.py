@@ -1,12 +1,13 @@
-import os, platform, time, numpy as np, soundfile as sf
+import os, platform, time, inspect, numpy as np
 from typing import Optional
-from core.transcription.base import TranscriptionModel
+from core.transcription.base import TranscriptionModel, as_float32, check_stop
+from core.model_registry import MLX_MAP, configure_cache
 from core.i18n import _
 import opencc
 import re
 
-# Mapping between model names and their MLX Hub paths
-MLX_MAP = {"large-v3-turbo": "mlx-community/whisper-large-v3-turbo", "large-v3": "mlx-community/whisper-large-v3-mlx"}
+BATCH_SIZE = 8
+BATCH_GAP = 8000  # Silence between batched segments, in samples
 
 class MLXTranscriptionInfo:
     def __init__(self, lang: str, prob: float = 1.0, dur: float = 0.0):
@@ -17,6 +18,8 @@ class WhisperTranscriber(TranscriptionModel):
         super().__init__(model, **kw)
         self.model = None
         self.sys = platform.system()
+        # mlx_whisper keeps a single process-wide model and MLX is not thread-safe
+        self.can_replicate = self.sys == "Windows"
         # Initialize OpenCC converter for traditional to simplified Chinese
         self.t2s_converter = opencc.OpenCC('t2s')
         
@@ -26,12 +29,13 @@ class WhisperTranscriber(TranscriptionModel):
             self.dev = kw.get('device', 'cuda' if cuda else 'cpu')
             self.comp = kw.get('compute_type', 'float16' if cuda else 'int8')
             self.root = kw.get('download_root', './models')
+            # CTranslate2 serves this many concurrent transcribe calls from one loaded model
+            self.sessions = kw.get('num_workers', 1)
             print(f"  → {_('Device')}: {self.dev}, {_('Compute')}: {self.comp}")
             if os.path.exists(model): self.model_name = model
         else:
             self.path = model if os.path.exists(model) else kw.get('model_path', MLX_MAP.get(model, model))
             print(f"  → {_('Local') if os.path.exists(model) else _('HF')}: {self.path}")
-            self._warm = False
             self.mlx = None
     
     def initialize(self) -> None:
@@ -41,29 +45,29 @@ class WhisperTranscriber(TranscriptionModel):
         t = time.time()
         
         if self.sys == "Windows":
-            from faster_whisper import WhisperModel
-            self.model = WhisperModel(self.model_name, device=self.dev, compute_type=self.comp, download_root=self.root)
+            from faster_whisper import WhisperModel, BatchedInferencePipeline
+            self.model = WhisperModel(self.model_name, device=self.dev, compute_type=self.comp, download_root=self.root, num_workers=self.sessions)
+            self.batched = BatchedInferencePipeline(model=self.model)
+            # Older faster-whisper has no clip_timestamps in the batched pipeline: segments are decoded one by one
+            if 'clip_timestamps' in inspect.signature(self.batched.transcribe).parameters:
+                self.max_batch_size = BATCH_SIZE
+            else:
+                print(f"  ⚠️ {_('Batched transcription unavailable')}: faster-whisper")
         else:
             # Set up HuggingFace cache directory
-            os.environ["HF_HUB_CACHE"] = os.path.join(os.getcwd(), "models")
-            os.makedirs(os.environ["HF_HUB_CACHE"], exist_ok=True)
+            configure_cache()
             import mlx_whisper
             self.mlx = mlx_whisper
-            
-            # Warm up the model with a test audio
-            print(f"  → {_('Warming up')}: {self.path}")
-            tmp = "tmp_warm.wav"
-            sr, dur = 16000, 0.1
-            sf.write(tmp, np.sin(2*np.pi*440*np.linspace(0, dur, int(sr*dur), False))*0.1, sr)
-            
-            try: self.mlx.transcribe(tmp, path_or_hf_repo=self.path, word_timestamps=False)
-            finally: os.path.exists(tmp) and os.remove(tmp)
-            
-            self._warm = True
+            # Weights are loaded on the first transcribe call; warmup() takes care of it in memory
         
         self.is_initialized = True
         print(f"  → {_('Whisper Ready in')} {time.time()-t:.2f}s")
     
+    def replicate(self) -> "WhisperTranscriber":
+        replica = WhisperTranscriber(self.model_name, device=self.dev, compute_type=self.comp, download_root=self.root)
+        replica.initialize()
+        return replica
+    
     def detect_hallucination(self, text: str) -> str:
         """Detect and remove hallucinations (repeated characters > 15 times)"""
         # Pattern to match any character repeated 15+ times
@@ -73,28 +77,67 @@ class WhisperTranscriber(TranscriptionModel):
         return cleaned
     
     def transcribe(self, path: str, language: Optional[str] = None, **kw) -> str:
+        return self._transcribe(path, language, **kw)
+    
+    def transcribe_array(self, audio: np.ndarray, sr: int = 16000, language: Optional[str] = None, **kw) -> str:
+        # Both faster-whisper and mlx-whisper take a 16kHz float32 ndarray directly
+        return self._transcribe(self._prepare(audio, sr), language, **kw)
+    
+    def transcribe_batch(self, audios: list, sr: int = 16000, language: Optional[str] = None, **kw) -> list:
+        audios = [self._prepare(a, sr) for a in audios]
+        if self.max_batch_size < 2 or len(audios) < 2 or any(a.size > 30 * 16000 for a in audios):
+            return [self._transcribe(a, language, **kw) for a in audios]
+        lang = self._lang(language, kw)
+        # Lay segments end to end and give the batched pipeline one clip per segment, in samples
+        clips, parts, pos = [], [], 0
+        for a in audios:
+            clips.append({"start": pos, "end": pos + a.size})
+            parts += [a, np.zeros(BATCH_GAP, dtype=np.float32)]
+            pos += a.size + BATCH_GAP
+        seg, _info = self.batched.transcribe(np.concatenate(parts), language=lang, beam_size=kw.get('beam_size', 5),
+                                             batch_size=len(audios), clip_timestamps=clips, vad_filter=False)
+        texts = [""] * len(audios)
+        for s in seg:
+            check_stop(kw)
+            start = int(round(s.start * 16000))
+            i = next((i for i, c in enumerate(clips) if start < c["end"]), len(clips) - 1)
+            texts[i] += s.text
+        return [self._postprocess(t, lang) for t in texts]
+    
+    def _prepare(self, audio, sr):
+        audio = as_float32(audio)
+        if sr != 16000:
+            import librosa
+            audio = librosa.resample(audio, orig_sr=sr, target_sr=16000)
+        return audio
+    
+    def _lang(self, language, kw):
         # Support both 'language' and 'lang' parameter names for compatibility
         lang = language or kw.get('lang')
-        
         # Convert 'auto' to None for automatic language detection
-        if lang == 'auto':
-            lang = None
-        
-        if self.sys == "Windows":
-            seg, _ = self.model.transcribe(path, beam_size=kw.get('beam_size', 5), language=lang)
-            text = "".join(s.text for s in seg)
-            # Convert to simplified Chinese for any Chinese variant
-            if lang and (lang == 'zh' or lang.startswith('zh')):
-                text = self.t2s_converter.convert(text)
-            # Remove hallucinations before returning
-            return self.detect_hallucination(text)
-        
-        result = self.mlx.transcribe(path, path_or_hf_repo=self.path, word_timestamps=False, language=lang)["text"]
+        return None if lang == 'auto' else lang
+    
+    def _postprocess(self, text: str, lang: Optional[str]) -> str:
         # Convert to simplified Chinese for any Chinese variant
         if lang and (lang == 'zh' or lang.startswith('zh')):
-            result = self.t2s_converter.convert(result)
+            text = self.t2s_converter.convert(text)
         # Remove hallucinations before returning
-        return self.detect_hallucination(result)
+        return self.detect_hallucination(text)
+    
+    def _transcribe(self, audio, language: Optional[str] = None, **kw) -> str:
+        lang = self._lang(language, kw)
+        
+        if self.sys == "Windows":
+            seg, _ = self.model.transcribe(audio, beam_size=kw.get('beam_size', 5), language=lang)
+            # Segments are decoded lazily, 30 s window by window; stop between windows when cancelled
+            text = ""
+            for s in seg:
+                check_stop(kw)
+                text += s.text
+            return self._postprocess(text, lang)
+        
+        result = self.mlx.transcribe(audio, path_or_hf_repo=self.path, word_timestamps=False, language=lang)["text"]
+        return self._postprocess(result, lang)
     
     def get_supported_languages(self) -> list: return ['*']
 
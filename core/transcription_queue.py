@@ -1,26 +1,55 @@
+import os
+import heapq
 import queue
 import threading
 import time
+from collections import deque
+from concurrent.futures import Future, CancelledError, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
 from typing import Optional
+import numpy as np
 from core.i18n import _
+from core.transcription.base import WARMUP_SECONDS
+
+# Keep this much memory free when adding model replicas
+MEMORY_RESERVE_BYTES = 2 * 1024 ** 3
+
+# Priority classes, most urgent first. Dictation and command are interactive: the user is waiting
+DICTATION, COMMAND, MEETING_MIC, MEETING_SYSTEM = range(4)
+CLASS_NAMES = ("dictation", "command", "meeting_mic", "meeting_system")
+# Meeting work waits at most this long for interactive tasks before it runs anyway
+MAX_DEFER_S = 10.0
+# Meeting segments arriving this close together are transcribed as one batch
+BATCH_WINDOW_S = 0.2
 
 _task_queue = None
 _workers = []
 _transcriber = None
 _running = False
 _transcribe_lock = threading.Lock()
+_pool = None  # Checked-in replicas; a replica appears once per concurrent session it supports
+_replicas = []
 
-def init(transcriber, max_workers=5):
-    global _task_queue, _transcriber, _running, _workers
+def init(transcriber, max_workers=5, replicas=1, warmup=WARMUP_SECONDS, **warmup_kwargs):
+    """Start the workers. `replicas` model instances run concurrently; capped by free memory.
+
+    Each extra replica is warmed up like the primary: `warmup` clip lengths in seconds,
+    decoded with `warmup_kwargs` (language, beam_size, ...).
+    """
+    global _task_queue, _transcriber, _running, _workers, _pool
     
     if _running: return
     
     print(_("→ Starting transcription service..."))
-    _task_queue = queue.Queue(maxsize=50)
+    _task_queue = _Scheduler(maxsize=50)
     _transcriber = transcriber
+    _pool = queue.Queue()
+    for replica in _build_replicas(transcriber, max(1, replicas), warmup, warmup_kwargs):
+        _pool.put(replica)
     _running = True
+    slots = _pool.qsize()
     
-    for i in range(max_workers):
+    for i in range(max(max_workers, slots)):
         worker = threading.Thread(
             target=_process_queue,
             daemon=True,
@@ -29,48 +58,304 @@ def init(transcriber, max_workers=5):
         worker.start()
         _workers.append(worker)
     
-    print(_("✅ Transcription service ready"))
+    print(_("✅ Transcription service ready ({} concurrent)").format(slots))
 
-def transcribe(audio_path: str, language: Optional[str] = None, timeout: float = 30, **kwargs) -> str:
-    if not _running or not _task_queue:
-        with _transcribe_lock:
-            return _transcriber.transcribe(audio_path, language=language, **kwargs)
-    
-    result = {'done': False, 'result': None, 'error': None}
-    event = threading.Event()
-    
+def _available_memory():
     try:
-        _task_queue.put((audio_path, language, kwargs, result, event), timeout=1)
-    except queue.Full:
-        print(_("⚠️ Queue full, using direct transcription"))
-        with _transcribe_lock:
-            return _transcriber.transcribe(audio_path, language=language, **kwargs)
-    
-    if not event.wait(timeout=timeout):
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+def _rss():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _build_replicas(transcriber, n, warmup=WARMUP_SECONDS, warmup_kwargs=None):
+    """Return `n` pool slots: the primary's own sessions first, then extra replicas while memory allows"""
+    _replicas[:] = [transcriber]
+    slots = [transcriber] * min(n, transcriber.sessions)
+    per_replica = None
+    if len(slots) < n and not transcriber.can_replicate:
+        print(_("→ ASR backend does not support replicas, using {}").format(len(slots)))
+        return slots
+    while len(slots) < n:
+        available = _available_memory()
+        if available is not None and available - (per_replica or 0) < MEMORY_RESERVE_BYTES:
+            print(_("⚠️ Not enough free memory for another ASR replica ({:.1f} GB available), using {}").format(available / 1024 ** 3, len(slots)))
+            break
+        before = _rss()
+        try:
+            replica = transcriber.replicate()
+            if warmup:
+                replica.warmup(tuple(warmup), **(warmup_kwargs or {}))
+        except Exception as e:
+            print(_("⚠️ Failed to create ASR replica: {}").format(e))
+            break
+        after = _rss()
+        if before is not None and after is not None:
+            per_replica = max(after - before, per_replica or 0)
+        _replicas.append(replica)
+        slots += [replica] * min(n - len(slots), replica.sessions)
+        print(_("  → ASR replica {} ready{}").format(len(_replicas), f" (+{per_replica / 1024 ** 2:.0f} MB)" if per_replica else ""))
+    return slots
+
+@contextmanager
+def _checkout(timeout=None):
+    """Borrow a replica for one task; raises TimeoutError if none is free within `timeout`"""
+    if _pool is None:
+        if not _transcribe_lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError(_("Transcription timeout"))
+        try:
+            yield _transcriber
+        finally:
+            _transcribe_lock.release()
+        return
+    try:
+        model = _pool.get(timeout=timeout)
+    except queue.Empty:
         raise TimeoutError(_("Transcription timeout"))
-    
-    if result['error']: raise result['error']
-    return result['result']
+    try:
+        yield model
+    finally:
+        _pool.put(model)
+
+class TranscriptionFuture(Future):
+    """Result of submit(). Works with concurrent.futures.wait and asyncio.wrap_future.
+
+    cancel() succeeds while the task is queued, and also once it is running: the backend
+    stops at its next decoding chunk where it can, and the result is discarded either
+    way, so the future raises CancelledError. A running task also stops once its
+    deadline has passed, which frees the worker for the next task.
+    """
+
+    def __init__(self, deadline):
+        super().__init__()
+        self.deadline = deadline
+        self._abort = threading.Event()
+
+    def cancel(self):
+        if super().cancel():
+            return True
+        if self.done():
+            return False
+        self._abort.set()
+        return True
+
+    def should_stop(self) -> bool:
+        """Polled by backends between decoding chunks"""
+        return self._abort.is_set() or time.monotonic() > self.deadline
+
+def submit(audio, sr: Optional[int] = 16000, language: Optional[str] = None, timeout: float = 30,
+           priority: int = DICTATION, **kwargs) -> TranscriptionFuture:
+    """Queue a transcription and return its future.
+
+    `audio` is a float32 buffer at `sr`, or a file path with sr=None. `priority` is one of
+    DICTATION, COMMAND, MEETING_MIC, MEETING_SYSTEM; the task's deadline is `timeout`
+    seconds from now and the task is abandoned once it passes. If the queue stays full the
+    future fails at once rather than running the task outside the scheduler.
+    """
+    task = _Task(audio, sr, language, kwargs, priority, timeout)
+    if _running and _task_queue:
+        try:
+            _task_queue.put(task, timeout=min(1, timeout))
+        except queue.Full:
+            print(_("⚠️ Transcription queue full"))
+            task.future.set_exception(RuntimeError(_("Transcription queue full")))
+        return task.future
+    # Queue not started: transcribe in the caller's thread, within the task's deadline
+    task.future.set_running_or_notify_cancel()
+    try:
+        task.future.set_result(_run(audio, sr, language, kwargs, task.deadline))
+    except Exception as e:
+        task.future.set_exception(e)
+    return task.future
+
+def wait(future: Future, timeout: Optional[float] = None):
+    """Result of `future`; on timeout the task is cancelled so it stops holding a worker"""
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise TimeoutError(_("Transcription timeout"))
+
+def transcribe(audio_path: str, language: Optional[str] = None, timeout: float = 30, priority: int = DICTATION, **kwargs) -> str:
+    return wait(submit(audio_path, None, language, timeout, priority, **kwargs), timeout)
+
+def transcribe_array(audio: np.ndarray, sr: int = 16000, language: Optional[str] = None, timeout: float = 30,
+                     priority: int = DICTATION, **kwargs) -> str:
+    """Transcribe an in-memory float32 buffer without touching disk; blocking form of submit()"""
+    return wait(submit(audio, sr, language, timeout, priority, **kwargs), timeout)
+
+def transcribe_batch(audios: list, sr: int = 16000, language: Optional[str] = None, timeout: float = 30,
+                     priority: int = MEETING_MIC, **kwargs) -> list:
+    """Transcribe several buffers at once; meeting segments are batched on backends that support it"""
+    futures = [submit(audio, sr, language, timeout, priority, **kwargs) for audio in audios]
+    end = time.monotonic() + timeout
+    try:
+        return [wait(f, max(0, end - time.monotonic())) for f in futures]
+    except BaseException:
+        for f in futures:
+            f.cancel()
+        raise
+
+def _run(audio, sr, language, kwargs, deadline):
+    with _checkout(max(0, deadline - time.monotonic())) as model:
+        if sr is None:
+            return model.transcribe(audio, language=language, **kwargs)
+        return model.transcribe_array(audio, sr, language=language, **kwargs)
+
+class _Task:
+    __slots__ = ('audio', 'sr', 'language', 'kwargs', 'priority', 'submitted', 'deadline', 'future')
+
+    def __init__(self, audio, sr, language, kwargs, priority, timeout):
+        self.audio, self.sr, self.language, self.kwargs = audio, sr, language, kwargs
+        self.priority = priority
+        self.submitted = time.monotonic()
+        self.deadline = self.submitted + timeout
+        self.future = TranscriptionFuture(self.deadline)
+
+class _Scheduler:
+    """Pending tasks ordered by priority class, then earliest deadline.
+
+    Meeting tasks are deferred while a dictation or command is queued or running, so
+    they do not compete with it for the model or the CPU; after MAX_DEFER_S they run
+    anyway. Tasks whose caller already gave up are dropped instead of transcribed.
+    """
+
+    def __init__(self, maxsize=50):
+        self.maxsize = maxsize
+        self._heap = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._interactive_running = 0
+        self._closed = False
+        self._waits = {p: deque(maxlen=500) for p in range(len(CLASS_NAMES))}
+
+    def put(self, task, timeout=None):
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self._heap) < self.maxsize, timeout):
+                raise queue.Full
+            self._seq += 1
+            heapq.heappush(self._heap, (task.priority, task.deadline, self._seq, task))
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """Next task to run, None once closed; raises queue.Empty after `timeout`"""
+        end = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                now = time.monotonic()
+                wait = None
+                if self._heap:
+                    priority, deadline, _seq, task = self._heap[0]
+                    if deadline <= now or task.future.cancelled():
+                        heapq.heappop(self._heap)
+                        if task.future.set_running_or_notify_cancel():
+                            task.future.set_exception(TimeoutError(_("Transcription timeout")))
+                        self._cond.notify_all()
+                        continue
+                    defer_until = task.submitted + MAX_DEFER_S
+                    if priority <= COMMAND or not self._interactive_running or now >= defer_until:
+                        heapq.heappop(self._heap)
+                        if priority <= COMMAND:
+                            self._interactive_running += 1
+                        self._waits[priority].append(now - task.submitted)
+                        self._cond.notify_all()
+                        return task
+                    wait = defer_until - now
+                if end is not None:
+                    if now >= end:
+                        raise queue.Empty
+                    wait = end - now if wait is None else min(wait, end - now)
+                self._cond.wait(wait)
+
+    def gather(self, first, max_size, window):
+        """Collect meeting tasks compatible with `first` that arrive within `window` of it"""
+        batch = [first]
+        end = first.submitted + window
+        with self._cond:
+            while len(batch) < max_size and not self._closed:
+                now = time.monotonic()
+                keep = []
+                for entry in self._heap:
+                    task = entry[3]
+                    if (len(batch) < max_size and task.priority > COMMAND and task.deadline > now
+                            and not task.future.cancelled() and task.sr == first.sr and task.language == first.language and task.kwargs == first.kwargs):
+                        self._waits[task.priority].append(now - task.submitted)
+                        batch.append(task)
+                    else:
+                        keep.append(entry)
+                if len(keep) != len(self._heap):
+                    self._heap = keep
+                    heapq.heapify(self._heap)
+                    self._cond.notify_all()
+                # Stop early when the user is waiting on a dictation or command
+                if now >= end or (self._heap and self._heap[0][0] <= COMMAND):
+                    break
+                self._cond.wait(end - now)
+        return batch
+
+    def done(self, task):
+        with self._cond:
+            if task.priority <= COMMAND:
+                self._interactive_running -= 1
+                self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            waits = {p: sorted(w) for p, w in self._waits.items()}
+            queued = [0] * len(CLASS_NAMES)
+            for entry in self._heap:
+                queued[entry[0]] += 1
+        return {
+            CLASS_NAMES[p]: {
+                'count': len(w),
+                'queued': queued[p],
+                'mean_ms': round(1000 * sum(w) / len(w), 1) if w else 0.0,
+                'p50_ms': round(1000 * w[len(w) // 2], 1) if w else 0.0,
+                'p95_ms': round(1000 * w[min(len(w) - 1, int(len(w) * 0.95))], 1) if w else 0.0,
+                'max_ms': round(1000 * w[-1], 1) if w else 0.0,
+            } for p, w in waits.items()
+        }
+
+def queue_stats() -> dict:
+    """Queue-wait time per priority class: count, queued, mean/p50/p95/max in ms"""
+    return _task_queue.stats() if _task_queue else {}
 
 def _process_queue():
     while _running:
         try:
-            task = _task_queue.get(timeout=1)
-            if task is None: break
-            
-            audio_path, language, kwargs, result, event = task
-            t0 = time.time()
-            
-            try:
-                with _transcribe_lock:
-                    result['result'] = _transcriber.transcribe(audio_path, language=language, **kwargs)
-                print(_("✅ Transcription completed in {:.2f}s").format(time.time() - t0))
-            except Exception as e:
-                print(_("❌ Transcription failed in {:.2f}s - {}").format(time.time() - t0, e))
-                result['error'] = e
-            finally:
-                result['done'] = True
-                event.set()
+            # Take a model before the task: a popped task never waits behind other workers for a
+            # replica, so priority order holds and its queue wait ends when it can actually run
+            with _checkout() as model:
+                task = _task_queue.get(timeout=1)
+                if task is None: break
+                
+                max_batch = getattr(_transcriber, 'max_batch_size', 1)
+                if task.priority > COMMAND and task.sr is not None and max_batch > 1:
+                    _run_batch(model, _task_queue.gather(task, max_batch, BATCH_WINDOW_S))
+                else:
+                    _run_batch(model, [task])
                 
         except queue.Empty:
             continue
@@ -79,9 +364,54 @@ def _process_queue():
     
     print(_("→ Transcription worker stopped: {}").format(threading.current_thread().name))
 
+def _run_batch(model, popped):
+    """Run one task, or several compatible meeting tasks in a single backend call, on `model`"""
+    t0 = time.time()
+    tasks = []
+    try:
+        # Tasks cancelled while queued are skipped here
+        tasks = [t for t in popped if t.future.set_running_or_notify_cancel()]
+        if not tasks:
+            return
+        first = tasks[0]
+        kwargs = dict(first.kwargs, should_stop=lambda: all(t.future.should_stop() for t in tasks))
+        if len(tasks) == 1:
+            results = [_call(model, first, kwargs)]
+        else:
+            results = model.transcribe_batch([t.audio for t in tasks], first.sr, language=first.language, **kwargs)
+        for task, text in zip(tasks, results):
+            # A caller that cancelled or timed out meanwhile gets CancelledError, not a stale result
+            if task.future.should_stop():
+                task.future.set_exception(CancelledError())
+            else:
+                task.future.set_result(text)
+        if len(tasks) == 1:
+            print(_("✅ Transcription completed in {:.2f}s").format(time.time() - t0))
+        else:
+            print(_("✅ Transcribed batch of {} in {:.2f}s").format(len(tasks), time.time() - t0))
+    except CancelledError:
+        print(_("→ Transcription cancelled after {:.2f}s").format(time.time() - t0))
+        for task in tasks:
+            if not task.future.done():
+                task.future.set_exception(CancelledError())
+    except Exception as e:
+        print(_("❌ Transcription failed in {:.2f}s - {}").format(time.time() - t0, e))
+        for task in tasks:
+            if not task.future.done():
+                task.future.set_exception(e)
+    finally:
+        if _task_queue:
+            for task in popped:
+                _task_queue.done(task)
+
+def _call(model, task, kwargs):
+    if task.sr is None:
+        return model.transcribe(task.audio, language=task.language, **kwargs)
+    return model.transcribe_array(task.audio, task.sr, language=task.language, **kwargs)
+
 def shutdown():
     """Shutdown transcription service and clean up resources"""
-    global _running, _workers, _task_queue, _transcriber
+    global _running, _workers, _task_queue, _transcriber, _pool
     
     if not _running:
         return
@@ -89,13 +419,9 @@ def shutdown():
     print(_("→ Shutting down transcription service..."))
     _running = False
     
-    # Signal workers to stop by putting None tasks
+    # Wake workers; each gets None and stops
     if _task_queue:
-        for _ in _workers:
-            try:
-                _task_queue.put(None, timeout=1)
-            except queue.Full:
-                pass
+        _task_queue.close()
     
     # Wait for workers to finish
     for worker in _workers:
@@ -105,6 +431,8 @@ def shutdown():
                 print(_("→ Warning: Worker {} did not terminate cleanly").format(worker.name))
     
     _workers.clear()
+    _replicas.clear()
     _task_queue = None
     _transcriber = None
+    _pool = None
     print(_("✅ Transcription service shutdown complete"))
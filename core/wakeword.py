@@ -1,38 +1,143 @@
-import os
-import gc
+import queue
+import threading
 import numpy as  np
 import warnings
-import openwakeword
 import logging
 warnings.filterwarnings("ignore")
 logging.getLogger().setLevel(logging.ERROR)
-os.environ["HF_HUB_CACHE"] = os.path.join(os.getcwd(), "models")
-openwakeword.utils.download_models()
 
 from openwakeword.model import Model
-# threshold can be low to get more false positives
-def detect_from_audio(audio_data, sample_rate=16000, threshold=0.3, model_path="core/hey_aura.onnx"):
+from core.model_registry import ensure_openwakeword
+
+MODEL_PATH = "core/hey_aura.onnx"
+FRAME_SIZE = 1280
+_FINISH = object()
+
+
+class WakewordDetector:
+    """Long-lived wake word detector that scores audio while the key is still held.
+
+    One openwakeword Model is loaded once and reset between utterances. Audio is fed
+    block by block from the recording thread and scored on a background thread; the
+    decision is ready as soon as the first `window_seconds` have been consumed.
+    """
+
+    # threshold can be low to get more false positives
+    def __init__(self, model_path=MODEL_PATH, sample_rate=16000, threshold=0.3, window_seconds=1.5):
+        ensure_openwakeword()
+        self.model = Model(wakeword_models=[model_path])
+        self.threshold = threshold
+        self.window = int(sample_rate * window_seconds)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._gen = 0
+        self._decision = None
+        self._ready = threading.Event()
+        threading.Thread(target=self._run, daemon=True, name="WakewordDetector").start()
+
+    def begin(self):
+        """Start a new utterance, discarding anything left from the previous one"""
+        with self._lock:
+            self._gen += 1
+            self._decision = None
+            self._ready = threading.Event()
+            self._queue.put((self._gen, None))
+
+    def feed(self, audio: np.ndarray):
+        """Queue audio (float32 or int16) for scoring; ignored once the decision is made"""
+        if not self._ready.is_set():
+            self._queue.put((self._gen, audio))
+
+    def finish(self):
+        """No more audio for this utterance; decide on whatever was fed"""
+        self._queue.put((self._gen, _FINISH))
+
+    def result(self, timeout=1.0):
+        """Return (detected, confidence), or None if no decision within `timeout`"""
+        ready = self._ready
+        return self._decision if ready.wait(timeout) else None
+
+    def detect(self, audio: np.ndarray, timeout=5.0):
+        """Score a complete utterance synchronously"""
+        self.begin()
+        self.feed(audio)
+        self.finish()
+        return self.result(timeout)
+
+    def _resolve(self, gen, max_conf):
+        with self._lock:
+            if gen == self._gen and not self._ready.is_set():
+                self._decision = (max_conf > self.threshold, max_conf)
+                self._ready.set()
+
+    def _run(self):
+        pending, consumed, max_conf = np.zeros(0, dtype=np.int16), 0, 0.0
+        while True:
+            gen, item = self._queue.get()
+            try:
+                if gen != self._gen:
+                    continue
+                if item is None:
+                    self.model.reset()
+                    pending, consumed, max_conf = np.zeros(0, dtype=np.int16), 0, 0.0
+                    continue
+                if item is _FINISH:
+                    self._resolve(gen, max_conf)
+                    continue
+                if consumed >= self.window:
+                    continue
+                pending = np.concatenate([pending, _to_int16(item)])
+                while len(pending) >= FRAME_SIZE and consumed < self.window:
+                    pred = self.model.predict(pending[:FRAME_SIZE])
+                    pending, consumed = pending[FRAME_SIZE:], consumed + FRAME_SIZE
+                    for _, c in pred.items():
+                        max_conf = max(max_conf, c)
+                if consumed >= self.window:
+                    self._resolve(gen, max_conf)
+            except Exception as e:
+                print(f"WakeWord detection error: {e}")
+                self._resolve(gen, 0.0)
+
+
+def _to_int16(audio_data):
+    # 转为int16
+    if audio_data.dtype == np.float32:
+        return (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16)
+    return audio_data.astype(np.int16, copy=False)
+
+
+_detector = None
+_detector_lock = threading.Lock()
+
+def get_detector() -> WakewordDetector:
+    """Shared detector, created on first use"""
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = WakewordDetector()
+        return _detector
+
+_offline = {}
+
+def detect_from_audio(audio_data, sample_rate=16000, threshold=0.3, model_path=MODEL_PATH):
     try:
-        # 初始化模型
-        model = Model(wakeword_models=[model_path])
-        if not model:
+        # A detector of its own: scoring here must not restart an utterance the shared one is streaming
+        with _detector_lock:
+            if model_path not in _offline:
+                try:
+                    _offline[model_path] = WakewordDetector(model_path, sample_rate)
+                except Exception:
+                    _offline[model_path] = None  # Do not retry the load (and model download) on every call
+                    raise
+            detector = _offline[model_path]
+        if detector is None:
             return False, 0.0
-        # 转为int16
-        if audio_data.dtype == np.float32:
-            audio_data = (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16)
-        elif audio_data.dtype != np.int16:
-            audio_data = audio_data.astype(np.int16)
         # 只取前1.5秒
-        first_1_5_sec = audio_data[:min(int(sample_rate * 1.5), len(audio_data))]
-        frame_size = 1280
-        max_conf = 0
-        for i in range(0, len(first_1_5_sec) - frame_size, frame_size):
-            pred = model.predict(first_1_5_sec[i:i+frame_size])
-            for _, c in pred.items():
-                max_conf = max(max_conf, c)
-        del model
-        gc.collect()
-        return max_conf > threshold, max_conf
+        result = detector.detect(audio_data[:min(int(sample_rate * 1.5), len(audio_data))])
+        if result is None:
+            return False, 0.0
+        confidence = result[1]
+        return confidence > threshold, confidence
     except Exception as e:
         print(f"WakeWord detection error: {e}")
         return False, 0.0
@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import sys,numpy as np,yaml,tempfile,os,subprocess,shutil,platform
+import sys,numpy as np,yaml,os,subprocess,shutil,platform
 from pathlib import Path
 
 def test_silero_vad():
@@ -14,7 +14,7 @@ def test_silero_vad():
 def test_asr_backend():
     print("\n=== Testing ASR Backend ===")
     from core.transcription import create_transcriber
-    import soundfile as sf, librosa
+    import librosa
     
     cfg = yaml.safe_load(open('config.yaml', encoding='utf-8'))
     model = cfg['asr']['model']
@@ -30,10 +30,7 @@ def test_asr_backend():
     audio, _ = librosa.load(str(tf), sr=16000, mono=True)
     print(f"   Audio: {len(audio)/16000:.2f}s")
     
-    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
-        sf.write(tmp.name, audio, 16000)
-        result = tc.transcribe(tmp.name)
-        os.unlink(tmp.name)
+    result = tc.transcribe_array(audio, 16000)
     
     print(f"✅ ASR success\n   Result: '{result}'")
 